@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark OFFSET vs keyset (cursor) pagination for GET /api/calls
+
+Usage: python benchmarks/calls_pagination.py [rows] [per_page]
+"""
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import app
+from src.models.user import db
+from src.models.clinic import Clinic
+from src.models.call import Call
+from src.pagination import keyset_paginate
+
+
+def seed_calls(clinic_id, rows):
+    """Insert synthetic calls for a single clinic in large batches"""
+    start = datetime.utcnow() - timedelta(seconds=rows)
+    batch = []
+    for i in range(rows):
+        batch.append({
+            'id': str(uuid.uuid4()),
+            'clinic_id': clinic_id,
+            'call_type': 'Follow-up',
+            'direction': 'outbound',
+            'phone_number': f'+1555{i:07d}',
+            'status': 'completed',
+            'started_at': start + timedelta(seconds=i),
+        })
+        if len(batch) == 10000:
+            db.session.execute(Call.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Call.__table__.insert(), batch)
+    db.session.commit()
+
+
+def timed(fn, repeat=5):
+    """Return the best wall-clock time of fn() in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(rows=200000, per_page=50):
+    with app.app_context():
+        db.create_all()
+        clinic = Clinic(name=f'Benchmark Clinic {uuid.uuid4().hex[:8]}', subscription_status='active')
+        db.session.add(clinic)
+        db.session.commit()
+        seed_calls(clinic.id, rows)
+
+        base = Call.query.filter_by(clinic_id=clinic.id)
+        last_page = rows // per_page
+        depths = sorted({1, 10, 100, last_page // 2, last_page})
+
+        # Walk the cursor chain once to collect the token that starts each page
+        cursors = {1: None}
+        cursor = None
+        for page in range(1, last_page):
+            _, cursor = keyset_paginate(base, Call.started_at, Call.id, per_page, after=cursor)
+            if page + 1 in depths:
+                cursors[page + 1] = cursor
+
+        print(f'{rows} calls, {per_page} per page')
+        print(f'{"page":>8} {"offset ms":>12} {"cursor ms":>12}')
+        for page in depths:
+            offset_ms = timed(lambda: base.order_by(Call.started_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            ).items)
+            cursor_ms = timed(lambda: keyset_paginate(
+                base, Call.started_at, Call.id, per_page, after=cursors[page]
+            ))
+            print(f'{page:>8} {offset_ms:>12.2f} {cursor_ms:>12.2f}')
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the contact timeline: page latency and SQL statements per page at
+the start and deep into a contact with many events, and check that walking
+every page returns each event exactly once, newest first
+
+Usage: python benchmarks/contact_timeline.py [events_per_type] [per_page]
+"""
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from src.main import app
+from src.models.user import db
+from src.models.clinic import Clinic
+from src.models.call import Call
+from src.models.lead import Lead
+from src.models.appointment import Appointment
+from src.models.whatsapp import WhatsAppConversation, WhatsAppMessage
+from src.phone import phone_keys
+from src.contact_timeline import timeline_page
+
+PHONE = '+15550100200'
+
+
+def seed(events):
+    """One contact with `events` rows of each type, plus noise from another number"""
+    clinic = Clinic(name=f'Timeline Clinic {uuid.uuid4().hex[:8]}', subscription_status='active')
+    db.session.add(clinic)
+    db.session.commit()
+
+    now = datetime.utcnow()
+    for phone in (PHONE, '+15550100999'):
+        e164, reversed_digits = phone_keys(phone)
+        keys = {'phone_e164': e164, 'phone_reversed': reversed_digits}
+        conversation_id = str(uuid.uuid4())
+        db.session.execute(WhatsAppConversation.__table__.insert(), [dict(
+            keys, id=conversation_id, clinic_id=clinic.id, phone_number=phone, status='active'
+        )])
+        db.session.execute(WhatsAppMessage.__table__.insert(), [{
+            'id': str(uuid.uuid4()), 'conversation_id': conversation_id, 'sender_type': 'customer',
+            'message_type': 'text', 'content': f'Message {i}', 'status': 'sent',
+            # Every tenth message shares its timestamp with a call to exercise tie-breaking
+            'sent_at': now - timedelta(minutes=i * 4 + (0 if i % 10 == 0 else 1))
+        } for i in range(events)])
+        db.session.execute(Call.__table__.insert(), [dict(
+            keys, id=str(uuid.uuid4()), clinic_id=clinic.id, call_type='Follow-up', direction='outbound',
+            phone_number=phone, status='completed', started_at=now - timedelta(minutes=i * 4)
+        ) for i in range(events)])
+        db.session.execute(Appointment.__table__.insert(), [dict(
+            keys, id=str(uuid.uuid4()), clinic_id=clinic.id, patient_name='Patient', patient_phone=phone,
+            appointment_date=now - timedelta(minutes=i * 4 + 2), status='completed', confirmation_status='confirmed'
+        ) for i in range(events)])
+        db.session.execute(Lead.__table__.insert(), [dict(
+            keys, id=str(uuid.uuid4()), clinic_id=clinic.id, phone_number=phone, status='new', priority='medium',
+            created_at=now - timedelta(minutes=i * 4 + 3)
+        ) for i in range(events)])
+    db.session.commit()
+    return clinic.id
+
+
+def timed_page(clinic_id, e164, per_page, after=None):
+    statements = []
+    listener = lambda *args: statements.append(1)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    started = time.perf_counter()
+    try:
+        events, next_cursor = timeline_page(clinic_id, e164, per_page, after=after)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return events, next_cursor, (time.perf_counter() - started) * 1000, len(statements)
+
+
+def run(events=2500, per_page=50):
+    with app.app_context():
+        db.create_all()
+        clinic_id = seed(events)
+        e164 = phone_keys(PHONE)[0]
+
+        seen, previous, after, pages = set(), None, None, []
+        while True:
+            page, after, elapsed_ms, statements = timed_page(clinic_id, e164, per_page, after)
+            pages.append((elapsed_ms, statements))
+            for item in page:
+                key = (item['timestamp'], item['type'], item['id'])
+                assert previous is None or key < previous, 'events out of order'
+                assert key not in seen, 'event repeated across pages'
+                seen.add(key)
+                previous = key
+            if after is None:
+                break
+        assert len(seen) == events * 4, f'expected {events * 4} events, got {len(seen)}'
+
+        print(f'{events * 4} events for one contact, {per_page} per page, {len(pages)} pages')
+        print(f'{"page":<10} {"ms":>8} {"statements":>11}')
+        for label, index in (('first', 0), ('middle', len(pages) // 2), ('last', len(pages) - 1)):
+            elapsed_ms, statements = pages[index]
+            print(f'{label:<10} {elapsed_ms:>8.1f} {statements:>11}')
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk lead import against the per-row create_lead path
+
+Usage: python benchmarks/lead_import.py [rows] [chunk_size]
+"""
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import app
+from src.models.user import db
+from src.models.clinic import Clinic
+from src.models.lead import Lead
+
+
+def make_rows(rows, offset=0):
+    return [
+        {'phone_number': f'+1555{offset + i:07d}', 'name': f'Lead {offset + i}', 'source': 'benchmark'}
+        for i in range(rows)
+    ]
+
+
+def new_clinic():
+    clinic = Clinic(name=f'Benchmark Clinic {uuid.uuid4().hex[:8]}', subscription_status='active')
+    db.session.add(clinic)
+    db.session.commit()
+    return clinic.id
+
+
+def per_row_import(clinic_id, leads_data):
+    """The previous bulk path: duplicate check + commit for every row"""
+    for lead_data in leads_data:
+        try:
+            Lead.create_lead(clinic_id, **lead_data)
+        except ValueError:
+            pass
+
+
+def run(rows=20000, chunk_size=1000):
+    with app.app_context():
+        db.create_all()
+        print(f'{rows} leads, chunk size {chunk_size}')
+
+        clinic_id = new_clinic()
+        started = time.perf_counter()
+        per_row_import(clinic_id, make_rows(rows))
+        per_row = time.perf_counter() - started
+        print(f'per-row create_lead : {per_row:8.2f}s {rows / per_row:10.0f} rows/s')
+
+        clinic_id = new_clinic()
+        started = time.perf_counter()
+        created, errors = Lead.bulk_create_leads(clinic_id, make_rows(rows), chunk_size=chunk_size)
+        bulk = time.perf_counter() - started
+        print(f'bulk_create_leads   : {bulk:8.2f}s {rows / bulk:10.0f} rows/s '
+              f'({len(created)} created, {len(errors)} errors)')
+
+        # Half of the rows already exist: measures the set-based duplicate check
+        started = time.perf_counter()
+        created, errors = Lead.bulk_create_leads(clinic_id, make_rows(rows, offset=rows // 2), chunk_size=chunk_size)
+        rerun = time.perf_counter() - started
+        print(f'bulk, 50% duplicates: {rerun:8.2f}s {rows / rerun:10.0f} rows/s '
+              f'({len(created)} created, {len(errors)} errors)')
+        print(f'speed-up: {per_row / bulk:.1f}x')
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark login throughput for password hashing parameters
+
+For each werkzeug method string: end-to-end POST /api/auth/login rate on one
+thread (roughly logins/sec per core), and password verification throughput
+through the hashing pool with `callers` concurrent threads, per core. Also
+checks that a login rehashes a password stored with other parameters.
+
+Usage: python benchmarks/login_throughput.py [seconds] [callers] [method ...]
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import app
+from src.models.user import db, User
+from src.models.clinic import Clinic
+from src.passwords import password_hasher
+from src.rate_limit import get_rate_limiter
+
+DEFAULT_METHODS = ['pbkdf2:sha256:600000', 'scrypt:16384:8:1', 'scrypt:32768:8:1']
+PASSWORD = 'correct horse battery staple'
+
+
+def seed():
+    clinic = Clinic(name=f'Login Clinic {uuid.uuid4().hex[:8]}', subscription_status='active')
+    db.session.add(clinic)
+    db.session.commit()
+    user = User.create_user(clinic.id, 'login_bench', 'login@example.com', PASSWORD, role='agent')
+    return clinic, user
+
+
+def logins_per_second(client, clinic, seconds):
+    body = {'clinic_name': clinic.name, 'username': 'login_bench', 'password': PASSWORD}
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        response = client.post('/api/auth/login', json=body)
+        assert response.status_code == 200, response.get_json()
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def verifications_per_second(password_hash, seconds, callers):
+    counts = [0] * callers
+    deadline = time.perf_counter() + seconds
+
+    def caller(index):
+        while time.perf_counter() < deadline:
+            assert password_hasher.verify(password_hash, PASSWORD)
+            counts[index] += 1
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def run(seconds=3, callers=None, methods=None):
+    cores = os.cpu_count() or 1
+    callers = callers or cores * 2
+    methods = methods or DEFAULT_METHODS
+    workers = app.config['PASSWORD_HASH_WORKERS']
+
+    with app.app_context():
+        # Repeated logins for one user would trip the login rate limits; this
+        # measures hashing, not the limiter
+        app.config['RATELIMIT_ENABLED'] = False
+        get_rate_limiter().enabled = False
+        db.create_all()
+        clinic, user = seed()
+        client = app.test_client()
+
+        print(f'{cores} cores, {workers} hashing threads, {callers} concurrent callers')
+        print(f'{"method":<24} {"logins/s (1 thread)":>20} {"verify/s (pool)":>16} {"verify/s/core":>14}')
+        for method in methods:
+            password_hasher.configure(method, workers=workers)
+            # The first login upgrades the stored hash to the new parameters
+            assert client.post('/api/auth/login', json={
+                'clinic_name': clinic.name, 'username': 'login_bench', 'password': PASSWORD
+            }).status_code == 200
+            db.session.refresh(user)
+            assert not password_hasher.needs_rehash(user.password_hash), 'login did not rehash the password'
+
+            login_rate = logins_per_second(client, clinic, seconds)
+            verify_rate = verifications_per_second(user.password_hash, seconds, callers)
+            print(f'{method:<24} {login_rate:>20.1f} {verify_rate:>16.1f} {verify_rate / cores:>14.1f}')
+
+
+if __name__ == '__main__':
+    numbers = [int(a) for a in sys.argv[1:3]]
+    run(*numbers, methods=sys.argv[3:] or None)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Check that list endpoints issue a fixed number of SQL statements per page
+
+Every list endpoint (and every model list query that has no endpoint yet) is
+run at two page sizes; the SQL statement counts must match, otherwise a
+serializer is lazy-loading something per row. Exits with status 1 on growth.
+
+Usage: python benchmarks/query_counts.py [small_page] [large_page]
+"""
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from src.main import app
+from src.models.user import db, User
+from src.models.clinic import Clinic
+from src.models.call import Call
+from src.models.lead import Lead
+from src.models.appointment import Appointment
+from src.models.whatsapp import WhatsAppConversation
+from src.models.audit import AuditLog
+from src.audit_partitions import write_audit_rows, query_audit_range
+from src.eager_loading import with_serialized_relationships
+from src.identity import build_identity_claims
+from src.phone import phone_keys
+
+
+class StatementCounter:
+    """Count SQL statements sent to the engine while active"""
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(db.engine, 'before_cursor_execute', self._count)
+        return self
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, 'before_cursor_execute', self._count)
+
+
+def seed(rows):
+    """One clinic with `rows` of each listed entity, each owned by a different user"""
+    clinic = Clinic(name=f'Query Count Clinic {uuid.uuid4().hex[:8]}', subscription_status='active')
+    db.session.add(clinic)
+    db.session.commit()
+
+    now = datetime.utcnow()
+    users = [{
+        'id': str(uuid.uuid4()),
+        'clinic_id': clinic.id,
+        'username': f'agent{i}',
+        'email': f'agent{i}@example.com',
+        'password_hash': 'x',
+        'role': 'clinic_admin' if i == 0 else 'agent',
+        'is_active': True
+    } for i in range(rows)]
+    db.session.execute(User.__table__.insert(), users)
+
+    def owned(i):
+        return users[i % rows]['id']
+    
+    def phone_columns(i):
+        # Core inserts skip the models' phone validators
+        e164, reversed_digits = phone_keys(f'+1555{i:07d}')
+        return {'phone_e164': e164, 'phone_reversed': reversed_digits}
+
+    db.session.execute(Lead.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'clinic_id': clinic.id, 'phone_number': f'+1555{i:07d}', **phone_columns(i),
+        'status': 'new', 'priority': 'medium', 'assigned_to': owned(i), 'created_at': now - timedelta(minutes=i)
+    } for i in range(rows)])
+    db.session.execute(Call.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'clinic_id': clinic.id, 'call_type': 'Follow-up', 'direction': 'outbound',
+        'phone_number': f'+1555{i:07d}', **phone_columns(i), 'status': 'completed',
+        'started_at': now - timedelta(minutes=i)
+    } for i in range(rows)])
+    db.session.execute(Appointment.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'clinic_id': clinic.id, 'patient_name': f'Patient {i}',
+        'patient_phone': f'+1555{i:07d}', **phone_columns(i), 'appointment_date': now + timedelta(hours=i),
+        'status': 'scheduled', 'confirmation_status': 'pending', 'created_by': owned(i)
+    } for i in range(rows)])
+    db.session.execute(WhatsAppConversation.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'clinic_id': clinic.id, 'phone_number': f'+1555{i:07d}', **phone_columns(i),
+        'status': 'active', 'assigned_agent_id': owned(i), 'last_message_at': now - timedelta(minutes=i)
+    } for i in range(rows)])
+    write_audit_rows([{
+        'clinic_id': clinic.id, 'user_id': owned(i), 'action': 'update', 'resource_type': 'lead',
+        'created_at': now - timedelta(minutes=i)
+    } for i in range(rows)])
+    db.session.commit()
+
+    admin = db.session.get(User, users[0]['id'])
+    super_admin = User.query.filter_by(role='super_admin').first() or User.create_super_admin(
+        username=f'qc_admin_{uuid.uuid4().hex[:8]}', email='qc@example.com', password=uuid.uuid4().hex
+    )
+    clinic_token = create_access_token(identity=admin.id, additional_claims=build_identity_claims(admin, clinic.id))
+    admin_token = create_access_token(identity=super_admin.id,
+                                      additional_claims=build_identity_claims(super_admin, None))
+    return clinic.id, {'Authorization': f'Bearer {clinic_token}'}, {'Authorization': f'Bearer {admin_token}'}
+
+
+def endpoint_checks(clinic_id, clinic_headers, admin_headers):
+    client = app.test_client()
+
+    def endpoint(url, headers):
+        def fetch(per_page):
+            response = client.get(url.format(per_page=per_page), headers=headers)
+            assert response.status_code == 200, response.get_json()
+        return fetch
+
+    return {
+        'GET /api/calls (cursor)': endpoint('/api/calls/?pagination=cursor&per_page={per_page}', clinic_headers),
+        'GET /api/leads': endpoint('/api/leads/?per_page={per_page}', clinic_headers),
+        'GET /api/contacts/<phone>/timeline': endpoint(
+            '/api/contacts/+15550000001/timeline?per_page={per_page}', clinic_headers),
+        'GET /api/admin/clinics': endpoint('/api/admin/clinics?per_page={per_page}', admin_headers),
+        'GET /api/admin/users': endpoint('/api/admin/users?per_page={per_page}', admin_headers),
+        'GET /api/admin/system/logs': endpoint('/api/admin/system/logs?per_page={per_page}', admin_headers),
+    }
+
+
+def model_checks(clinic_id):
+    def listing(model, order_column):
+        def fetch(per_page):
+            query = with_serialized_relationships(model.query.filter_by(clinic_id=clinic_id), model)
+            for row in query.order_by(order_column.desc()).limit(per_page).all():
+                row.to_dict()
+            db.session.expunge_all()
+        return fetch
+
+    def audit_listing(per_page):
+        for row in query_audit_range(limit=per_page, clinic_id=clinic_id):
+            AuditLog.row_to_dict(row)
+
+    return {
+        'Appointment list': listing(Appointment, Appointment.appointment_date),
+        'WhatsAppConversation list': listing(WhatsAppConversation, WhatsAppConversation.last_message_at),
+        'Audit partition list': audit_listing,
+    }
+
+
+def run(small=5, large=50):
+    failures = 0
+    with app.app_context():
+        db.create_all()
+        clinic_id, clinic_headers, admin_headers = seed(large * 2)
+        checks = {**endpoint_checks(clinic_id, clinic_headers, admin_headers), **model_checks(clinic_id)}
+
+        print(f'{"check":<36} {small:>8} {large:>8}')
+        for name, fetch in checks.items():
+            fetch(small)  # warm identity caches and partition lookups
+            counts = []
+            for per_page in (small, large):
+                with StatementCounter() as counter:
+                    fetch(per_page)
+                counts.append(counter.count)
+            grows = counts[1] > counts[0]
+            failures += grows
+            print(f'{name:<36} {counts[0]:>8} {counts[1]:>8}{"  <-- grows with page size" if grows else ""}')
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the tenant-scoped hot queries
+
+Runs EXPLAIN QUERY PLAN (SQLite) for each hot query and exits non-zero if any
+of them falls back to a full table scan or sorts in a temporary b-tree.
+
+Usage: python benchmarks/query_plans.py
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, text
+from src.main import app
+from src.models.user import db
+from src.models.call import Call
+from src.models.lead import Lead
+from src.models.whatsapp import WhatsAppConversation, WhatsAppMessage
+from src.models.appointment import Appointment
+from src.models.audit import SystemMetric
+from src.phone import phone_filter, same_phone
+from src.audit_partitions import ensure_upcoming_partitions, month_start, partition_table
+
+CLINIC_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def hot_queries():
+    """(name, query) pairs for every hot query that must be index-backed"""
+    now = datetime.utcnow()
+    audit = partition_table(month_start(now))
+    return [
+        ('calls list', Call.query.filter_by(clinic_id=CLINIC_ID)
+            .order_by(Call.started_at.desc(), Call.id.desc())),
+        ('leads duplicate check', Lead.query.filter(
+            Lead.clinic_id == CLINIC_ID, same_phone(Lead.phone_e164, Lead.phone_number, '+15550000000'))),
+        ('leads duplicate check (raw)', Lead.query.filter(
+            Lead.clinic_id == CLINIC_ID, same_phone(Lead.phone_e164, Lead.phone_number, 'ext 12'))),
+        ('leads import duplicates', Lead.query.filter(
+            Lead.clinic_id == CLINIC_ID, Lead.phone_e164.in_(['+15550000000', '+15550000001']))),
+        ('leads import duplicates (raw)', Lead.query.filter(
+            Lead.clinic_id == CLINIC_ID, Lead.phone_e164.is_(None), Lead.phone_number.in_(['ext 12']))),
+        ('leads phone search', Lead.query.filter(
+            Lead.clinic_id == CLINIC_ID, phone_filter(Lead.phone_e164, Lead.phone_reversed, '5550'))),
+        ('leads list', Lead.query.filter_by(clinic_id=CLINIC_ID).order_by(Lead.created_at.desc())),
+        ('conversation lookup', WhatsAppConversation.query.filter(
+            WhatsAppConversation.clinic_id == CLINIC_ID,
+            same_phone(WhatsAppConversation.phone_e164, WhatsAppConversation.phone_number, '+15550000000'))),
+        ('conversations list', WhatsAppConversation.query.filter_by(clinic_id=CLINIC_ID)
+            .order_by(WhatsAppConversation.last_message_at.desc())),
+        ('conversation messages', WhatsAppMessage.query.filter_by(conversation_id=CLINIC_ID)
+            .order_by(WhatsAppMessage.sent_at)),
+        ('appointments range', Appointment.query.filter(
+            Appointment.clinic_id == CLINIC_ID,
+            Appointment.appointment_date >= now,
+            Appointment.appointment_date < now + timedelta(days=7)
+        ).order_by(Appointment.appointment_date)),
+        ('audit logs list', select(audit).where(audit.c.clinic_id == CLINIC_ID)
+            .order_by(audit.c.created_at.desc(), audit.c.id.desc())),
+        ('clinic metric series', SystemMetric.query.filter(
+            SystemMetric.metric_name == 'calls_count',
+            SystemMetric.clinic_id == CLINIC_ID,
+            SystemMetric.recorded_at >= now - timedelta(days=30)
+        ).order_by(SystemMetric.recorded_at)),
+        ('system metrics window', SystemMetric.query.filter(
+            SystemMetric.recorded_at >= now - timedelta(days=30)
+        ).order_by(SystemMetric.recorded_at.desc())),
+    ]
+
+
+def explain(query):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query"""
+    statement = getattr(query, 'statement', query)
+    sql = str(statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    return [row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}'))]
+
+
+def is_bad_step(detail):
+    """A step is bad if it scans a table without an index or sorts in memory"""
+    if detail.startswith('SCAN') and 'USING' not in detail:
+        return True
+    return 'USE TEMP B-TREE' in detail
+
+
+def check():
+    failures = 0
+    with app.app_context():
+        db.create_all()
+        ensure_upcoming_partitions()
+        for name, query in hot_queries():
+            plan = explain(query)
+            bad = [step for step in plan if is_bad_step(step)]
+            status = 'FAIL' if bad else 'ok'
+            print(f'[{status:>4}] {name}: {" | ".join(plan)}')
+            failures += bool(bad)
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check() else 0)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark login rate limiting: time per limiter check for the login rules,
+and a credential-stuffing run against /api/auth/login that reports how many
+attempts reached the database and password hashing and how many statements
+were executed in total
+
+Usage: python benchmarks/rate_limit.py [memory|fakeredis] [checks] [attempts]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('RATELIMIT_STORE', sys.argv[1] if len(sys.argv) > 1 else 'memory')
+
+from sqlalchemy import event
+from src.main import app
+from src.models.user import db, User
+from src.models.clinic import Clinic
+from src.passwords import password_hasher
+from src.rate_limit import get_rate_limiter, rules
+
+
+def seed():
+    clinic = Clinic(name='Rate Limit Clinic', is_active=True, subscription_status='active', subscription_plan='basic')
+    db.session.add(clinic)
+    db.session.flush()
+    User.create_user(
+        clinic_id=clinic.id, username='target', email='target@example.com', password='correct horse',
+        role='clinic_admin', first_name='Target', last_name='User'
+    )
+
+
+def time_checks(checks):
+    with app.test_request_context():
+        limiter = get_rate_limiter()
+        started = time.perf_counter_ns()
+        for i in range(checks):
+            limiter.hit(rules([
+                ('RATELIMIT_LOGIN_PER_IP', f'10.0.{i % 250}.{i % 200}'),
+                ('RATELIMIT_LOGIN_PER_CLINIC', f'clinic{i % 100}'),
+                ('RATELIMIT_LOGIN_PER_USER', f'clinic{i % 100}:user{i}')
+            ]))
+        return (time.perf_counter_ns() - started) / checks / 1000
+
+
+def credential_stuffing(attempts):
+    """Wrong passwords for one account from a handful of addresses"""
+    client = app.test_client()
+    statements = [0]
+    hashes = [0]
+    verify = password_hasher.verify
+
+    def counting_verify(*args):
+        hashes[0] += 1
+        return verify(*args)
+
+    password_hasher.verify = counting_verify
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.__setitem__(0, statements[0] + 1))
+    codes = {}
+    started = time.perf_counter()
+    try:
+        for i in range(attempts):
+            response = client.post(
+                '/api/auth/login',
+                json={'clinic_name': 'Rate Limit Clinic', 'username': 'target', 'password': f'guess{i}'},
+                environ_base={'REMOTE_ADDR': f'192.0.2.{i % 8}'}
+            )
+            codes[response.status_code] = codes.get(response.status_code, 0) + 1
+    finally:
+        password_hasher.verify = verify
+    return time.perf_counter() - started, codes, statements[0], hashes[0]
+
+
+def run(checks=20000, attempts=500):
+    with app.app_context():
+        db.create_all()
+        seed()
+        db.session.commit()
+
+    print(f"store: {app.config['RATELIMIT_STORE']}")
+    print(f'limiter check (3 rules): {time_checks(checks):.1f} us')
+
+    elapsed, codes, statements, hashes = credential_stuffing(attempts)
+    print(f'{attempts} attempts in {elapsed:.2f}s: ' + ', '.join(f'{code}: {count}' for code, count in sorted(codes.items())))
+    print(f'password hashes: {hashes}, statements: {statements}')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[2:]])
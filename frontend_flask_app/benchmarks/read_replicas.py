@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Exercise read replica routing with two SQLite files: the primary is copied
+to a "replica", more calls are written to the primary only, and the calls
+list is read before and after the user commits a write. Reports which
+database each request read from (by the call total it sees) and how many
+statements each engine executed
+
+Usage: python benchmarks/read_replicas.py [calls] [sticky seconds]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+directory = tempfile.mkdtemp()
+PRIMARY = os.path.join(directory, 'primary.db')
+REPLICA = os.path.join(directory, 'replica.db')
+STICKY_SECONDS = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+
+os.environ['DATABASE_URL'] = f'sqlite:///{PRIMARY}'
+os.environ['DATABASE_REPLICA_URLS'] = f'sqlite:///{REPLICA}'
+os.environ['REPLICA_STICKY_SECONDS'] = str(STICKY_SECONDS)
+os.environ.setdefault('AUDIT_ASYNC', 'false')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from src.main import app
+from src.models.user import db, User
+from src.models.clinic import Clinic
+from src.models.call import Call
+
+
+def seed_calls(clinic_id, count, offset=0):
+    for i in range(offset, offset + count):
+        Call.create_call(clinic_id=clinic_id, phone_number=f'+1555{i:07d}', call_type='General Inquiry', direction='inbound')
+
+
+def replicate():
+    """Stand-in for replication: copy the primary into the replica file"""
+    source, target = sqlite3.connect(PRIMARY), sqlite3.connect(REPLICA)
+    source.backup(target)
+    source.close()
+    target.close()
+
+
+def run(calls=100):
+    with app.app_context():
+        db.create_all()
+        clinic = Clinic(name='Replica Clinic', subscription_status='active')
+        db.session.add(clinic)
+        db.session.commit()
+        User.create_user(clinic_id=clinic.id, username='reader', email='reader@example.com', password='reader-password', role='clinic_admin')
+        seed_calls(clinic.id, calls)
+        clinic_id = clinic.id
+    replicate()
+    with app.app_context():
+        # Written after the copy: only the primary has these
+        seed_calls(clinic_id, calls, offset=calls)
+
+        statements = {}
+        for key, engine in db.engines.items():
+            event.listen(engine, 'before_cursor_execute',
+                         lambda *args, key=key or 'primary': statements.__setitem__(key, statements.get(key, 0) + 1))
+
+    client = app.test_client()
+    response = client.post('/api/auth/login', json={'clinic_name': 'Replica Clinic', 'username': 'reader', 'password': 'reader-password'})
+    headers = {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    def read(label):
+        statements.clear()
+        total = client.get('/api/calls/', headers=headers).get_json()['total_calls']
+        source = 'replica' if total == calls else 'primary'
+        print(f'{label:<28} total={total:<5} read from {source:<8} statements={statements}')
+
+    print(f'primary has {calls * 2} calls, replica {calls}, sticky window {STICKY_SECONDS}s')
+    read('list')
+    response = client.post('/api/auth/change-password', headers=headers,
+                           json={'current_password': 'reader-password', 'new_password': 'reader-password-2'})
+    assert response.status_code == 200, response.get_json()
+    read('list after own write')
+    time.sleep(STICKY_SECONDS + 0.1)
+    read('list after sticky window')
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:2]])
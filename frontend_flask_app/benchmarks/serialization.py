@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark list-page serialization: ORM objects + to_dict() + jsonify versus
+row tuples + RowSerializer + serializers.dumps, for calls, leads and messages
+
+Usage: python benchmarks/serialization.py [rows] [per_page]
+"""
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import json
+from src.main import app
+from src.models.user import db, User
+from src.models.clinic import Clinic
+from src.models.call import Call
+from src.models.lead import Lead
+from src.models.whatsapp import WhatsAppConversation, WhatsAppMessage
+from src.eager_loading import with_serialized_relationships
+from src.serializers import CALL_SERIALIZER, LEAD_SERIALIZER, MESSAGE_SERIALIZER, dumps, orjson
+
+
+def seed(rows):
+    clinic = Clinic(name=f'Serialization Clinic {uuid.uuid4().hex[:8]}', subscription_status='active')
+    db.session.add(clinic)
+    db.session.commit()
+
+    user_id = str(uuid.uuid4())
+    db.session.execute(User.__table__.insert(), [{
+        'id': user_id, 'clinic_id': clinic.id, 'username': 'agent', 'email': 'agent@example.com',
+        'password_hash': 'x', 'role': 'agent', 'is_active': True
+    }])
+    conversation_id = str(uuid.uuid4())
+    db.session.execute(WhatsAppConversation.__table__.insert(), [{
+        'id': conversation_id, 'clinic_id': clinic.id, 'phone_number': '+15550000000', 'status': 'active'
+    }])
+
+    now = datetime.utcnow()
+    db.session.execute(Call.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'clinic_id': clinic.id, 'call_type': 'Follow-up', 'direction': 'outbound',
+        'phone_number': f'+1555{i:07d}', 'status': 'completed', 'duration_seconds': i % 600,
+        'transcript': 'Hello, this is a reminder about your appointment. ' * 5,
+        'started_at': now - timedelta(seconds=i), 'created_at': now, 'updated_at': now
+    } for i in range(rows)])
+    db.session.execute(Lead.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'clinic_id': clinic.id, 'phone_number': f'+1555{i:07d}', 'name': f'Lead {i}',
+        'status': 'new', 'priority': 'high', 'assigned_to': user_id if i % 2 else None,
+        'created_at': now - timedelta(seconds=i), 'updated_at': now
+    } for i in range(rows)])
+    db.session.execute(WhatsAppMessage.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'conversation_id': conversation_id, 'sender_type': ('customer', 'ai')[i % 2],
+        'message_type': 'text', 'content': f'Message {i}', 'status': 'sent',
+        'sent_at': now - timedelta(seconds=i), 'created_at': now
+    } for i in range(rows)])
+    db.session.commit()
+    return clinic.id, conversation_id
+
+
+def rows_per_second(fn, rows, repeat=5):
+    """Best-of-`repeat` throughput of fn(), which serializes `rows` rows"""
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return rows / best
+
+
+def run(rows=20000, per_page=100):
+    with app.app_context():
+        db.create_all()
+        clinic_id, conversation_id = seed(rows)
+
+        resources = [
+            ('calls', Call, Call.query.filter_by(clinic_id=clinic_id), Call.started_at, CALL_SERIALIZER),
+            ('leads', Lead, Lead.query.filter_by(clinic_id=clinic_id), Lead.created_at, LEAD_SERIALIZER),
+            ('messages', WhatsAppMessage, WhatsAppMessage.query.filter_by(conversation_id=conversation_id),
+             WhatsAppMessage.sent_at, MESSAGE_SERIALIZER),
+        ]
+
+        print(f'{rows} rows per resource, {per_page} per page, JSON backend: {"orjson" if orjson else "json"}')
+        print(f'{"resource":<10} {"to_dict rows/s":>16} {"columnar rows/s":>16} {"speedup":>8}')
+        pages = range(0, rows, per_page)
+        for name, model, query, order_column, serializer in resources:
+            ordered = with_serialized_relationships(query, model).order_by(order_column.desc())
+            plan = serializer.plan()
+            narrow = plan.apply(query).order_by(order_column.desc())
+
+            def orm_path():
+                for offset in pages:
+                    items = ordered.offset(offset).limit(per_page).all()
+                    json.dumps({name: [item.to_dict() for item in items]})
+
+            def columnar_path():
+                for offset in pages:
+                    items = narrow.offset(offset).limit(per_page).all()
+                    dumps({name: plan.serialize(items)})
+
+            orm_rate = rows_per_second(orm_path, rows)
+            columnar_rate = rows_per_second(columnar_path, rows)
+            print(f'{name:<10} {orm_rate:>16,.0f} {columnar_rate:>16,.0f} {columnar_rate / orm_rate:>7.1f}x')
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the token blocklist check: time per is_revoked() call for valid
+tokens (answered by the bloom filter) and revoked tokens (confirmed against
+the store), the filter's observed false-positive rate, and, with fakeredis,
+how long a revocation takes to reach another worker's filter over pub/sub
+
+Usage: python benchmarks/token_blocklist.py [memory|fakeredis] [revoked] [checks]
+"""
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.token_blocklist import TokenBlocklist, MemoryBlocklistStore, RedisBlocklistStore
+
+
+def per_call_ns(fn, items):
+    started = time.perf_counter_ns()
+    for item in items:
+        fn(item)
+    return (time.perf_counter_ns() - started) / len(items)
+
+
+def propagation_ms(first, second):
+    """Revoke through one worker's blocklist and wait for the other's filter to see it"""
+    jti = str(uuid.uuid4())
+    started = time.perf_counter()
+    first.revoke(jti, time.time() + 900)
+    while jti not in second._bloom:
+        if time.perf_counter() - started > 5:
+            return None
+        time.sleep(0.0005)
+    return (time.perf_counter() - started) * 1000
+
+
+def run(backend='memory', revoked=10000, checks=100000):
+    if backend == 'fakeredis':
+        import fakeredis
+        server = fakeredis.FakeServer()
+        blocklist = TokenBlocklist(RedisBlocklistStore(fakeredis.FakeRedis(server=server)))
+        other = TokenBlocklist(RedisBlocklistStore(fakeredis.FakeRedis(server=server)))
+    else:
+        blocklist, other = TokenBlocklist(MemoryBlocklistStore()), None
+
+    expires_at = time.time() + 900
+    revoked_ids = [str(uuid.uuid4()) for _ in range(revoked)]
+    for jti in revoked_ids:
+        blocklist.revoke(jti, expires_at)
+    valid_ids = [str(uuid.uuid4()) for _ in range(checks)]
+
+    valid_ns = per_call_ns(blocklist.is_revoked, valid_ids)
+    revoked_ns = per_call_ns(blocklist.is_revoked, revoked_ids)
+    false_positives = sum(jti in blocklist._bloom for jti in valid_ids)
+    assert all(blocklist.is_revoked(jti) for jti in revoked_ids)
+    assert not any(blocklist.is_revoked(jti) for jti in valid_ids)
+
+    print(f'store: {backend}, {revoked} revoked tokens, {checks} valid tokens checked')
+    print(f'valid token check     {valid_ns / 1000:>8.2f} us')
+    print(f'revoked token check   {revoked_ns / 1000:>8.2f} us')
+    print(f'bloom false positives {false_positives / checks:>8.4%}')
+    if other is not None:
+        other.is_revoked('warm-up')  # subscribe and load the filter
+        delay = propagation_ms(blocklist, other)
+        print(f'pub/sub propagation   {delay:>8.2f} ms' if delay is not None else 'pub/sub propagation   timed out')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:2] + [int(a) for a in sys.argv[2:4]]
+    run(*args)
@@ -0,0 +1,238 @@
+"""initial schema
+
+Revision ID: 1b7d4e9c3a52
+Revises: 
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b7d4e9c3a52'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The tables as the models defined them before the first migration;
+    # every later revision changes the schema from here
+    op.create_table('clinics',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('slug', sa.String(length=100), nullable=False),
+    sa.Column('subscription_status', sa.String(length=50), nullable=False),
+    sa.Column('subscription_plan', sa.String(length=50), nullable=False),
+    sa.Column('subscription_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('max_users', sa.Integer(), nullable=False),
+    sa.Column('max_monthly_calls', sa.Integer(), nullable=False),
+    sa.Column('max_monthly_messages', sa.Integer(), nullable=False),
+    sa.Column('whatsapp_phone_number_id', sa.String(length=255), nullable=True),
+    sa.Column('whatsapp_access_token', sa.Text(), nullable=True),
+    sa.Column('whatsapp_webhook_url', sa.String(length=500), nullable=True),
+    sa.Column('whatsapp_webhook_verify_token', sa.String(length=255), nullable=True),
+    sa.Column('settings', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.String(length=36), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name'),
+    sa.UniqueConstraint('slug')
+    )
+    op.create_table('system_metrics',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('clinic_id', sa.String(length=36), nullable=True),
+    sa.Column('metric_name', sa.String(length=100), nullable=False),
+    sa.Column('metric_value', sa.Numeric(), nullable=False),
+    sa.Column('metric_unit', sa.String(length=50), nullable=True),
+    sa.Column('dimensions', sa.JSON(), nullable=True),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('clinic_id', sa.String(length=36), nullable=True),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('role', sa.String(length=50), nullable=False),
+    sa.Column('permissions', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('last_login_at', sa.DateTime(), nullable=True),
+    sa.Column('password_changed_at', sa.DateTime(), nullable=True),
+    sa.Column('failed_login_attempts', sa.Integer(), nullable=True),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('appointments',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('clinic_id', sa.String(length=36), nullable=False),
+    sa.Column('patient_name', sa.String(length=255), nullable=False),
+    sa.Column('patient_phone', sa.String(length=50), nullable=False),
+    sa.Column('patient_email', sa.String(length=255), nullable=True),
+    sa.Column('appointment_type', sa.String(length=100), nullable=True),
+    sa.Column('appointment_date', sa.DateTime(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('confirmation_status', sa.String(length=50), nullable=False),
+    sa.Column('confirmation_method', sa.String(length=50), nullable=True),
+    sa.Column('confirmed_at', sa.DateTime(), nullable=True),
+    sa.Column('cancelled_at', sa.DateTime(), nullable=True),
+    sa.Column('cancellation_reason', sa.Text(), nullable=True),
+    sa.Column('reschedule_count', sa.Integer(), nullable=True),
+    sa.Column('original_appointment_date', sa.DateTime(), nullable=True),
+    sa.Column('reminder_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('assigned_provider', sa.String(length=255), nullable=True),
+    sa.Column('created_by', sa.String(length=36), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('audit_logs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('clinic_id', sa.String(length=36), nullable=True),
+    sa.Column('user_id', sa.String(length=36), nullable=True),
+    sa.Column('action', sa.String(length=100), nullable=False),
+    sa.Column('resource_type', sa.String(length=100), nullable=False),
+    sa.Column('resource_id', sa.String(length=36), nullable=True),
+    sa.Column('old_values', sa.JSON(), nullable=True),
+    sa.Column('new_values', sa.JSON(), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.Text(), nullable=True),
+    sa.Column('session_id', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('leads',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('clinic_id', sa.String(length=36), nullable=False),
+    sa.Column('phone_number', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('priority', sa.String(length=20), nullable=False),
+    sa.Column('source', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('lead_metadata', sa.JSON(), nullable=True),
+    sa.Column('last_contacted_at', sa.DateTime(), nullable=True),
+    sa.Column('next_contact_at', sa.DateTime(), nullable=True),
+    sa.Column('assigned_to', sa.String(length=36), nullable=True),
+    sa.Column('call_attempts', sa.Integer(), nullable=True),
+    sa.Column('max_call_attempts', sa.Integer(), nullable=True),
+    sa.Column('do_not_call', sa.Boolean(), nullable=True),
+    sa.Column('do_not_call_reason', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_to'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('whatsapp_conversations',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('clinic_id', sa.String(length=36), nullable=False),
+    sa.Column('phone_number', sa.String(length=50), nullable=False),
+    sa.Column('contact_name', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('assigned_agent_id', sa.String(length=36), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(), nullable=True),
+    sa.Column('last_message_from', sa.String(length=20), nullable=True),
+    sa.Column('unread_count', sa.Integer(), nullable=True),
+    sa.Column('is_ai_handled', sa.Boolean(), nullable=True),
+    sa.Column('handoff_requested_at', sa.DateTime(), nullable=True),
+    sa.Column('handoff_reason', sa.Text(), nullable=True),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('conversation_metadata', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['assigned_agent_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('appointment_confirmations',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('appointment_id', sa.String(length=36), nullable=False),
+    sa.Column('confirmation_method', sa.String(length=50), nullable=False),
+    sa.Column('message_sent', sa.Text(), nullable=True),
+    sa.Column('response_received', sa.Text(), nullable=True),
+    sa.Column('response_type', sa.String(length=50), nullable=True),
+    sa.Column('responded_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=False),
+    sa.Column('external_message_id', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('calls',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('clinic_id', sa.String(length=36), nullable=False),
+    sa.Column('external_call_id', sa.String(length=255), nullable=True),
+    sa.Column('call_type', sa.String(length=20), nullable=False),
+    sa.Column('direction', sa.String(length=20), nullable=False),
+    sa.Column('phone_number', sa.String(length=50), nullable=False),
+    sa.Column('contact_name', sa.String(length=255), nullable=True),
+    sa.Column('lead_id', sa.String(length=36), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('duration_seconds', sa.Integer(), nullable=True),
+    sa.Column('recording_url', sa.Text(), nullable=True),
+    sa.Column('transcript', sa.Text(), nullable=True),
+    sa.Column('ai_summary', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('ended_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['lead_id'], ['leads.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('whatsapp_messages',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('conversation_id', sa.String(length=36), nullable=False),
+    sa.Column('external_message_id', sa.String(length=255), nullable=True),
+    sa.Column('sender_type', sa.String(length=20), nullable=False),
+    sa.Column('sender_name', sa.String(length=255), nullable=True),
+    sa.Column('sender_phone', sa.String(length=50), nullable=True),
+    sa.Column('message_type', sa.String(length=50), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('media_url', sa.Text(), nullable=True),
+    sa.Column('media_type', sa.String(length=50), nullable=True),
+    sa.Column('media_filename', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(), nullable=True),
+    sa.Column('failed_reason', sa.Text(), nullable=True),
+    sa.Column('message_metadata', sa.JSON(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['whatsapp_conversations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('whatsapp_messages')
+    op.drop_table('calls')
+    op.drop_table('appointment_confirmations')
+    op.drop_table('whatsapp_conversations')
+    op.drop_table('leads')
+    op.drop_table('audit_logs')
+    op.drop_table('appointments')
+    op.drop_table('users')
+    op.drop_table('system_metrics')
+    op.drop_table('clinics')
@@ -0,0 +1,47 @@
+"""add composite indexes for tenant-scoped hot queries
+
+Revision ID: 3f2a9c1d7b4e
+Revises: 1b7d4e9c3a52
+Create Date: 2026-10-18 15:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b4e'
+down_revision = '1b7d4e9c3a52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_calls_clinic_started_at', 'calls',
+                    ['clinic_id', sa.text('started_at DESC'), sa.text('id DESC')])
+    op.create_index('ix_leads_clinic_phone', 'leads', ['clinic_id', 'phone_number'])
+    op.create_index('ix_leads_clinic_created_at', 'leads', ['clinic_id', sa.text('created_at DESC')])
+    op.create_index('ix_whatsapp_conversations_clinic_phone', 'whatsapp_conversations',
+                    ['clinic_id', 'phone_number'])
+    op.create_index('ix_whatsapp_conversations_clinic_last_message_at', 'whatsapp_conversations',
+                    ['clinic_id', sa.text('last_message_at DESC')])
+    op.create_index('ix_whatsapp_messages_conversation_sent_at', 'whatsapp_messages',
+                    ['conversation_id', 'sent_at'])
+    op.create_index('ix_appointments_clinic_date', 'appointments', ['clinic_id', 'appointment_date'])
+    op.create_index('ix_audit_logs_clinic_created_at', 'audit_logs', ['clinic_id', sa.text('created_at DESC')])
+    op.create_index('ix_system_metrics_name_clinic_recorded_at', 'system_metrics',
+                    ['metric_name', 'clinic_id', 'recorded_at'])
+    op.create_index('ix_system_metrics_recorded_at', 'system_metrics', ['recorded_at'])
+
+
+def downgrade():
+    op.drop_index('ix_system_metrics_recorded_at', table_name='system_metrics')
+    op.drop_index('ix_system_metrics_name_clinic_recorded_at', table_name='system_metrics')
+    op.drop_index('ix_audit_logs_clinic_created_at', table_name='audit_logs')
+    op.drop_index('ix_appointments_clinic_date', table_name='appointments')
+    op.drop_index('ix_whatsapp_messages_conversation_sent_at', table_name='whatsapp_messages')
+    op.drop_index('ix_whatsapp_conversations_clinic_last_message_at', table_name='whatsapp_conversations')
+    op.drop_index('ix_whatsapp_conversations_clinic_phone', table_name='whatsapp_conversations')
+    op.drop_index('ix_leads_clinic_created_at', table_name='leads')
+    op.drop_index('ix_leads_clinic_phone', table_name='leads')
+    op.drop_index('ix_calls_clinic_started_at', table_name='calls')
@@ -0,0 +1,46 @@
+"""add lead import jobs
+
+Revision ID: 5d9e2b7a4c18
+Revises: c7e3a5f19d20
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d9e2b7a4c18'
+down_revision = 'c7e3a5f19d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'lead_import_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('clinic_id', sa.String(length=36), nullable=False),
+        sa.Column('created_by', sa.String(length=36), nullable=True),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('file_format', sa.String(length=10), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('bytes_total', sa.Integer(), nullable=True),
+        sa.Column('bytes_processed', sa.Integer(), nullable=True),
+        sa.Column('rows_processed', sa.Integer(), nullable=True),
+        sa.Column('created_count', sa.Integer(), nullable=True),
+        sa.Column('error_count', sa.Integer(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('failure_reason', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('lead_import_jobs')
@@ -0,0 +1,33 @@
+"""add clinic hourly rollups
+
+Revision ID: 8b41d0e2c6a5
+Revises: 3f2a9c1d7b4e
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b41d0e2c6a5'
+down_revision = '3f2a9c1d7b4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'clinic_hourly_rollups',
+        sa.Column('clinic_id', sa.String(length=36), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('dimension', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('clinic_id', 'metric', 'bucket_start', 'dimension')
+    )
+
+
+def downgrade():
+    op.drop_table('clinic_hourly_rollups')
@@ -0,0 +1,84 @@
+"""add normalized phone columns
+
+Revision ID: a9d3c5e7f214
+Revises: e4b8f2a61c93
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.phone import phone_keys
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3c5e7f214'
+down_revision = 'e4b8f2a61c93'
+branch_labels = None
+depends_on = None
+
+# (table, index prefix, column the keys are derived from)
+PHONE_TABLES = [
+    ('calls', 'ix_calls', 'phone_number'),
+    ('leads', 'ix_leads', 'phone_number'),
+    ('whatsapp_conversations', 'ix_whatsapp_conversations', 'phone_number'),
+    ('appointments', 'ix_appointments', 'patient_phone'),
+]
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill(bind, table_name, source_column):
+    """Derive the keys for existing rows, one id-ordered batch at a time"""
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.String),
+        sa.column(source_column, sa.String),
+        sa.column('phone_e164', sa.String),
+        sa.column('phone_reversed', sa.String),
+    )
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values(
+        phone_e164=sa.bindparam('e164'), phone_reversed=sa.bindparam('reversed')
+    )
+
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[source_column])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for row_id, phone in rows:
+            e164, reversed_digits = phone_keys(phone)
+            if e164 is not None:
+                params.append({'row_id': row_id, 'e164': e164, 'reversed': reversed_digits})
+        if params:
+            bind.execute(update, params)
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    for table_name, prefix, source_column in PHONE_TABLES:
+        op.add_column(table_name, sa.Column('phone_e164', sa.String(length=16), nullable=True))
+        op.add_column(table_name, sa.Column('phone_reversed', sa.String(length=15), nullable=True))
+
+    bind = op.get_bind()
+    for table_name, prefix, source_column in PHONE_TABLES:
+        backfill(bind, table_name, source_column)
+
+    for table_name, prefix, source_column in PHONE_TABLES:
+        op.create_index(f'{prefix}_clinic_phone_e164', table_name, ['clinic_id', 'phone_e164'])
+        op.create_index(f'{prefix}_clinic_phone_reversed', table_name, ['clinic_id', 'phone_reversed'])
+
+
+def downgrade():
+    for table_name, prefix, source_column in PHONE_TABLES:
+        op.drop_index(f'{prefix}_clinic_phone_reversed', table_name=table_name)
+        op.drop_index(f'{prefix}_clinic_phone_e164', table_name=table_name)
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column('phone_reversed')
+            batch_op.drop_column('phone_e164')
@@ -0,0 +1,45 @@
+"""add contact timeline indexes
+
+Revision ID: b6e1f4a8d032
+Revises: a9d3c5e7f214
+Create Date: 2026-10-18 19:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1f4a8d032'
+down_revision = 'a9d3c5e7f214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The timeline indexes lead with (clinic_id, phone_e164), so they replace
+    # the plain exact-match indexes
+    op.drop_index('ix_calls_clinic_phone_e164', table_name='calls')
+    op.create_index('ix_calls_clinic_phone_started_at', 'calls',
+                    ['clinic_id', 'phone_e164', sa.text('started_at DESC'), sa.text('id DESC')])
+    op.drop_index('ix_leads_clinic_phone_e164', table_name='leads')
+    op.create_index('ix_leads_clinic_phone_created_at', 'leads',
+                    ['clinic_id', 'phone_e164', sa.text('created_at DESC'), sa.text('id DESC')])
+    op.drop_index('ix_appointments_clinic_phone_e164', table_name='appointments')
+    op.create_index('ix_appointments_clinic_phone_date', 'appointments',
+                    ['clinic_id', 'phone_e164', sa.text('appointment_date DESC'), sa.text('id DESC')])
+    op.drop_index('ix_whatsapp_messages_conversation_sent_at', table_name='whatsapp_messages')
+    op.create_index('ix_whatsapp_messages_conversation_sent_at', 'whatsapp_messages',
+                    ['conversation_id', sa.text('sent_at DESC'), sa.text('id DESC')])
+
+
+def downgrade():
+    op.drop_index('ix_whatsapp_messages_conversation_sent_at', table_name='whatsapp_messages')
+    op.create_index('ix_whatsapp_messages_conversation_sent_at', 'whatsapp_messages',
+                    ['conversation_id', 'sent_at'])
+    op.drop_index('ix_appointments_clinic_phone_date', table_name='appointments')
+    op.create_index('ix_appointments_clinic_phone_e164', 'appointments', ['clinic_id', 'phone_e164'])
+    op.drop_index('ix_leads_clinic_phone_created_at', table_name='leads')
+    op.create_index('ix_leads_clinic_phone_e164', 'leads', ['clinic_id', 'phone_e164'])
+    op.drop_index('ix_calls_clinic_phone_started_at', table_name='calls')
+    op.create_index('ix_calls_clinic_phone_e164', 'calls', ['clinic_id', 'phone_e164'])
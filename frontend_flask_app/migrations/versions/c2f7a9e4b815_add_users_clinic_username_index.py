@@ -0,0 +1,24 @@
+"""add users clinic username index
+
+Revision ID: c2f7a9e4b815
+Revises: b6e1f4a8d032
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f7a9e4b815'
+down_revision = 'b6e1f4a8d032'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # clinics.name is already covered by its unique constraint
+    op.create_index('ix_users_clinic_username', 'users', ['clinic_id', 'username'])
+
+
+def downgrade():
+    op.drop_index('ix_users_clinic_username', table_name='users')
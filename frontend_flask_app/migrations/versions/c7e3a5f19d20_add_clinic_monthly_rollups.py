@@ -0,0 +1,32 @@
+"""add clinic monthly rollups
+
+Revision ID: c7e3a5f19d20
+Revises: 8b41d0e2c6a5
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3a5f19d20'
+down_revision = '8b41d0e2c6a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'clinic_monthly_rollups',
+        sa.Column('clinic_id', sa.String(length=36), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('month_start', sa.DateTime(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['clinic_id'], ['clinics.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('clinic_id', 'metric', 'month_start')
+    )
+
+
+def downgrade():
+    op.drop_table('clinic_monthly_rollups')
@@ -0,0 +1,26 @@
+"""drop legacy audit logs index
+
+Revision ID: d8a3f1c6b027
+Revises: c2f7a9e4b815
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3f1c6b027'
+down_revision = 'c2f7a9e4b815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Audit logs are listed from the monthly partitions, which carry their own
+    # indexes; nothing queries the legacy table by clinic any more
+    op.drop_index('ix_audit_logs_clinic_created_at', table_name='audit_logs')
+
+
+def downgrade():
+    op.create_index('ix_audit_logs_clinic_created_at', 'audit_logs', ['clinic_id', sa.text('created_at DESC')])
@@ -0,0 +1,69 @@
+"""add call full-text search index
+
+Revision ID: e4b8f2a61c93
+Revises: 5d9e2b7a4c18
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8f2a61c93'
+down_revision = '5d9e2b7a4c18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE calls_fts USING fts5(
+                contact_name, transcript, ai_summary,
+                content='calls', content_rowid='rowid', tokenize='porter unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER calls_fts_insert AFTER INSERT ON calls BEGIN
+                INSERT INTO calls_fts(rowid, contact_name, transcript, ai_summary)
+                VALUES (new.rowid, new.contact_name, new.transcript, new.ai_summary);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER calls_fts_delete AFTER DELETE ON calls BEGIN
+                INSERT INTO calls_fts(calls_fts, rowid, contact_name, transcript, ai_summary)
+                VALUES ('delete', old.rowid, old.contact_name, old.transcript, old.ai_summary);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER calls_fts_update AFTER UPDATE OF contact_name, transcript, ai_summary ON calls BEGIN
+                INSERT INTO calls_fts(calls_fts, rowid, contact_name, transcript, ai_summary)
+                VALUES ('delete', old.rowid, old.contact_name, old.transcript, old.ai_summary);
+                INSERT INTO calls_fts(rowid, contact_name, transcript, ai_summary)
+                VALUES (new.rowid, new.contact_name, new.transcript, new.ai_summary);
+            END
+        """)
+        # Index the calls that already exist
+        op.execute("INSERT INTO calls_fts(calls_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute("""
+            ALTER TABLE calls ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(contact_name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(ai_summary, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(transcript, '')), 'C')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_calls_search_vector ON calls USING gin (search_vector)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS calls_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS calls_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS calls_fts_insert")
+        op.execute("DROP TABLE IF EXISTS calls_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_calls_search_vector")
+        op.execute("ALTER TABLE calls DROP COLUMN IF EXISTS search_vector")
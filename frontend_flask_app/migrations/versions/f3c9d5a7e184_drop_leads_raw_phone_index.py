@@ -0,0 +1,27 @@
+"""drop leads raw phone index
+
+Revision ID: f3c9d5a7e184
+Revises: d8a3f1c6b027
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c9d5a7e184'
+down_revision = 'd8a3f1c6b027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Duplicate checks match on phone_e164 and fall back to the raw number
+    # only where phone_e164 is NULL, so ix_leads_clinic_phone_created_at
+    # serves them all
+    op.drop_index('ix_leads_clinic_phone', table_name='leads')
+
+
+def downgrade():
+    op.create_index('ix_leads_clinic_phone', 'leads', ['clinic_id', 'phone_number'])
@@ -0,0 +1,345 @@
+import gzip
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import MetaData, Table, Column, Index, event, inspect, select, text, tuple_
+from src.models.user import db, User
+from src.models.audit import AuditLog
+
+PARTITION_PREFIX = 'audit_logs_'
+PARTITION_PATTERN = re.compile(r'^audit_logs_(\d{4})_(\d{2})$')
+
+# Partitions are created at runtime, so they live outside db.metadata and are
+# invisible to create_all and Alembic autogenerate. Columns added to AuditLog
+# reach existing partitions through sync_partition_columns; a revision that
+# renames, retypes or drops one must alter every partition itself
+partition_metadata = MetaData()
+
+# Columns the log search API can filter on by equality
+AUDIT_FILTER_COLUMNS = ('clinic_id', 'user_id', 'action', 'resource_type')
+
+# Seconds the partition list is trusted before the catalog is read again, so
+# partitions another process creates or archives are picked up
+PARTITION_LIST_TTL = 60
+
+_partition_tables = {}
+_known_partitions = set()
+_partition_lock = threading.Lock()
+_partition_months = None
+_partition_months_expire_at = 0
+
+
+def month_start(at):
+    """Truncate a timestamp to the first instant of its month"""
+    return datetime(at.year, at.month, 1)
+
+
+def next_month_start(at):
+    """First instant of the month after the one containing `at`"""
+    return month_start(month_start(at).replace(day=28) + timedelta(days=4))
+
+
+def partition_name(month):
+    return f'{PARTITION_PREFIX}{month.year:04d}_{month.month:02d}'
+
+
+def partition_month(name):
+    """Inverse of partition_name; None for tables that are not audit partitions"""
+    match = PARTITION_PATTERN.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partition_table(month):
+    """
+    Table object for one month of audit logs.
+
+    Columns are copied from the AuditLog model so the partitions always match
+    it; foreign keys are left out so archiving or deleting a clinic never has
+    to touch old partitions.
+    """
+    name = partition_name(month)
+    table = _partition_tables.get(name)
+    if table is None:
+        with _partition_lock:
+            table = _partition_tables.get(name)
+            if table is None:
+                columns = [
+                    Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+                    for column in AuditLog.__table__.columns
+                ]
+                table = Table(name, partition_metadata, *columns)
+                # One (filter, created_at, id) index per log search filter so
+                # every filtered listing is an ordered index range scan
+                Index(f'ix_{name}_created_at', table.c.created_at.desc(), table.c.id.desc())
+                for column in AUDIT_FILTER_COLUMNS:
+                    Index(f'ix_{name}_{column}_created_at', table.c[column], table.c.created_at.desc(),
+                          table.c.id.desc())
+                _partition_tables[name] = table
+    return table
+
+
+def list_partitions(refresh=False):
+    """
+    Months that currently have a partition table, oldest first.
+
+    The catalog is read once per PARTITION_LIST_TTL seconds rather than on
+    every log listing; partitions this process creates or archives reset
+    the list straight away.
+    """
+    global _partition_months, _partition_months_expire_at
+    months = _partition_months
+    if refresh or months is None or time.monotonic() >= _partition_months_expire_at:
+        names = inspect(db.engine).get_table_names()
+        months = sorted(month for month in map(partition_month, names) if month)
+        _partition_months, _partition_months_expire_at = months, time.monotonic() + PARTITION_LIST_TTL
+    return months
+
+
+def _forget_partition_list():
+    global _partition_months
+    _partition_months = None
+
+
+def _add_missing_columns(connection, table, inspector=None):
+    """ALTER TABLE ADD COLUMN for AuditLog columns an older partition lacks (nullable: old rows have no value)"""
+    inspector = inspector or inspect(connection)
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    preparer = connection.dialect.identifier_preparer
+    for column in table.columns:
+        if column.name not in existing:
+            connection.execute(text(
+                f'ALTER TABLE {preparer.quote(table.name)} ADD COLUMN {preparer.quote(column.name)} '
+                f'{column.type.compile(dialect=connection.dialect)}'
+            ))
+
+
+def sync_partition_columns(connection):
+    """
+    Bring every existing partition's columns up to the AuditLog model.
+
+    Runs from ensure_upcoming_partitions (worker start-up and `flask audit
+    ensure-partitions`); a revision that adds AuditLog columns can also call
+    it with op.get_bind() so old partitions are readable right after upgrade.
+    """
+    inspector = inspect(connection)
+    for name in inspector.get_table_names():
+        month = partition_month(name)
+        if month:
+            _add_missing_columns(connection, partition_table(month), inspector)
+
+
+def _create_partition(connection, table):
+    # Columns and indexes are checked separately so older partitions pick up new ones
+    table.create(connection, checkfirst=True)
+    _add_missing_columns(connection, table)
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def ensure_partition(month, connection=None):
+    """
+    Create the partition for `month` if it does not exist yet.
+
+    Without a `connection` the DDL runs on the session's own connection,
+    inside the caller's transaction: a second connection would wait on the
+    locks the session already holds (SQLite), or, sharing an in-memory
+    database's single connection, commit the caller's half-done work. The
+    partition is remembered as existing once that transaction commits.
+    """
+    table = partition_table(month)
+    if table.name in _known_partitions:
+        return table
+    if connection is None:
+        _create_partition(db.session.connection(), table)
+        db.session.info.setdefault('created_partitions', set()).add(table.name)
+    else:
+        _create_partition(connection, table)
+        _known_partitions.add(table.name)
+        _forget_partition_list()
+    return table
+
+
+@event.listens_for(db.session, 'after_commit')
+def _partitions_committed(session):
+    created = session.info.pop('created_partitions', ())
+    if created:
+        _known_partitions.update(created)
+        _forget_partition_list()
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _partitions_rolled_back(session):
+    session.info.pop('created_partitions', None)
+
+
+def write_audit_rows(rows):
+    """
+    Insert audit rows into their monthly partitions (pending until commit).
+
+    Rows are dicts keyed by AuditLog column names; missing ids and timestamps
+    are filled in. One executemany INSERT is issued per month touched.
+    """
+    by_month = {}
+    for row in rows:
+        row = {column.name: row.get(column.name) for column in AuditLog.__table__.columns}
+        row['id'] = row['id'] or str(uuid.uuid4())
+        row['created_at'] = row['created_at'] or datetime.utcnow()
+        by_month.setdefault(month_start(row['created_at']), []).append(row)
+
+    for month, month_rows in by_month.items():
+        table = ensure_partition(month)
+        try:
+            db.session.execute(table.insert(), month_rows)
+        except Exception:
+            # Another worker may have archived (dropped) the partition since
+            # this process saw it; check again on the next write
+            _known_partitions.discard(table.name)
+            _forget_partition_list()
+            raise
+
+
+def ensure_upcoming_partitions(now=None):
+    """
+    Create this month's and next month's partitions ahead of the first write,
+    and add any new AuditLog columns to the existing ones.
+
+    Runs on its own connection and commits, so call it outside a request:
+    the audit writer does at start-up and `flask audit ensure-partitions`
+    can run on a schedule (e.g. daily).
+    """
+    month = month_start(now or datetime.utcnow())
+    with db.engine.begin() as connection:
+        sync_partition_columns(connection)
+        ensure_partition(month, connection)
+        ensure_partition(next_month_start(month), connection)
+
+
+def partitions_for_range(start=None, end=None):
+    """Existing partitions overlapping [start, end), newest first"""
+    first = month_start(start) if start else None
+    return [
+        partition_table(month)
+        for month in reversed(list_partitions())
+        if (first is None or month >= first) and (end is None or month < end)
+    ]
+
+
+def query_audit_range(start=None, end=None, limit=100, before=None, **filters):
+    """
+    Newest audit rows in [start, end), reading only the partitions that cover it.
+
+    `filters` are equality filters on AUDIT_FILTER_COLUMNS and `before` is an
+    optional (created_at, id) keyset position to continue from. Partitions
+    are visited newest first and the walk stops as soon as `limit` rows have
+    been collected, so a listing costs one indexed range scan per month
+    touched no matter how much history is kept. Rows carry a `user_name`
+    column joined from users instead of a lazy-loaded relationship.
+    """
+    unknown = set(filters) - set(AUDIT_FILTER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Cannot filter audit logs on {', '.join(sorted(unknown))}")
+
+    users = User.__table__
+    if before is not None:
+        # Partitions after the cursor's month cannot contribute to this page
+        cursor_end = next_month_start(before[0])
+        end = min(end, cursor_end) if end else cursor_end
+
+    results = []
+    for table in partitions_for_range(start, end):
+        query = select(table, users.c.username.label('user_name')).select_from(
+            table.outerjoin(users, users.c.id == table.c.user_id)
+        )
+        if start:
+            query = query.where(table.c.created_at >= start)
+        if end:
+            query = query.where(table.c.created_at < end)
+        if before is not None:
+            query = query.where(tuple_(table.c.created_at, table.c.id) < tuple_(*before))
+        for column, value in filters.items():
+            if value:
+                query = query.where(table.c[column] == value)
+        query = query.order_by(table.c.created_at.desc(), table.c.id.desc()).limit(limit - len(results))
+
+        results.extend(db.session.execute(query).all())
+        if len(results) >= limit:
+            break
+    return results
+
+
+def retention_cutoff(retention_months, now=None):
+    """First month that is still kept live when keeping `retention_months` months"""
+    month = month_start(now or datetime.utcnow())
+    months = month.year * 12 + month.month - 1 - retention_months
+    return datetime(months // 12, months % 12 + 1, 1)
+
+
+def archive_path(archive_dir, month):
+    return os.path.join(archive_dir, f'{partition_name(month)}.jsonl.gz')
+
+
+def archive_partitions(before, archive_dir, batch_size=1000):
+    """
+    Move every partition older than the month of `before` into gzip JSON lines.
+
+    Each partition is streamed to a temporary file, renamed into place once
+    complete, and only then dropped; re-running after a crash overwrites a
+    partial archive instead of losing rows. Returns one summary per partition.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    cutoff = month_start(before)
+    archived = []
+    for month in list_partitions(refresh=True):
+        if month >= cutoff:
+            break
+        table = partition_table(month)
+        path = archive_path(archive_dir, month)
+        temp_path = f'{path}.tmp'
+
+        count = 0
+        with db.engine.connect() as connection:
+            result = connection.execution_options(yield_per=batch_size).execute(
+                select(table).order_by(table.c.created_at, table.c.id)
+            )
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as archive:
+                for row in result.mappings():
+                    archive.write(json.dumps(dict(row), default=lambda value: value.isoformat()) + '\n')
+                    count += 1
+        os.replace(temp_path, path)
+
+        with db.engine.begin() as connection:
+            table.drop(connection)
+        _known_partitions.discard(table.name)
+        _forget_partition_list()
+        archived.append({'partition': table.name, 'rows': count, 'path': path})
+    return archived
+
+
+def read_archive(path):
+    """Yield the rows of an archived partition as dicts"""
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        for line in archive:
+            row = json.loads(line)
+            row['created_at'] = datetime.fromisoformat(row['created_at']) if row['created_at'] else None
+            yield row
+
+
+def partition_legacy_logs(batch_size=1000):
+    """Copy rows from the unpartitioned audit_logs table into partitions and clear it"""
+    legacy = AuditLog.__table__
+    moved = 0
+    while True:
+        rows = db.session.execute(select(legacy).limit(batch_size)).mappings().all()
+        if not rows:
+            break
+        write_audit_rows([dict(row) for row in rows])
+        db.session.execute(legacy.delete().where(legacy.c.id.in_([row['id'] for row in rows])))
+        db.session.commit()
+        moved += len(rows)
+    return moved
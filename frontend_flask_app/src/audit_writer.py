@@ -0,0 +1,187 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """
+    Background writer that batches audit events into bulk inserts.
+
+    Requests only put a dict on a bounded in-process queue. A daemon thread
+    drains it and inserts up to `batch_size` rows per statement into the
+    monthly audit partitions, flushing at least every `flush_interval`
+    seconds. When the queue stays full for `put_timeout` seconds, or a batch
+    cannot be written, events are appended to a JSON-lines spill file that is
+    replayed the next time the writer starts; the queue is also drained to
+    the database (or the spill file) at interpreter shutdown.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._stopping = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from src.database import is_sqlite_memory
+        
+        self.app = app
+        # An in-memory SQLite database is one connection shared by every
+        # thread, so the writer's commit would also commit whatever a request
+        # has pending; log synchronously there instead
+        self.async_enabled = app.config.get('AUDIT_ASYNC', False)
+        if self.async_enabled and is_sqlite_memory(app.config['SQLALCHEMY_DATABASE_URI']):
+            logger.warning('AUDIT_ASYNC is ignored with an in-memory SQLite database')
+            self.async_enabled = False
+        self.batch_size = app.config.get('AUDIT_BATCH_SIZE', 200)
+        self.flush_interval = app.config.get('AUDIT_FLUSH_INTERVAL', 1.0)
+        self.put_timeout = app.config.get('AUDIT_QUEUE_PUT_TIMEOUT', 0.05)
+        self.spill_path = app.config.get('AUDIT_SPILL_FILE')
+        if self.spill_path is None:
+            self.spill_path = os.path.join(app.instance_path, 'audit_spill.jsonl')
+        self._queue = queue.Queue(maxsize=app.config.get('AUDIT_QUEUE_SIZE', 10000))
+        app.extensions['audit_writer'] = self
+        atexit.register(self.shutdown)
+
+    @property
+    def enabled(self):
+        return self.app is not None and self.async_enabled
+
+    def submit(self, **fields):
+        """Queue one audit_logs row; returns False if the writer is disabled"""
+        if not self.enabled:
+            return False
+        self._ensure_started()
+
+        fields.setdefault('id', str(uuid.uuid4()))
+        fields.setdefault('created_at', datetime.utcnow())
+        try:
+            self._queue.put(fields, timeout=self.put_timeout)
+        except queue.Full:
+            logger.warning('Audit queue full, spilling event to disk')
+            self._spill([fields])
+        return True
+
+    def _ensure_started(self):
+        # Threads do not survive a fork, so (re)start per worker process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        from src.audit_partitions import ensure_upcoming_partitions
+
+        with self.app.app_context():
+            try:
+                ensure_upcoming_partitions()
+            except Exception as e:
+                logger.error(f'Failed to create audit partitions: {e}')
+        self._replay_spill()
+        while not self._stopping.is_set():
+            batch = self._take_batch(timeout=self.flush_interval)
+            if batch:
+                self._write(batch)
+
+    def _take_batch(self, timeout):
+        """Block for the first event, then collect what arrives until the deadline"""
+        batch = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        from src.models.user import db
+        from src.audit_partitions import write_audit_rows
+
+        with self.app.app_context():
+            try:
+                write_audit_rows(batch)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f'Failed to write {len(batch)} audit events: {e}')
+                self._spill(batch)
+            finally:
+                db.session.remove()
+
+    def _spill(self, events):
+        if not self.spill_path:
+            logger.error(f'Dropping {len(events)} audit events: no AUDIT_SPILL_FILE configured')
+            return
+        with self._spill_lock:
+            os.makedirs(os.path.dirname(self.spill_path) or '.', exist_ok=True)
+            with open(self.spill_path, 'a', encoding='utf-8') as spill:
+                for event in events:
+                    spill.write(json.dumps(event, default=lambda value: value.isoformat()) + '\n')
+
+    def _replay_spill(self):
+        """Insert events left in the spill file by an earlier process"""
+        if not self.spill_path:
+            return
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                return
+            replay_path = f'{self.spill_path}.{os.getpid()}.replay'
+            os.replace(self.spill_path, replay_path)
+
+        events = []
+        with open(replay_path, encoding='utf-8') as spill:
+            for line in spill:
+                event = json.loads(line)
+                event['created_at'] = datetime.fromisoformat(event['created_at'])
+                events.append(event)
+        for start in range(0, len(events), self.batch_size):
+            self._write(events[start:start + self.batch_size])
+        os.remove(replay_path)
+        logger.info(f'Replayed {len(events)} spilled audit events')
+
+    def flush(self):
+        """Synchronously write everything currently queued"""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._write(batch)
+
+    def shutdown(self):
+        """Stop the background thread and drain the queue"""
+        if self._queue is None:
+            return
+        self._stopping.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+
+
+audit_writer = AuditWriter()
@@ -0,0 +1,133 @@
+import re
+from collections import namedtuple
+from sqlalchemy import DDL, event, text
+from src.models.user import db
+from src.models.call import Call
+
+SearchHit = namedtuple('SearchHit', ['id', 'rank', 'transcript_highlight', 'ai_summary_highlight'])
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+# SQLite: an external-content FTS5 index over calls, kept in sync by triggers.
+# It is keyed on the implicit calls.rowid, which VACUUM may renumber; run
+# `flask search rebuild` after a VACUUM.
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS calls_fts USING fts5(
+        contact_name, transcript, ai_summary,
+        content='calls', content_rowid='rowid', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS calls_fts_insert AFTER INSERT ON calls BEGIN
+        INSERT INTO calls_fts(rowid, contact_name, transcript, ai_summary)
+        VALUES (new.rowid, new.contact_name, new.transcript, new.ai_summary);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS calls_fts_delete AFTER DELETE ON calls BEGIN
+        INSERT INTO calls_fts(calls_fts, rowid, contact_name, transcript, ai_summary)
+        VALUES ('delete', old.rowid, old.contact_name, old.transcript, old.ai_summary);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS calls_fts_update AFTER UPDATE OF contact_name, transcript, ai_summary ON calls BEGIN
+        INSERT INTO calls_fts(calls_fts, rowid, contact_name, transcript, ai_summary)
+        VALUES ('delete', old.rowid, old.contact_name, old.transcript, old.ai_summary);
+        INSERT INTO calls_fts(rowid, contact_name, transcript, ai_summary)
+        VALUES (new.rowid, new.contact_name, new.transcript, new.ai_summary);
+    END""",
+]
+
+# Postgres: a weighted tsvector generated column with a GIN index
+POSTGRES_DDL = [
+    """ALTER TABLE calls ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(contact_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(ai_summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(transcript, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_calls_search_vector ON calls USING gin (search_vector)",
+]
+
+# bm25() column weights, in calls_fts column order
+SQLITE_SEARCH = """
+    SELECT calls.id AS id,
+           -bm25(calls_fts, 10.0, 2.0, 5.0) AS rank,
+           snippet(calls_fts, 1, :start, :end, '…', 16) AS transcript_highlight,
+           snippet(calls_fts, 2, :start, :end, '…', 16) AS ai_summary_highlight
+    FROM calls_fts JOIN calls ON calls.rowid = calls_fts.rowid
+    WHERE calls_fts MATCH :query AND calls.clinic_id = :clinic_id {filters}
+    ORDER BY bm25(calls_fts, 10.0, 2.0, 5.0)
+    LIMIT :limit OFFSET :offset
+"""
+
+# Headlines are computed in the outer query so only the returned page pays for them
+POSTGRES_SEARCH = """
+    SELECT hits.id AS id,
+           hits.rank AS rank,
+           ts_headline('english', coalesce(calls.transcript, ''), hits.query, :options) AS transcript_highlight,
+           ts_headline('english', coalesce(calls.ai_summary, ''), hits.query, :options) AS ai_summary_highlight
+    FROM (
+        SELECT calls.id, ts_rank_cd(calls.search_vector, query) AS rank, query
+        FROM calls, websearch_to_tsquery('english', :query) AS query
+        WHERE calls.search_vector @@ query AND calls.clinic_id = :clinic_id {filters}
+        ORDER BY rank DESC, calls.started_at DESC
+        LIMIT :limit OFFSET :offset
+    ) AS hits JOIN calls ON calls.id = hits.id
+    ORDER BY hits.rank DESC, calls.started_at DESC
+"""
+
+SEARCH_FILTER_COLUMNS = ('direction', 'call_type')
+
+for _statement in SQLITE_DDL:
+    event.listen(Call.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in POSTGRES_DDL:
+    event.listen(Call.__table__, 'after_create', DDL(_statement).execute_if(dialect='postgresql'))
+event.listen(Call.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS calls_fts').execute_if(dialect='sqlite'))
+
+
+def fts5_query(q):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted so FTS5 operators in user input are matched
+    literally; the last word also matches as a prefix for type-ahead.
+    """
+    words = re.findall(r'\w+', q)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_calls(clinic_id, q, limit=20, offset=0, **filters):
+    """
+    Rank the clinic's calls against `q` across contact name, AI summary and transcript.
+
+    Returns SearchHits, best match first, with <mark>-highlighted fragments
+    of the transcript and AI summary. `filters` are equality filters on
+    SEARCH_FILTER_COLUMNS.
+    """
+    params = {'clinic_id': clinic_id, 'limit': limit, 'offset': offset}
+    filter_sql = ''
+    for column in SEARCH_FILTER_COLUMNS:
+        if filters.get(column):
+            filter_sql += f' AND calls.{column} = :{column}'
+            params[column] = filters[column]
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        statement = text(POSTGRES_SEARCH.format(filters=filter_sql))
+        params.update(
+            query=q,
+            options=f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxFragments=2, MaxWords=16, MinWords=5'
+        )
+    else:
+        query = fts5_query(q)
+        if query is None:
+            return []
+        statement = text(SQLITE_SEARCH.format(filters=filter_sql))
+        params.update(query=query, start=HIGHLIGHT_START, end=HIGHLIGHT_END)
+
+    return [SearchHit(*row) for row in db.session.execute(statement, params)]
+
+
+def rebuild_search_index():
+    """Re-index every call (SQLite only; the Postgres column is always current)"""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        db.session.execute(text("INSERT INTO calls_fts(calls_fts) VALUES ('rebuild')"))
+        db.session.commit()
@@ -0,0 +1,75 @@
+import click
+from datetime import datetime
+from flask import current_app
+from flask.cli import AppGroup
+from src.audit_partitions import (
+    archive_partitions, ensure_upcoming_partitions, partition_legacy_logs, retention_cutoff
+)
+from src.models.rollup import ClinicHourlyRollup, ClinicMonthlyRollup
+from src.quotas import reconcile_usage
+from src.call_search import rebuild_search_index
+
+rollups_cli = AppGroup('rollups', help='Maintain the pre-aggregated usage rollups.')
+audit_cli = AppGroup('audit', help='Manage audit log partitions.')
+search_cli = AppGroup('search', help='Maintain the call full-text search index.')
+
+
+@rollups_cli.command('backfill')
+@click.option('--clinic-id', default=None, help='Only rebuild this clinic.')
+@click.option('--since', default=None, help='Only rebuild buckets from this date on (YYYY-MM-DD).')
+def backfill_rollups(clinic_id, since):
+    """Rebuild hourly and monthly rollups from the source tables"""
+    since_date = datetime.strptime(since, '%Y-%m-%d') if since else None
+    ClinicHourlyRollup.rebuild(clinic_id=clinic_id, since=since_date)
+    click.echo('✅ Hourly rollups rebuilt')
+    ClinicMonthlyRollup.rebuild(clinic_id=clinic_id, since=since_date)
+    click.echo('✅ Monthly rollups rebuilt')
+
+
+@rollups_cli.command('reconcile')
+@click.option('--clinic-id', default=None, help='Only reconcile this clinic.')
+def reconcile_quota_counters(clinic_id):
+    """Correct this month's quota counters against the source tables"""
+    corrections = reconcile_usage(clinic_id=clinic_id)
+    for correction in corrections:
+        click.echo(f"{correction['clinic_id']} {correction['metric']}: "
+                   f"{correction['counted']} -> {correction['actual']}")
+    click.echo(f'✅ {len(corrections)} counters corrected')
+
+
+@audit_cli.command('archive')
+@click.option('--retention-months', type=int, default=None, help='Months to keep live (default AUDIT_RETENTION_MONTHS).')
+@click.option('--archive-dir', default=None, help='Where to write archives (default AUDIT_ARCHIVE_DIR).')
+def archive_audit_logs(retention_months, archive_dir):
+    """Archive audit partitions older than the retention window"""
+    if retention_months is None:
+        retention_months = current_app.config['AUDIT_RETENTION_MONTHS']
+    archived = archive_partitions(
+        retention_cutoff(retention_months),
+        archive_dir or current_app.config['AUDIT_ARCHIVE_DIR']
+    )
+    for partition in archived:
+        click.echo(f"{partition['partition']}: {partition['rows']} rows -> {partition['path']}")
+    click.echo(f'✅ {len(archived)} partitions archived')
+    ensure_upcoming_partitions()
+
+
+@audit_cli.command('ensure-partitions')
+def ensure_audit_partitions():
+    """Create this month's and next month's audit partitions and sync their columns (run daily)"""
+    ensure_upcoming_partitions()
+    click.echo('✅ Audit partitions ready')
+
+
+@audit_cli.command('partition-legacy')
+def partition_legacy_audit_logs():
+    """Move rows from the unpartitioned audit_logs table into monthly partitions"""
+    moved = partition_legacy_logs()
+    click.echo(f'✅ {moved} audit logs moved into partitions')
+
+
+@search_cli.command('rebuild')
+def rebuild_call_search_index():
+    """Re-index all call transcripts and summaries"""
+    rebuild_search_index()
+    click.echo('✅ Call search index rebuilt')
@@ -12,13 +12,43 @@ class Config:
     JWT_BLACKLIST_ENABLED = True
     JWT_BLACKLIST_TOKEN_CHECKS = ['access', 'refresh']
     
-    # Use a file-based SQLite database that's writable
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # Database URL from the environment (relative SQLite paths resolve inside
+    # the instance folder); without one the app runs on an in-memory database
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///:memory:'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Read replicas (comma-separated URLs). Endpoints marked @read_replica send
+    # their reads to one of them, except for a user who committed a write in
+    # the last REPLICA_STICKY_SECONDS; REPLICA_STICKY_STORE is 'memory' or
+    # 'redis' (shared by all workers)
+    DATABASE_REPLICA_URLS = [url for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url]
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    REPLICA_STICKY_STORE = os.environ.get('REPLICA_STICKY_STORE', 'memory')
+    
+    # SQLite connections run in WAL mode with synchronous=NORMAL and wait up to
+    # BUSY_TIMEOUT_MS for a writer's lock instead of failing immediately
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+    
+    # Connection pool per worker process for server databases (PostgreSQL)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
     
+    # Reverse proxies in front of the app (Render's load balancer counts as 1).
+    # Client addresses, used by the per-IP rate limits and the audit log, are
+    # read from the X-Forwarded-For entries those proxies append; leave at 0
+    # when clients connect directly, or they could set the header themselves
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+    
     # WhatsApp Business API Configuration
     WHATSAPP_API_VERSION = 'v21.0'
     WHATSAPP_BASE_URL = 'https://graph.facebook.com'
@@ -27,10 +57,74 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = '/tmp/uploads'
     
+    # Lead imports are streamed to disk and processed in the background
+    LEAD_IMPORT_MAX_CONTENT_LENGTH = int(os.environ.get('LEAD_IMPORT_MAX_CONTENT_LENGTH', 512 * 1024 * 1024))
+    LEAD_IMPORT_CHUNK_SIZE = int(os.environ.get('LEAD_IMPORT_CHUNK_SIZE', 1000))
+    LEAD_IMPORT_WORKERS = int(os.environ.get('LEAD_IMPORT_WORKERS', 2))
+    
+    # Country code assumed for phone numbers stored without one (digits only)
+    DEFAULT_PHONE_COUNTRY_CODE = os.environ.get('DEFAULT_PHONE_COUNTRY_CODE', '1')
+    
     # Pagination defaults
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
     
-    # Rate limiting
+    # Seconds a user's role/clinic may be served from the per-process identity
+    # cache (0 disables). Entries are checked against the identity version, so
+    # enable it with multiple workers only with IDENTITY_VERSION_STORE=redis
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 0))
+    
+    # Authorize from access token claims, checked against a per-user identity
+    # version. Claims mode requires the shared 'redis' store; 'memory' is per
+    # process and only serves the version stamped into new tokens
+    AUTHZ_TRUST_JWT_CLAIMS = os.environ.get('AUTHZ_TRUST_JWT_CLAIMS', 'false').lower() == 'true'
+    IDENTITY_VERSION_STORE = os.environ.get('IDENTITY_VERSION_STORE', 'memory')
+    
+    # Password hashing: a werkzeug method string ('scrypt:n:r:p' or
+    # 'pbkdf2:sha256:iterations'); hashes made with other parameters are
+    # upgraded on the next login. Hashing runs on PASSWORD_HASH_WORKERS
+    # threads (0 = inline) and callers wait at most QUEUE_TIMEOUT seconds
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_SALT_LENGTH = int(os.environ.get('PASSWORD_HASH_SALT_LENGTH', 16))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 2.0))
+    
+    # Revoked token ids: 'memory' is per process; use 'redis' with multiple
+    # workers ('fakeredis' runs the Redis code path in-process). Each worker
+    # screens tokens with a bloom filter rebuilt every REBUILD_INTERVAL seconds
+    TOKEN_BLOCKLIST_STORE = os.environ.get('TOKEN_BLOCKLIST_STORE', 'memory')
+    TOKEN_BLOCKLIST_BLOOM_CAPACITY = int(os.environ.get('TOKEN_BLOCKLIST_BLOOM_CAPACITY', 100000))
+    TOKEN_BLOCKLIST_BLOOM_ERROR_RATE = float(os.environ.get('TOKEN_BLOCKLIST_BLOOM_ERROR_RATE', 0.001))
+    TOKEN_BLOCKLIST_REBUILD_INTERVAL = int(os.environ.get('TOKEN_BLOCKLIST_REBUILD_INTERVAL', 60))
+    
+    # Audit events are queued and bulk-inserted by a background writer (not
+    # with an in-memory SQLite database, where it would share the requests'
+    # connection); events that cannot be queued or written are appended to
+    # the spill file, instance/audit_spill.jsonl unless set ('' disables it),
+    # and replayed on the next start
+    AUDIT_ASYNC = os.environ.get('AUDIT_ASYNC', 'true').lower() == 'true'
+    AUDIT_QUEUE_SIZE = int(os.environ.get('AUDIT_QUEUE_SIZE', 10000))
+    AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', 200))
+    AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 1.0))
+    AUDIT_QUEUE_PUT_TIMEOUT = float(os.environ.get('AUDIT_QUEUE_PUT_TIMEOUT', 0.05))
+    AUDIT_SPILL_FILE = os.environ.get('AUDIT_SPILL_FILE')
+    
+    # Audit logs live in monthly partitions; `flask audit archive` moves months
+    # older than the retention window into gzip JSON-lines files
+    AUDIT_RETENTION_MONTHS = int(os.environ.get('AUDIT_RETENTION_MONTHS', 12))
+    AUDIT_ARCHIVE_DIR = os.environ.get('AUDIT_ARCHIVE_DIR', '/tmp/audit_archive')
+    
+    # Rate limiting: sliding-window counters per IP, clinic and user, given as
+    # 'requests/seconds'. RATELIMIT_STORE is 'memory' (per process) or 'redis'
+    # (RATELIMIT_STORAGE_URL, shared by all workers). An account locks for the
+    # failure window once it reaches RATELIMIT_LOGIN_FAILURES_PER_USER
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    RATELIMIT_STORE = os.environ.get('RATELIMIT_STORE', 'memory')
     RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/1'
+    RATELIMIT_LOGIN_PER_IP = os.environ.get('RATELIMIT_LOGIN_PER_IP', '20/60')
+    RATELIMIT_LOGIN_PER_CLINIC = os.environ.get('RATELIMIT_LOGIN_PER_CLINIC', '300/60')
+    RATELIMIT_LOGIN_PER_USER = os.environ.get('RATELIMIT_LOGIN_PER_USER', '10/300')
+    RATELIMIT_LOGIN_FAILURES_PER_USER = os.environ.get('RATELIMIT_LOGIN_FAILURES_PER_USER', '5/1800')
+    RATELIMIT_REFRESH_PER_IP = os.environ.get('RATELIMIT_REFRESH_PER_IP', '60/60')
+    RATELIMIT_REFRESH_PER_USER = os.environ.get('RATELIMIT_REFRESH_PER_USER', '30/60')
 
@@ -0,0 +1,135 @@
+import heapq
+from collections import namedtuple
+from itertools import islice
+from sqlalchemy import select, tuple_
+from src.models.user import db
+from src.models.call import Call
+from src.models.lead import Lead
+from src.models.appointment import Appointment
+from src.models.whatsapp import WhatsAppConversation, WhatsAppMessage
+from src.pagination import encode_cursor, decode_cursor, InvalidCursor
+from src.serializers import CALL_SERIALIZER, LEAD_SERIALIZER, MESSAGE_SERIALIZER, APPOINTMENT_SERIALIZER
+
+# One table feeding the timeline: `scopes(clinic_id, e164)` returns queries
+# for the contact's rows, each an index range that `timestamp_column` orders
+TimelineSource = namedtuple('TimelineSource', ['kind', 'model', 'timestamp_column', 'serializer', 'scopes'])
+
+# Events merge on their first three fields; `row` is the selected tuple
+TimelineEvent = namedtuple('TimelineEvent', ['timestamp', 'kind', 'id', 'row'])
+
+
+def _calls(clinic_id, e164):
+    return [Call.query.filter(Call.clinic_id == clinic_id, Call.phone_e164 == e164)]
+
+
+def _messages(clinic_id, e164):
+    # One stream per conversation: an IN over conversation ids would make
+    # the database sort instead of walking (conversation_id, sent_at)
+    conversation_ids = db.session.scalars(select(WhatsAppConversation.id).where(
+        WhatsAppConversation.clinic_id == clinic_id,
+        WhatsAppConversation.phone_e164 == e164
+    ))
+    return [WhatsAppMessage.query.filter(WhatsAppMessage.conversation_id == conversation_id)
+            for conversation_id in conversation_ids]
+
+
+def _appointments(clinic_id, e164):
+    return [Appointment.query.filter(Appointment.clinic_id == clinic_id, Appointment.phone_e164 == e164)]
+
+
+def _leads(clinic_id, e164):
+    return [Lead.query.filter(Lead.clinic_id == clinic_id, Lead.phone_e164 == e164)]
+
+
+# Sorted by kind: ties on timestamp are broken by kind, then id
+TIMELINE_SOURCES = [
+    TimelineSource('appointment', Appointment, Appointment.appointment_date, APPOINTMENT_SERIALIZER, _appointments),
+    TimelineSource('call', Call, Call.started_at, CALL_SERIALIZER, _calls),
+    TimelineSource('lead', Lead, Lead.created_at, LEAD_SERIALIZER, _leads),
+    TimelineSource('message', WhatsAppMessage, WhatsAppMessage.sent_at, MESSAGE_SERIALIZER, _messages),
+]
+
+TIMELINE_KINDS = tuple(source.kind for source in TIMELINE_SOURCES)
+
+
+def encode_timeline_cursor(event):
+    return encode_cursor(event.timestamp, f'{event.kind}:{event.id}')
+
+
+def decode_timeline_cursor(token):
+    """(timestamp, kind, id) of the last event on the previous page"""
+    timestamp, position = decode_cursor(token)
+    kind, _, row_id = position.partition(':')
+    if kind not in TIMELINE_KINDS or not row_id:
+        raise InvalidCursor('Invalid pagination cursor')
+    return timestamp, kind, row_id
+
+
+def _after_cursor(query, source, cursor):
+    """Restrict a source to events that sort after `cursor` in (timestamp, kind, id) descending order"""
+    timestamp, kind, row_id = cursor
+    if source.kind < kind:
+        return query.filter(source.timestamp_column <= timestamp)
+    if source.kind > kind:
+        return query.filter(source.timestamp_column < timestamp)
+    return query.filter(tuple_(source.timestamp_column, source.model.id) < tuple_(timestamp, row_id))
+
+
+def stream_source(source, plan, scope, batch_size, cursor=None):
+    """
+    Yield the events of one source scope, newest first.
+
+    Rows are fetched lazily in keyset batches of `batch_size`, so a consumer
+    that stops early never reads the rest of the history.
+    """
+    timestamp_column, id_column = source.timestamp_column, source.model.id
+    query = plan.apply(scope).filter(timestamp_column.isnot(None))
+    if cursor is not None:
+        query = _after_cursor(query, source, cursor)
+
+    last = None
+    while True:
+        batch = query
+        if last is not None:
+            batch = batch.filter(tuple_(timestamp_column, id_column) < tuple_(*last))
+        rows = batch.order_by(timestamp_column.desc(), id_column.desc()).limit(batch_size).all()
+        for row in rows:
+            yield TimelineEvent(getattr(row, timestamp_column.key), source.kind, row.id, row)
+        if len(rows) < batch_size:
+            return
+        last = (getattr(rows[-1], timestamp_column.key), rows[-1].id)
+
+
+def timeline_page(clinic_id, e164, per_page, after=None, kinds=TIMELINE_KINDS):
+    """
+    One page of a contact's calls, messages, appointments and leads, newest first.
+
+    Each table is read as its own time-ordered stream and the streams are
+    k-way merged with heapq.merge, so a page costs one small indexed query
+    per table (and per WhatsApp conversation) however long the contact's
+    history is. Returns
+    (events, next_cursor).
+    """
+    cursor = decode_timeline_cursor(after) if after else None
+    # One extra event tells whether another page follows
+    batch_size = per_page + 1
+    sources = [source for source in TIMELINE_SOURCES if source.kind in kinds]
+    plans = {source.kind: source.serializer.plan() for source in sources}
+    streams = [
+        stream_source(source, plans[source.kind], scope, batch_size, cursor)
+        for source in sources for scope in source.scopes(clinic_id, e164)
+    ]
+    merged = heapq.merge(*streams, key=lambda event: event[:3], reverse=True)
+    events = list(islice(merged, batch_size))
+
+    next_cursor = None
+    if len(events) > per_page:
+        events = events[:per_page]
+        next_cursor = encode_timeline_cursor(events[-1])
+
+    return [{
+        'type': event.kind,
+        'id': event.id,
+        'timestamp': event.timestamp,
+        'data': plans[event.kind].serialize([event.row])[0]
+    } for event in events], next_cursor
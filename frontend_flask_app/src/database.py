@@ -0,0 +1,97 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from src.models.user import db
+from src.replicas import init_read_replicas
+
+
+def database_uri(url):
+    """Accept the `postgres://` scheme some hosts hand out, which SQLAlchemy 2 rejects"""
+    if url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def is_sqlite(url):
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def is_sqlite_memory(url):
+    return is_sqlite(url) and make_url(url).database in (None, '', ':memory:')
+
+
+def engine_options(url, config):
+    """
+    Engine arguments for one database URL.
+
+    SQLite gets no pool settings (Flask-SQLAlchemy picks its pool); its
+    tuning happens per connection, see sqlite_pragmas. Server databases get
+    a bounded pool that recycles and pings connections, so a worker never
+    hands out one the server or a proxy has already closed.
+    """
+    if is_sqlite(url):
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING']
+    }
+
+
+def sqlite_pragmas(url, config):
+    """
+    PRAGMA statements run on every new SQLite connection.
+
+    WAL lets readers proceed while a writer commits, and with
+    synchronous=NORMAL a commit no longer waits on fsync (the WAL is synced
+    at checkpoints; a power loss can drop the last commits but not corrupt
+    the file). busy_timeout makes a writer wait for the lock instead of
+    failing with `database is locked`. In-memory databases have no journal
+    to switch.
+    """
+    pragmas = [f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT_MS'])}"]
+    if not is_sqlite_memory(url):
+        pragmas += [
+            f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}",
+            f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}",
+            f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}"
+        ]
+    # Negative cache_size is in KiB rather than pages
+    pragmas.append(f"PRAGMA cache_size = -{int(config['SQLITE_CACHE_SIZE_KB'])}")
+    return pragmas
+
+
+def _run_on_connect(engine, statements):
+    @event.listens_for(engine, 'connect')
+    def apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def init_database(app):
+    """Initialize db with the engine profile for each configured database, replicas included"""
+    config = app.config
+    uri = config['SQLALCHEMY_DATABASE_URI'] = database_uri(config['SQLALCHEMY_DATABASE_URI'])
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = {**engine_options(uri, config), **config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+
+    # Each read replica is a bind of its own; no model maps to it, so only
+    # the routing session ever sends statements there
+    binds = config['SQLALCHEMY_BINDS'] = dict(config.get('SQLALCHEMY_BINDS') or {})
+    replica_keys = []
+    for index, replica_url in enumerate(config.get('DATABASE_REPLICA_URLS', [])):
+        replica_url = database_uri(replica_url)
+        replica_keys.append(f'replica_{index}')
+        binds[replica_keys[-1]] = {'url': replica_url, **engine_options(replica_url, config)}
+    db.init_app(app)
+    init_read_replicas(app, replica_keys)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            url = engine.url.render_as_string(hide_password=False)
+            if is_sqlite(url):
+                _run_on_connect(engine, sqlite_pragmas(url, config))
@@ -1,14 +1,12 @@
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import get_jwt_identity
-from src.models.user import User
+from src.identity import load_identity
 
 def super_admin_required(f):
     """Decorator to require super admin role"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_identity()
         
         if not user or user.role != 'super_admin':
             return jsonify({
@@ -23,8 +21,7 @@ def clinic_admin_required(f):
     """Decorator to require clinic admin role or higher"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_identity()
         
         if not user or user.role not in ['super_admin', 'clinic_admin']:
             return jsonify({
@@ -39,8 +36,7 @@ def agent_required(f):
     """Decorator to require agent role or higher"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_identity()
         
         if not user or user.role not in ['super_admin', 'clinic_admin', 'agent']:
             return jsonify({
@@ -55,8 +51,7 @@ def same_clinic_required(f):
     """Decorator to ensure user can only access their own clinic's data"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_identity()
         
         if not user:
             return jsonify({
@@ -0,0 +1,20 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def with_serialized_relationships(query, model):
+    """
+    Eager-load every relationship that model.to_dict() reads.
+
+    Models list those relationships in SERIALIZED_RELATIONSHIPS. Many-to-one
+    relationships are joined into the list query itself and collections are
+    fetched with one extra SELECT ... IN, so serializing a page costs a fixed
+    number of statements however many rows it holds.
+    """
+    options = []
+    for name in getattr(model, 'SERIALIZED_RELATIONSHIPS', ()):
+        attribute = getattr(model, name)
+        if attribute.property.uselist:
+            options.append(selectinload(attribute))
+        else:
+            options.append(joinedload(attribute))
+    return query.options(*options) if options else query
@@ -0,0 +1,220 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import g, current_app, has_app_context
+from flask_jwt_extended import get_jwt_identity, get_jwt
+from sqlalchemy import event, inspect
+from src.models.user import User, db
+
+Identity = namedtuple('Identity', ['id', 'clinic_id', 'role', 'permissions', 'is_active', 'updated_at'])
+
+# Changes to any of these columns invalidate identity claims already issued
+VERSIONED_USER_FIELDS = ('role', 'clinic_id', 'permissions', 'is_active', 'password_hash')
+
+
+def identity_from_user(user):
+    """Build a detached Identity snapshot from a User row"""
+    return Identity(
+        id=user.id,
+        clinic_id=user.clinic_id,
+        role=user.role,
+        permissions=tuple(user.permissions or []),
+        is_active=user.is_active,
+        updated_at=user.updated_at
+    )
+
+
+class IdentityCache:
+    """
+    Thread-safe, process-level LRU of user identities with a short TTL.
+
+    Each entry carries the identity version read before its row was loaded;
+    a hit only counts while the version store still reports that version,
+    so a role change or deactivation in any worker (with the shared 'redis'
+    version store) retires the entry everywhere.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, ttl, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            identity, cached_version, stored_at = entry
+            if cached_version != version or time.monotonic() - stored_at > ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return identity
+
+    def set(self, identity, version):
+        with self._lock:
+            current = self._entries.get(identity.id)
+            # Never replace a snapshot with an older version of the same user
+            if current and current[0].updated_at and identity.updated_at \
+                    and current[0].updated_at > identity.updated_at:
+                return
+            self._entries[identity.id] = (identity, version, time.monotonic())
+            self._entries.move_to_end(identity.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+identity_cache = IdentityCache()
+
+
+class MemoryVersionStore:
+    """Per-process identity version counters (single worker or tests)"""
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        return self._versions.get(user_id, 0)
+
+    def bump(self, user_id):
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            return self._versions[user_id]
+
+
+class RedisVersionStore:
+    """Identity version counters shared by all workers through Redis"""
+    key_prefix = 'identity_version:'
+
+    def __init__(self, url):
+        import redis
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, user_id):
+        value = self._client.get(self.key_prefix + user_id)
+        return int(value) if value else 0
+
+    def bump(self, user_id):
+        return self._client.incr(self.key_prefix + user_id)
+
+
+def init_identity(app):
+    """Attach the identity version store selected by IDENTITY_VERSION_STORE"""
+    if app.config.get('IDENTITY_VERSION_STORE') == 'redis':
+        store = RedisVersionStore(app.config['REDIS_URL'])
+    else:
+        # Per-process versions start at 0 and never see another worker's
+        # bumps, so a token issued before a role change or deactivation
+        # would keep matching them
+        if app.config.get('AUTHZ_TRUST_JWT_CLAIMS'):
+            raise RuntimeError('AUTHZ_TRUST_JWT_CLAIMS requires IDENTITY_VERSION_STORE=redis')
+        store = MemoryVersionStore()
+    app.extensions['identity_versions'] = store
+    return store
+
+
+def get_version_store():
+    return current_app.extensions['identity_versions']
+
+
+def build_identity_claims(user, clinic_id):
+    """Access token claims that let decorators authorize without a DB lookup"""
+    return {
+        'clinic_id': clinic_id,
+        'role': user.role,
+        'permissions': user.permissions or [],
+        'identity_version': get_version_store().get(user.id)
+    }
+
+
+def identity_from_claims(user_id):
+    """
+    Return an Identity built from the current access token's claims, or None
+    if claims mode is off, the token lacks claims, or its version is stale.
+    """
+    if not current_app.config.get('AUTHZ_TRUST_JWT_CLAIMS'):
+        return None
+    claims = get_jwt()
+    if 'role' not in claims or 'identity_version' not in claims:
+        return None
+    if claims['identity_version'] != get_version_store().get(user_id):
+        return None
+    return Identity(
+        id=user_id,
+        clinic_id=claims.get('clinic_id'),
+        role=claims['role'],
+        permissions=tuple(claims.get('permissions') or []),
+        is_active=True,
+        updated_at=None
+    )
+
+
+def load_current_user():
+    """Return the User for the current JWT, loading it at most once per request"""
+    user_id = get_jwt_identity()
+    if g.get('current_user_id') != user_id or 'current_user' not in g:
+        caching = user_id and current_app.config.get('IDENTITY_CACHE_TTL', 0) > 0
+        # Read the version before the row so a concurrent change can only
+        # make the cached entry look stale, never fresh
+        version = get_version_store().get(user_id) if caching else None
+        g.current_user_id = user_id
+        g.current_user = db.session.get(User, user_id) if user_id else None
+        if g.current_user and caching:
+            identity_cache.set(identity_from_user(g.current_user), version)
+    return g.current_user
+
+
+def load_identity():
+    """
+    Return the Identity for the current JWT.
+
+    Resolved once per request and stored on flask.g. With AUTHZ_TRUST_JWT_CLAIMS
+    the token claims are used as long as their identity version is current;
+    otherwise a process-level cache (IDENTITY_CACHE_TTL, entries checked
+    against the same version) and finally the users table are consulted.
+    Deactivated users resolve to None.
+    """
+    user_id = get_jwt_identity()
+    if g.get('identity_user_id') != user_id or 'identity' not in g:
+        identity = identity_from_claims(user_id)
+        ttl = current_app.config.get('IDENTITY_CACHE_TTL', 0)
+        if identity is None and ttl > 0:
+            identity = identity_cache.get(user_id, ttl, get_version_store().get(user_id))
+        if identity is None:
+            user = load_current_user()
+            identity = identity_from_user(user) if user else None
+        g.identity_user_id = user_id
+        g.identity = identity if identity and identity.is_active else None
+    return g.identity
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _evict_cached_identity(mapper, connection, target):
+    identity_cache.invalidate(target.id)
+
+
+@event.listens_for(User, 'after_update')
+def _bump_identity_version(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in VERSIONED_USER_FIELDS):
+        return
+    if has_app_context() and 'identity_versions' in current_app.extensions:
+        get_version_store().bump(target.id)
+
+
+@event.listens_for(User, 'after_delete')
+def _retire_deleted_identity(mapper, connection, target):
+    # Tokens and other workers' cache entries for a deleted user must stop
+    # matching too, not just this process's cache entry
+    if has_app_context() and 'identity_versions' in current_app.extensions:
+        get_version_store().bump(target.id)
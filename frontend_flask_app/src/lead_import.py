@@ -0,0 +1,155 @@
+import csv
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.models.user import db
+from src.models.lead import Lead, LeadImportJob
+from src.phone import normalize_phone_number
+
+try:
+    import openpyxl
+except ImportError:  # XLSX imports are optional
+    openpyxl = None
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FIELDS = ('phone_number', 'name', 'email', 'status', 'priority', 'source', 'notes')
+
+HEADER_ALIASES = {
+    'phone': 'phone_number',
+    'phone number': 'phone_number',
+    'mobile': 'phone_number',
+    'telephone': 'phone_number',
+    'full name': 'name',
+    'email address': 'email'
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(app):
+    """Process-wide pool that runs imports outside the request workers"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('LEAD_IMPORT_WORKERS', 2),
+                thread_name_prefix='lead-import'
+            )
+    return _executor
+
+
+def save_upload(stream, path, chunk_size=64 * 1024):
+    """Copy an upload stream to disk in fixed-size chunks and return its size"""
+    written = 0
+    with open(path, 'wb') as target:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            target.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def map_header(header):
+    """Translate spreadsheet column titles to Lead fields (None = ignored)"""
+    fields = []
+    for title in header:
+        key = str(title or '').strip().lower().replace('_', ' ')
+        key = HEADER_ALIASES.get(key, key.replace(' ', '_'))
+        fields.append(key if key in IMPORT_FIELDS else None)
+    return fields
+
+
+def iter_csv_rows(handle):
+    """Yield raw rows from a binary CSV handle, one line at a time"""
+    reader = csv.reader(io.TextIOWrapper(handle, encoding='utf-8-sig', newline=''))
+    for values in reader:
+        yield values
+
+
+def iter_xlsx_rows(handle):
+    """Yield raw rows from the first sheet of an XLSX file in read-only mode"""
+    workbook = openpyxl.load_workbook(handle, read_only=True, data_only=True)
+    try:
+        for values in workbook.active.iter_rows(values_only=True):
+            yield ['' if value is None else value for value in values]
+    finally:
+        workbook.close()
+
+
+def start_import(app, job_id, path):
+    """Queue a stored upload for background import"""
+    return get_executor(app).submit(run_import, app, job_id, path)
+
+
+def run_import(app, job_id, path):
+    """
+    Import a stored upload into the job's clinic.
+
+    Rows are streamed from disk, normalized and handed to
+    Lead.bulk_create_leads one chunk at a time; progress is committed on the
+    job row after every chunk so clients can poll it. Reported row numbers
+    are spreadsheet line numbers (the header is line 1).
+    """
+    with app.app_context():
+        job = db.session.get(LeadImportJob, job_id)
+        if job is None:
+            # Deleted (or never committed) before the import started
+            logger.warning(f'Lead import job {job_id} not found, discarding its upload')
+            if os.path.exists(path):
+                os.remove(path)
+            db.session.remove()
+            return
+        chunk_size = app.config.get('LEAD_IMPORT_CHUNK_SIZE', 1000)
+        try:
+            job.mark_running()
+            with open(path, 'rb') as handle:
+                rows = iter_xlsx_rows(handle) if job.file_format == 'xlsx' else iter_csv_rows(handle)
+                fields = map_header(next(rows, []))
+                if 'phone_number' not in fields:
+                    raise ValueError('The file has no phone number column')
+
+                batch, line_numbers, invalid = [], [], []
+                for line_number, values in enumerate(rows, start=2):
+                    lead_data = {
+                        field: str(value).strip()
+                        for field, value in zip(fields, values)
+                        if field and str(value).strip()
+                    }
+                    if not lead_data:
+                        continue
+
+                    raw_phone = lead_data.get('phone_number')
+                    lead_data['phone_number'] = normalize_phone_number(raw_phone)
+                    if raw_phone and not lead_data['phone_number']:
+                        invalid.append({'row': line_number, 'phone_number': raw_phone, 'error': 'Invalid phone number'})
+                        continue
+
+                    batch.append(lead_data)
+                    line_numbers.append(line_number)
+                    if len(batch) >= chunk_size:
+                        _import_chunk(job, batch, line_numbers, invalid, handle.tell())
+                        batch, line_numbers, invalid = [], [], []
+
+                _import_chunk(job, batch, line_numbers, invalid, job.bytes_total)
+            job.mark_finished()
+        except Exception as e:
+            db.session.rollback()
+            job.mark_finished(failure_reason=str(e))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+            db.session.remove()
+
+
+def _import_chunk(job, batch, line_numbers, invalid, bytes_processed):
+    created, errors = Lead.bulk_create_leads(job.clinic_id, batch, chunk_size=len(batch) or 1)
+    for error in errors:
+        error['row'] = line_numbers[error['row']]
+    job.record_chunk(len(batch) + len(invalid), len(created), sorted(invalid + errors, key=lambda e: e['row']),
+                     bytes_processed)
@@ -8,44 +8,68 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 from flask_socketio import SocketIO
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from src.config import Config
 from src.models.user import db
+from src.database import init_database
 from src.models.clinic import Clinic
 from src.models.call import Call
-from src.models.lead import Lead
+from src.models.lead import Lead, LeadImportJob
 from src.models.whatsapp import WhatsAppConversation, WhatsAppMessage
 from src.models.appointment import Appointment, AppointmentConfirmation
 from src.models.audit import AuditLog, SystemMetric
+from src.models.rollup import ClinicHourlyRollup, ClinicMonthlyRollup
+from src.identity import init_identity
+from src.token_blocklist import init_token_blocklist
+from src.rate_limit import init_rate_limiter
+from src.passwords import password_hasher
+from src.audit_writer import audit_writer
+from src.response_metrics import init_response_metrics
+from src.commands import rollups_cli, audit_cli, search_cli
 
 # Import blueprints
 from src.routes.auth import auth_bp
 from src.routes.admin import admin_bp
 # from src.routes.clinic import clinic_bp
-# from src.routes.dashboard import dashboard_bp
+from src.routes.dashboard import dashboard_bp
 from src.routes.calls import calls_bp
-# from src.routes.leads import leads_bp
+from src.routes.leads import leads_bp
+from src.routes.contacts import contacts_bp
 # from src.routes.whatsapp import whatsapp_bp
 # from src.routes.appointments import appointments_bp
 
 def create_app():
     app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
     app.config.from_object(Config)
+    if app.config['PROXY_FIX_X_FOR']:
+        hops = app.config['PROXY_FIX_X_FOR']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
     
     # Initialize extensions
-    db.init_app(app)
+    init_database(app)
     migrate = Migrate(app, db)
     jwt = JWTManager(app)
     cors = CORS(app, origins=app.config['CORS_ORIGINS'])
     socketio = SocketIO(app, cors_allowed_origins=app.config['CORS_ORIGINS'])
+    init_identity(app)
+    token_blocklist = init_token_blocklist(app)
+    init_rate_limiter(app)
+    password_hasher.init_app(app)
+    audit_writer.init_app(app)
+    init_response_metrics(app)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(audit_cli)
+    app.cli.add_command(search_cli)
     
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
     # app.register_blueprint(clinic_bp, url_prefix='/api/clinics')
-    # app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
     app.register_blueprint(calls_bp, url_prefix="/api/calls")
-    # app.register_blueprint(leads_bp, url_prefix='/api/leads')
+    app.register_blueprint(leads_bp, url_prefix='/api/leads')
+    app.register_blueprint(contacts_bp, url_prefix='/api/contacts')
     # app.register_blueprint(whatsapp_bp, url_prefix='/api/whatsapp')
     # app.register_blueprint(appointments_bp, url_prefix='/api/appointments')
     
@@ -103,12 +127,9 @@ def create_app():
     #             except Exception as e:
     #                 print(f"❌ Error creating demo user: {e}")
     
-    # JWT token blacklist (in production, use Redis)
-    blacklisted_tokens = set()
-    
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
-        return jwt_payload['jti'] in blacklisted_tokens
+        return token_blocklist.is_revoked(jwt_payload['jti'])
     
     @jwt.revoked_token_loader
     def revoked_token_callback(jwt_header, jwt_payload):
@@ -1,8 +1,41 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 import uuid
 from src.models.user import db
+from src.models.rollup import ClinicHourlyRollup
+from src.phone import phone_keys
+
+APPOINTMENT_STATUS_COLORS = {
+    'scheduled': '#3b82f6',    # blue
+    'confirmed': '#10b981',    # green
+    'completed': '#059669',    # dark green
+    'cancelled': '#ef4444',    # red
+    'no_show': '#f59e0b',      # orange
+    'rescheduled': '#8b5cf6'   # purple
+}
+
+CONFIRMATION_COLORS = {
+    'pending': '#f59e0b',      # orange
+    'confirmed': '#10b981',    # green
+    'declined': '#ef4444',     # red
+    'no_response': '#6b7280'   # gray
+}
+
+CONFIRMATION_STATUS_COLORS = {
+    'sent': '#f59e0b',        # orange
+    'delivered': '#3b82f6',   # blue
+    'responded': '#10b981',   # green
+    'failed': '#ef4444'       # red
+}
+
+def is_upcoming(appointment_date, status):
+    """Whether an appointment is still ahead and not cancelled or done"""
+    return appointment_date > datetime.utcnow() and status in ['scheduled', 'confirmed']
+
+def is_overdue(appointment_date, status):
+    """Whether an appointment's time has passed without it being completed"""
+    return appointment_date < datetime.utcnow() and status in ['scheduled', 'confirmed']
 
 class Appointment(db.Model):
     __tablename__ = 'appointments'
@@ -11,6 +44,11 @@ class Appointment(db.Model):
     clinic_id = Column(String(36), ForeignKey('clinics.id', ondelete='CASCADE'), nullable=False)
     patient_name = Column(String(255), nullable=False)
     patient_phone = Column(String(50), nullable=False)
+    # Derived lookup keys: exact match on E.164, "last N digits" match as a
+    # range seek on the reversed digits (see src.phone.phone_filter)
+    # Named like the other contact tables so timelines can query them alike
+    phone_e164 = Column(String(16))
+    phone_reversed = Column(String(15))
     patient_email = Column(String(255))
     appointment_type = Column(String(100))
     appointment_date = Column(DateTime, nullable=False)
@@ -35,6 +73,22 @@ class Appointment(db.Model):
     created_by_user = relationship("User", back_populates="created_appointments")
     confirmations = relationship("AppointmentConfirmation", back_populates="appointment", cascade="all, delete-orphan")
     
+    # Relationships read by to_dict, eager-loaded by list queries
+    SERIALIZED_RELATIONSHIPS = ('created_by_user',)
+    
+    __table_args__ = (
+        Index('ix_appointments_clinic_date', clinic_id, appointment_date),
+        # Exact phone lookups and the contact timeline's newest-first scan
+        Index('ix_appointments_clinic_phone_date', clinic_id, phone_e164, appointment_date.desc(), id.desc()),
+        Index('ix_appointments_clinic_phone_reversed', clinic_id, phone_reversed),
+    )
+    
+    @validates('patient_phone')
+    def _derive_phone_keys(self, key, patient_phone):
+        """Keep the canonical and reversed-digit lookup keys in step with patient_phone"""
+        self.phone_e164, self.phone_reversed = phone_keys(patient_phone)
+        return patient_phone
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -68,36 +122,28 @@ class Appointment(db.Model):
     
     def get_status_color(self):
         """Get color indicator for appointment status"""
-        status_colors = {
-            'scheduled': '#3b82f6',    # blue
-            'confirmed': '#10b981',    # green
-            'completed': '#059669',    # dark green
-            'cancelled': '#ef4444',    # red
-            'no_show': '#f59e0b',      # orange
-            'rescheduled': '#8b5cf6'   # purple
-        }
-        return status_colors.get(self.status, '#6b7280')
+        return APPOINTMENT_STATUS_COLORS.get(self.status, '#6b7280')
     
     def get_confirmation_color(self):
         """Get color indicator for confirmation status"""
-        confirmation_colors = {
-            'pending': '#f59e0b',      # orange
-            'confirmed': '#10b981',    # green
-            'declined': '#ef4444',     # red
-            'no_response': '#6b7280'   # gray
-        }
-        return confirmation_colors.get(self.confirmation_status, '#6b7280')
+        return CONFIRMATION_COLORS.get(self.confirmation_status, '#6b7280')
     
     def is_upcoming(self):
         """Check if appointment is upcoming"""
-        return self.appointment_date > datetime.utcnow() and self.status in ['scheduled', 'confirmed']
+        return is_upcoming(self.appointment_date, self.status)
     
     def is_overdue(self):
         """Check if appointment is overdue"""
-        return self.appointment_date < datetime.utcnow() and self.status in ['scheduled', 'confirmed']
+        return is_overdue(self.appointment_date, self.status)
+    
+    def _move_rollup(self, old_status, old_date):
+        """Keep the hourly appointment rollups in step with a status/date change"""
+        ClinicHourlyRollup.move(self.clinic_id, ClinicHourlyRollup.APPOINTMENTS,
+                                old_date, old_status, self.appointment_date, self.status)
     
     def confirm_appointment(self, method='manual', notes=None):
         """Confirm the appointment"""
+        old_status, old_date = self.status, self.appointment_date
         self.status = 'confirmed'
         self.confirmation_status = 'confirmed'
         self.confirmation_method = method
@@ -105,19 +151,23 @@ class Appointment(db.Model):
         if notes:
             self.notes = notes
         self.updated_at = datetime.utcnow()
+        self._move_rollup(old_status, old_date)
         db.session.commit()
     
     def cancel_appointment(self, reason=None, cancelled_by='patient'):
         """Cancel the appointment"""
+        old_status, old_date = self.status, self.appointment_date
         self.status = 'cancelled'
         self.confirmation_status = 'declined'
         self.cancelled_at = datetime.utcnow()
         self.cancellation_reason = reason or f"Cancelled by {cancelled_by}"
         self.updated_at = datetime.utcnow()
+        self._move_rollup(old_status, old_date)
         db.session.commit()
     
     def reschedule_appointment(self, new_date, reason=None):
         """Reschedule the appointment"""
+        old_status, old_date = self.status, self.appointment_date
         if not self.original_appointment_date:
             self.original_appointment_date = self.appointment_date
         
@@ -131,16 +181,20 @@ class Appointment(db.Model):
             else:
                 self.notes = f"Rescheduled: {reason}"
         self.updated_at = datetime.utcnow()
+        self._move_rollup(old_status, old_date)
         db.session.commit()
     
     def mark_as_no_show(self):
         """Mark appointment as no show"""
+        old_status, old_date = self.status, self.appointment_date
         self.status = 'no_show'
         self.updated_at = datetime.utcnow()
+        self._move_rollup(old_status, old_date)
         db.session.commit()
     
     def mark_as_completed(self, notes=None):
         """Mark appointment as completed"""
+        old_status, old_date = self.status, self.appointment_date
         self.status = 'completed'
         if notes:
             if self.notes:
@@ -148,6 +202,7 @@ class Appointment(db.Model):
             else:
                 self.notes = f"Completed: {notes}"
         self.updated_at = datetime.utcnow()
+        self._move_rollup(old_status, old_date)
         db.session.commit()
     
     def send_reminder(self):
@@ -167,6 +222,8 @@ class Appointment(db.Model):
             **kwargs
         )
         db.session.add(appointment)
+        ClinicHourlyRollup.increment(clinic_id, ClinicHourlyRollup.APPOINTMENTS,
+                                     appointment_date, appointment.status or 'scheduled')
         db.session.commit()
         return appointment
     
@@ -210,13 +267,7 @@ class AppointmentConfirmation(db.Model):
     
     def get_status_color(self):
         """Get color indicator for confirmation status"""
-        status_colors = {
-            'sent': '#f59e0b',        # orange
-            'delivered': '#3b82f6',   # blue
-            'responded': '#10b981',   # green
-            'failed': '#ef4444'       # red
-        }
-        return status_colors.get(self.status, '#6b7280')
+        return CONFIRMATION_STATUS_COLORS.get(self.status, '#6b7280')
     
     def record_response(self, response_text, response_type):
         """Record patient response to confirmation"""
@@ -1,10 +1,26 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Numeric
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, ForeignKey, Numeric, Index
 from sqlalchemy.orm import relationship
 import uuid
 from src.models.user import db
 
+ACTION_COLORS = {
+    'create': '#10b981',    # green
+    'read': '#3b82f6',      # blue
+    'update': '#f59e0b',    # orange
+    'delete': '#ef4444',    # red
+    'login': '#8b5cf6',     # purple
+    'logout': '#6b7280',    # gray
+    'export': '#f59e0b',    # orange
+    'import': '#10b981'     # green
+}
+
 class AuditLog(db.Model):
+    # Entries are written to monthly audit_logs_YYYY_MM partitions and read
+    # back with query_audit_range (see src/audit_partitions.py). This model
+    # defines the partitions' columns and the logging helpers; its own
+    # audit_logs table only holds rows written before partitioning, until
+    # `flask audit partition-legacy` moves them
     __tablename__ = 'audit_logs'
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -20,47 +36,36 @@ class AuditLog(db.Model):
     session_id = Column(String(255))
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    # Relationships
-    clinic = relationship("Clinic", back_populates="audit_logs")
-    user = relationship("User", back_populates="audit_logs")
-    
-    def to_dict(self):
+    @staticmethod
+    def row_to_dict(row):
+        """Serialize a partition row selected with a joined user_name column"""
         return {
-            'id': self.id,
-            'clinic_id': self.clinic_id,
-            'user_id': self.user_id,
-            'user_name': self.user.username if self.user else None,
-            'action': self.action,
-            'resource_type': self.resource_type,
-            'resource_id': self.resource_id,
-            'old_values': self.old_values,
-            'new_values': self.new_values,
-            'ip_address': self.ip_address,
-            'user_agent': self.user_agent,
-            'session_id': self.session_id,
-            'action_color': self.get_action_color(),
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'id': row.id,
+            'clinic_id': row.clinic_id,
+            'user_id': row.user_id,
+            'user_name': row.user_name,
+            'action': row.action,
+            'resource_type': row.resource_type,
+            'resource_id': row.resource_id,
+            'old_values': row.old_values,
+            'new_values': row.new_values,
+            'ip_address': row.ip_address,
+            'user_agent': row.user_agent,
+            'session_id': row.session_id,
+            'action_color': ACTION_COLORS.get(row.action, '#6b7280'),
+            'created_at': row.created_at.isoformat() if row.created_at else None
         }
     
-    def get_action_color(self):
-        """Get color indicator for audit action"""
-        action_colors = {
-            'create': '#10b981',    # green
-            'read': '#3b82f6',      # blue
-            'update': '#f59e0b',    # orange
-            'delete': '#ef4444',    # red
-            'login': '#8b5cf6',     # purple
-            'logout': '#6b7280',    # gray
-            'export': '#f59e0b',    # orange
-            'import': '#10b981'     # green
-        }
-        return action_colors.get(self.action, '#6b7280')
-    
     @classmethod
     def log_action(cls, action, resource_type, resource_id=None, old_values=None, new_values=None, 
-                   clinic_id=None, user_id=None, ip_address=None, user_agent=None, session_id=None):
-        """Create an audit log entry"""
-        audit_log = cls(
+                   clinic_id=None, user_id=None, ip_address=None, user_agent=None, session_id=None,
+                   commit=True):
+        """Write an audit log entry to its monthly partition and commit (unless commit=False)"""
+        from src.audit_partitions import write_audit_rows
+        
+        audit_log = dict(
+            id=str(uuid.uuid4()),
+            created_at=datetime.utcnow(),
             clinic_id=clinic_id,
             user_id=user_id,
             action=action,
@@ -72,14 +77,40 @@ class AuditLog(db.Model):
             user_agent=user_agent,
             session_id=session_id
         )
-        db.session.add(audit_log)
-        db.session.commit()
+        write_audit_rows([audit_log])
+        if commit:
+            db.session.commit()
         return audit_log
     
     @classmethod
-    def log_login(cls, user_id, clinic_id=None, ip_address=None, user_agent=None, session_id=None):
+    def queue_action(cls, action, resource_type, resource_id=None, old_values=None, new_values=None,
+                     clinic_id=None, user_id=None, ip_address=None, user_agent=None, session_id=None,
+                     commit=True):
+        """
+        Hand an audit entry to the background writer. If it is disabled the
+        entry is written inline, in the caller's transaction when commit=False.
+        """
+        from src.audit_writer import audit_writer
+        
+        fields = dict(
+            clinic_id=clinic_id,
+            user_id=user_id,
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            old_values=old_values,
+            new_values=new_values,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            session_id=session_id
+        )
+        if not audit_writer.submit(**fields):
+            cls.log_action(commit=commit, **fields)
+    
+    @classmethod
+    def log_login(cls, user_id, clinic_id=None, ip_address=None, user_agent=None, session_id=None, commit=True):
         """Log user login"""
-        return cls.log_action(
+        return cls.queue_action(
             action='login',
             resource_type='user',
             resource_id=user_id,
@@ -87,13 +118,14 @@ class AuditLog(db.Model):
             user_id=user_id,
             ip_address=ip_address,
             user_agent=user_agent,
-            session_id=session_id
+            session_id=session_id,
+            commit=commit
         )
     
     @classmethod
     def log_logout(cls, user_id, clinic_id=None, ip_address=None, user_agent=None, session_id=None):
         """Log user logout"""
-        return cls.log_action(
+        return cls.queue_action(
             action='logout',
             resource_type='user',
             resource_id=user_id,
@@ -123,6 +155,11 @@ class SystemMetric(db.Model):
     # Relationships
     clinic = relationship("Clinic", back_populates="system_metrics")
     
+    __table_args__ = (
+        Index('ix_system_metrics_name_clinic_recorded_at', metric_name, clinic_id, recorded_at),
+        Index('ix_system_metrics_recorded_at', recorded_at),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -1,8 +1,31 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 import uuid
 from src.models.user import db
+from src.models.rollup import ClinicHourlyRollup, ClinicMonthlyRollup
+from src.quotas import enforce_quota
+from src.phone import phone_keys
+
+CALL_STATUS_COLORS = {
+    'initiated': '#fbbf24',  # yellow
+    'ringing': '#3b82f6',    # blue
+    'answered': '#10b981',   # green
+    'completed': '#059669',  # dark green
+    'failed': '#ef4444',     # red
+    'busy': '#f59e0b',       # orange
+    'no_answer': '#6b7280',  # gray
+    'cancelled': '#9ca3af'   # light gray
+}
+
+def format_duration(duration_seconds):
+    """Format a duration in seconds as m:ss"""
+    if not duration_seconds:
+        return "0:00"
+    
+    minutes = duration_seconds // 60
+    seconds = duration_seconds % 60
+    return f"{minutes}:{seconds:02d}"
 
 class Call(db.Model):
     __tablename__ = 'calls'
@@ -13,6 +36,10 @@ class Call(db.Model):
     call_type = Column(String(20), nullable=False)
     direction = Column(String(20), nullable=False)
     phone_number = Column(String(50), nullable=False)
+    # Derived lookup keys: exact match on E.164, "last N digits" match as a
+    # range seek on the reversed digits (see src.phone.phone_filter)
+    phone_e164 = Column(String(16))
+    phone_reversed = Column(String(15))
     contact_name = Column(String(255))
     lead_id = Column(String(36), ForeignKey('leads.id'))
     status = Column(String(50), nullable=False)
@@ -29,6 +56,23 @@ class Call(db.Model):
     clinic = relationship("Clinic", back_populates="calls")
     lead = relationship("Lead", back_populates="calls")
     
+    # Unbounded text that only the call detail view returns by default
+    DETAIL_ONLY_FIELDS = ('transcript', 'ai_summary')
+    
+    __table_args__ = (
+        # Serves the per-clinic call listing and its keyset pagination
+        Index('ix_calls_clinic_started_at', clinic_id, started_at.desc(), id.desc()),
+        # Exact phone lookups and the contact timeline's newest-first scan
+        Index('ix_calls_clinic_phone_started_at', clinic_id, phone_e164, started_at.desc(), id.desc()),
+        Index('ix_calls_clinic_phone_reversed', clinic_id, phone_reversed),
+    )
+    
+    @validates('phone_number')
+    def _derive_phone_keys(self, key, phone_number):
+        """Keep the canonical and reversed-digit lookup keys in step with phone_number"""
+        self.phone_e164, self.phone_reversed = phone_keys(phone_number)
+        return phone_number
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -53,30 +97,19 @@ class Call(db.Model):
     
     def format_duration(self):
         """Format duration in human-readable format"""
-        if not self.duration_seconds:
-            return "0:00"
-        
-        minutes = self.duration_seconds // 60
-        seconds = self.duration_seconds % 60
-        return f"{minutes}:{seconds:02d}"
+        return format_duration(self.duration_seconds)
     
     def get_status_color(self):
         """Get color indicator for call status"""
-        status_colors = {
-            'initiated': '#fbbf24',  # yellow
-            'ringing': '#3b82f6',    # blue
-            'answered': '#10b981',   # green
-            'completed': '#059669',  # dark green
-            'failed': '#ef4444',     # red
-            'busy': '#f59e0b',       # orange
-            'no_answer': '#6b7280',  # gray
-            'cancelled': '#9ca3af'   # light gray
-        }
-        return status_colors.get(self.status, '#6b7280')
+        return CALL_STATUS_COLORS.get(self.status, '#6b7280')
     
     @classmethod
     def create_call(cls, clinic_id, phone_number, call_type, direction, **kwargs):
-        """Create a new call record"""
+        """Create a new call record (outbound calls count against the monthly quota)"""
+        if direction == 'outbound':
+            # Also counts the call in this month's rollup
+            enforce_quota(clinic_id, 'calls')
+        
         call = cls(
             clinic_id=clinic_id,
             phone_number=phone_number,
@@ -87,11 +120,16 @@ class Call(db.Model):
             **kwargs
         )
         db.session.add(call)
+        ClinicHourlyRollup.increment(clinic_id, ClinicHourlyRollup.CALLS, call.started_at, call.status)
+        if direction != 'outbound':
+            ClinicMonthlyRollup.increment(clinic_id, ClinicMonthlyRollup.CALLS, call.started_at)
         db.session.commit()
         return call
     
     def update_status(self, status, **kwargs):
         """Update call status and related fields"""
+        old_status, old_started_at = self.status, self.started_at
+        old_duration = self.duration_seconds or 0
         self.status = status
         self.updated_at = datetime.utcnow()
         
@@ -104,6 +142,13 @@ class Call(db.Model):
             if hasattr(self, key):
                 setattr(self, key, value)
         
+        ClinicHourlyRollup.move(self.clinic_id, ClinicHourlyRollup.CALLS,
+                                old_started_at, old_status, self.started_at, self.status)
+        if (self.duration_seconds or 0) != old_duration or self.started_at != old_started_at:
+            ClinicHourlyRollup.increment(self.clinic_id, ClinicHourlyRollup.CALL_DURATION,
+                                         old_started_at, amount=-old_duration)
+            ClinicHourlyRollup.increment(self.clinic_id, ClinicHourlyRollup.CALL_DURATION,
+                                         self.started_at, amount=self.duration_seconds or 0)
         db.session.commit()
     
     def __repr__(self):
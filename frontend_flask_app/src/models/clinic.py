@@ -1,9 +1,9 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, func, select
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
-from src.models.user import db
+from src.models.user import db, User
 
 class Clinic(db.Model):
     __tablename__ = 'clinics'
@@ -36,7 +36,6 @@ class Clinic(db.Model):
     leads = relationship("Lead", back_populates="clinic", cascade="all, delete-orphan")
     whatsapp_conversations = relationship("WhatsAppConversation", back_populates="clinic", cascade="all, delete-orphan")
     appointments = relationship("Appointment", back_populates="clinic", cascade="all, delete-orphan")
-    audit_logs = relationship("AuditLog", back_populates="clinic", cascade="all, delete-orphan")
     system_metrics = relationship("SystemMetric", back_populates="clinic", cascade="all, delete-orphan")
     
     def __init__(self, **kwargs):
@@ -113,45 +112,68 @@ class Clinic(db.Model):
     
     def get_usage_stats(self):
         """Get current usage statistics for the clinic"""
-        from datetime import datetime, timedelta
-        from sqlalchemy import func
+        return self.get_usage_stats_bulk([self.id]).get(self.id)
+    
+    @classmethod
+    def get_usage_stats_bulk(cls, clinic_ids):
+        """
+        Get current usage statistics for many clinics in a single query.
+        
+        Each count is a correlated subquery over the source tables that seeks
+        through the per-clinic indexes, so a page of clinics costs one round
+        trip and rows written outside create_call/create_message (seed data,
+        imports) are counted too.
+        """
+        if not clinic_ids:
+            return {}
         
         # Get current month start
         now = datetime.utcnow()
         month_start = datetime(now.year, now.month, 1)
         
-        # Count calls this month
-        monthly_calls = db.session.query(func.count(Call.id)).filter(
-            Call.clinic_id == self.id,
-            Call.created_at >= month_start
-        ).scalar() or 0
+        monthly_calls = select(func.count(Call.id)).where(
+            Call.clinic_id == cls.id,
+            Call.started_at >= month_start
+        ).correlate(cls).scalar_subquery()
         
-        # Count messages this month
-        monthly_messages = db.session.query(func.count(WhatsAppMessage.id)).filter(
-            WhatsAppMessage.conversation_id.in_(
-                db.session.query(WhatsAppConversation.id).filter(
-                    WhatsAppConversation.clinic_id == self.id
-                )
-            ),
-            WhatsAppMessage.created_at >= month_start
-        ).scalar() or 0
+        monthly_messages = select(func.count(WhatsAppMessage.id)).join(
+            WhatsAppConversation, WhatsAppMessage.conversation_id == WhatsAppConversation.id
+        ).where(
+            WhatsAppConversation.clinic_id == cls.id,
+            WhatsAppMessage.sent_at >= month_start
+        ).correlate(cls).scalar_subquery()
         
-        # Count active users
-        active_users = db.session.query(func.count(User.id)).filter(
-            User.clinic_id == self.id,
+        active_users = select(func.count(User.id)).where(
+            User.clinic_id == cls.id,
             User.is_active == True
-        ).scalar() or 0
+        ).correlate(cls).scalar_subquery()
         
+        rows = db.session.query(
+            cls.id, cls.max_users, cls.max_monthly_calls, cls.max_monthly_messages,
+            monthly_calls, monthly_messages, active_users
+        ).filter(cls.id.in_(list(clinic_ids))).all()
+        
+        return {
+            row[0]: cls._format_usage_stats(*row[1:])
+            for row in rows
+        }
+    
+    @staticmethod
+    def _format_usage_stats(max_users, max_monthly_calls, max_monthly_messages,
+                            monthly_calls, monthly_messages, active_users):
+        monthly_calls = monthly_calls or 0
+        monthly_messages = monthly_messages or 0
+        active_users = active_users or 0
         return {
             'monthly_calls': monthly_calls,
             'monthly_messages': monthly_messages,
             'active_users': active_users,
-            'max_users': self.max_users,
-            'max_monthly_calls': self.max_monthly_calls,
-            'max_monthly_messages': self.max_monthly_messages,
-            'calls_usage_percent': (monthly_calls / self.max_monthly_calls * 100) if self.max_monthly_calls > 0 else 0,
-            'messages_usage_percent': (monthly_messages / self.max_monthly_messages * 100) if self.max_monthly_messages > 0 else 0,
-            'users_usage_percent': (active_users / self.max_users * 100) if self.max_users > 0 else 0
+            'max_users': max_users,
+            'max_monthly_calls': max_monthly_calls,
+            'max_monthly_messages': max_monthly_messages,
+            'calls_usage_percent': (monthly_calls / max_monthly_calls * 100) if max_monthly_calls > 0 else 0,
+            'messages_usage_percent': (monthly_messages / max_monthly_messages * 100) if max_monthly_messages > 0 else 0,
+            'users_usage_percent': (active_users / max_users * 100) if max_users > 0 else 0
         }
 
 # Import other models to avoid circular imports
@@ -1,8 +1,36 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 import uuid
 from src.models.user import db
+from src.phone import phone_keys, same_phone
+
+LEAD_STATUS_COLORS = {
+    'new': '#3b82f6',           # blue
+    'contacted': '#f59e0b',     # orange
+    'interested': '#10b981',    # green
+    'not_interested': '#6b7280', # gray
+    'callback': '#8b5cf6',      # purple
+    'converted': '#059669',     # dark green
+    'do_not_call': '#ef4444'    # red
+}
+
+LEAD_PRIORITY_COLORS = {
+    'low': '#6b7280',      # gray
+    'medium': '#f59e0b',   # orange
+    'high': '#ef4444',     # red
+    'urgent': '#dc2626'    # dark red
+}
+
+def can_call(do_not_call, call_attempts, max_call_attempts, status):
+    """Check if a lead with these values can be called"""
+    if do_not_call:
+        return False
+    if call_attempts >= max_call_attempts:
+        return False
+    if status == 'do_not_call':
+        return False
+    return True
 
 class Lead(db.Model):
     __tablename__ = 'leads'
@@ -10,6 +38,10 @@ class Lead(db.Model):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     clinic_id = Column(String(36), ForeignKey('clinics.id', ondelete='CASCADE'), nullable=False)
     phone_number = Column(String(50), nullable=False)
+    # Derived lookup keys: exact match on E.164, "last N digits" match as a
+    # range seek on the reversed digits (see src.phone.phone_filter)
+    phone_e164 = Column(String(16))
+    phone_reversed = Column(String(15))
     name = Column(String(255))
     email = Column(String(255))
     status = Column(String(50), nullable=False, default='new')
@@ -32,6 +64,22 @@ class Lead(db.Model):
     assigned_user = relationship("User", back_populates="assigned_leads")
     calls = relationship("Call", back_populates="lead")
     
+    # Relationships read by to_dict, eager-loaded by list queries
+    SERIALIZED_RELATIONSHIPS = ('assigned_user',)
+    
+    __table_args__ = (
+        Index('ix_leads_clinic_created_at', clinic_id, created_at.desc()),
+        # Exact phone lookups and the contact timeline's newest-first scan
+        Index('ix_leads_clinic_phone_created_at', clinic_id, phone_e164, created_at.desc(), id.desc()),
+        Index('ix_leads_clinic_phone_reversed', clinic_id, phone_reversed),
+    )
+    
+    @validates('phone_number')
+    def _derive_phone_keys(self, key, phone_number):
+        """Keep the canonical and reversed-digit lookup keys in step with phone_number"""
+        self.phone_e164, self.phone_reversed = phone_keys(phone_number)
+        return phone_number
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -61,36 +109,15 @@ class Lead(db.Model):
     
     def get_status_color(self):
         """Get color indicator for lead status"""
-        status_colors = {
-            'new': '#3b82f6',           # blue
-            'contacted': '#f59e0b',     # orange
-            'interested': '#10b981',    # green
-            'not_interested': '#6b7280', # gray
-            'callback': '#8b5cf6',      # purple
-            'converted': '#059669',     # dark green
-            'do_not_call': '#ef4444'    # red
-        }
-        return status_colors.get(self.status, '#6b7280')
+        return LEAD_STATUS_COLORS.get(self.status, '#6b7280')
     
     def get_priority_color(self):
         """Get color indicator for lead priority"""
-        priority_colors = {
-            'low': '#6b7280',      # gray
-            'medium': '#f59e0b',   # orange
-            'high': '#ef4444',     # red
-            'urgent': '#dc2626'    # dark red
-        }
-        return priority_colors.get(self.priority, '#6b7280')
+        return LEAD_PRIORITY_COLORS.get(self.priority, '#6b7280')
     
     def can_call(self):
         """Check if lead can be called"""
-        if self.do_not_call:
-            return False
-        if self.call_attempts >= self.max_call_attempts:
-            return False
-        if self.status == 'do_not_call':
-            return False
-        return True
+        return can_call(self.do_not_call, self.call_attempts, self.max_call_attempts, self.status)
     
     def mark_as_do_not_call(self, reason=None):
         """Mark lead as do not call"""
@@ -128,7 +155,10 @@ class Lead(db.Model):
     def create_lead(cls, clinic_id, phone_number, **kwargs):
         """Create a new lead"""
         # Check if lead already exists for this clinic
-        existing_lead = cls.query.filter_by(clinic_id=clinic_id, phone_number=phone_number).first()
+        existing_lead = cls.query.filter(
+            cls.clinic_id == clinic_id,
+            same_phone(cls.phone_e164, cls.phone_number, phone_number)
+        ).first()
         if existing_lead:
             raise ValueError("Lead with this phone number already exists")
         
@@ -142,23 +172,193 @@ class Lead(db.Model):
         return lead
     
     @classmethod
-    def bulk_create_leads(cls, clinic_id, leads_data):
-        """Create multiple leads from a list"""
+    def bulk_create_leads(cls, clinic_id, leads_data, chunk_size=1000):
+        """
+        Create multiple leads from an iterable of dicts.
+        
+        Rows are processed in chunks: phone numbers are de-duplicated on their
+        E.164 form in memory and against the clinic's existing leads with one
+        IN lookup per chunk, then inserted with a single executemany and
+        committed once per chunk.
+        Returns (created, errors) where created holds the inserted row dicts and
+        errors holds {'row', 'phone_number', 'error'} for every rejected row.
+        """
         created_leads = []
         errors = []
+        seen_phones = set()
+        chunk = []
+        
+        for index, lead_data in enumerate(leads_data):
+            row, error = cls._prepare_bulk_row(clinic_id, lead_data)
+            if not error and cls._dedupe_key(row) in seen_phones:
+                error = 'Duplicate phone number in import'
+            if error:
+                errors.append({'row': index, 'phone_number': lead_data.get('phone_number'), 'error': error})
+                continue
+            
+            seen_phones.add(cls._dedupe_key(row))
+            chunk.append((index, row))
+            if len(chunk) >= chunk_size:
+                cls._insert_bulk_chunk(clinic_id, chunk, created_leads, errors)
+                chunk = []
         
-        for lead_data in leads_data:
-            try:
-                lead = cls.create_lead(clinic_id, **lead_data)
-                created_leads.append(lead)
-            except Exception as e:
+        if chunk:
+            cls._insert_bulk_chunk(clinic_id, chunk, created_leads, errors)
+        
+        errors.sort(key=lambda error: error['row'])
+        return created_leads, errors
+    
+    @classmethod
+    def _prepare_bulk_row(cls, clinic_id, lead_data):
+        """Validate one import row and turn it into an insertable dict"""
+        phone_number = (lead_data.get('phone_number') or '').strip()
+        if not phone_number:
+            return None, 'Phone number is required'
+        
+        columns = cls.__table__.columns.keys()
+        unknown = [key for key in lead_data if key not in columns]
+        if unknown:
+            return None, f"Unknown field: {', '.join(unknown)}"
+        
+        row = dict(lead_data, clinic_id=clinic_id, phone_number=phone_number)
+        row.setdefault('id', str(uuid.uuid4()))
+        # Core inserts bypass the phone_number validator
+        row['phone_e164'], row['phone_reversed'] = phone_keys(phone_number)
+        return row, None
+    
+    @staticmethod
+    def _dedupe_key(row):
+        """Numbers that cannot be canonicalized are compared as typed"""
+        return row['phone_e164'] or row['phone_number']
+    
+    @classmethod
+    def _insert_bulk_chunk(cls, clinic_id, chunk, created_leads, errors):
+        """Insert one chunk of prepared rows in a single transaction"""
+        e164s = [row['phone_e164'] for _, row in chunk if row['phone_e164']]
+        raw = [row['phone_number'] for _, row in chunk if not row['phone_e164']]
+        existing = set()
+        # Two lookups rather than one OR so each can seek the phone_e164 index
+        if e164s:
+            existing.update(e164 for e164, in db.session.query(cls.phone_e164).filter(
+                cls.clinic_id == clinic_id, cls.phone_e164.in_(e164s)
+            ))
+        if raw:
+            existing.update(phone for phone, in db.session.query(cls.phone_number).filter(
+                cls.clinic_id == clinic_id, cls.phone_e164.is_(None), cls.phone_number.in_(raw)
+            ))
+        
+        rows = []
+        for index, row in chunk:
+            if cls._dedupe_key(row) in existing:
                 errors.append({
-                    'phone_number': lead_data.get('phone_number'),
-                    'error': str(e)
+                    'row': index,
+                    'phone_number': row['phone_number'],
+                    'error': 'Lead with this phone number already exists'
                 })
+            else:
+                rows.append(row)
         
-        return created_leads, errors
+        if not rows:
+            db.session.rollback()
+            return
+        
+        # Rows may carry different optional fields; group them so each
+        # executemany batch shares one column set
+        batches = {}
+        for row in rows:
+            batches.setdefault(tuple(sorted(row)), []).append(row)
+        
+        try:
+            for batch in batches.values():
+                db.session.execute(cls.__table__.insert(), batch)
+            db.session.commit()
+            created_leads.extend(rows)
+        except Exception as e:
+            db.session.rollback()
+            failed_ids = {row['id'] for row in rows}
+            errors.extend(
+                {'row': index, 'phone_number': row['phone_number'], 'error': str(e)}
+                for index, row in chunk if row['id'] in failed_ids
+            )
     
     def __repr__(self):
         return f'<Lead {self.phone_number} ({self.status})>'
 
+
+
+class LeadImportJob(db.Model):
+    __tablename__ = 'lead_import_jobs'
+    
+    # Only the first errors are kept so a bad file cannot bloat the row
+    MAX_STORED_ERRORS = 100
+    
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    clinic_id = Column(String(36), ForeignKey('clinics.id', ondelete='CASCADE'), nullable=False)
+    created_by = Column(String(36), ForeignKey('users.id', ondelete='SET NULL'))
+    filename = Column(String(255))
+    file_format = Column(String(10), nullable=False, default='csv')
+    status = Column(String(20), nullable=False, default='queued')
+    bytes_total = Column(Integer, default=0)
+    bytes_processed = Column(Integer, default=0)
+    rows_processed = Column(Integer, default=0)
+    created_count = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    errors = Column(JSON, default=[])
+    failure_reason = Column(Text)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'clinic_id': self.clinic_id,
+            'created_by': self.created_by,
+            'filename': self.filename,
+            'file_format': self.file_format,
+            'status': self.status,
+            'progress_percent': self.get_progress_percent(),
+            'rows_processed': self.rows_processed,
+            'created_count': self.created_count,
+            'error_count': self.error_count,
+            'errors': self.errors or [],
+            'failure_reason': self.failure_reason,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def get_progress_percent(self):
+        """Share of the uploaded file consumed so far"""
+        if self.status == 'completed':
+            return 100.0
+        if not self.bytes_total:
+            return 0.0
+        return round(min(self.bytes_processed / self.bytes_total, 1) * 100, 1)
+    
+    def record_chunk(self, rows, created, errors, bytes_processed):
+        """Add the outcome of one imported chunk and commit the progress"""
+        self.rows_processed += rows
+        self.created_count += created
+        self.error_count += len(errors)
+        self.bytes_processed = bytes_processed
+        room = self.MAX_STORED_ERRORS - len(self.errors or [])
+        if room > 0 and errors:
+            self.errors = (self.errors or []) + errors[:room]
+        db.session.commit()
+    
+    def mark_running(self):
+        self.status = 'running'
+        self.started_at = datetime.utcnow()
+        db.session.commit()
+    
+    def mark_finished(self, failure_reason=None):
+        self.status = 'failed' if failure_reason else 'completed'
+        self.failure_reason = failure_reason
+        self.finished_at = datetime.utcnow()
+        db.session.commit()
+    
+    def __repr__(self):
+        return f'<LeadImportJob {self.filename} ({self.status})>'
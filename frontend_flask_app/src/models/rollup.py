@@ -0,0 +1,260 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, func, literal
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.models.user import db
+
+
+def upsert_increment(table, key_columns, values, amount_column, amount):
+    """
+    Add `amount` to a counter row, inserting it first if it does not exist.
+
+    Runs as a single INSERT ... ON CONFLICT DO UPDATE statement inside the
+    current session transaction, so it commits together with the caller.
+    """
+    dialect = db.session.get_bind().dialect.name
+    insert = postgresql_insert if dialect == 'postgresql' else sqlite_insert
+    stmt = insert(table).values(**values, **{amount_column: amount})
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={amount_column: table.c[amount_column] + stmt.excluded[amount_column]}
+    )
+    db.session.execute(stmt)
+
+
+def truncate_to(column, unit):
+    """SQL expression truncating a timestamp column to the start of an 'hour' or 'month'"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.date_trunc(unit, column)
+    return func.strftime('%Y-%m-%d %H:00:00' if unit == 'hour' else '%Y-%m-01 00:00:00', column)
+
+
+def as_bucket(value):
+    """SQLite returns truncated timestamps as strings; normalize to datetime"""
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+    return value
+
+
+class ClinicHourlyRollup(db.Model):
+    """Per-clinic hourly counters that back the dashboard summary"""
+    __tablename__ = 'clinic_hourly_rollups'
+
+    clinic_id = Column(String(36), ForeignKey('clinics.id', ondelete='CASCADE'), primary_key=True)
+    metric = Column(String(50), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    dimension = Column(String(50), primary_key=True, default='')
+    value = Column(Integer, nullable=False, default=0)
+
+    # Metric names; the dimension holds the status or sender type being counted
+    CALLS = 'calls'
+    CALL_DURATION = 'call_duration'
+    MESSAGES = 'messages'
+    APPOINTMENTS = 'appointments'
+
+    def to_dict(self):
+        return {
+            'clinic_id': self.clinic_id,
+            'metric': self.metric,
+            'bucket_start': self.bucket_start.isoformat() if self.bucket_start else None,
+            'dimension': self.dimension,
+            'value': self.value
+        }
+
+    @staticmethod
+    def bucket_for(at):
+        """Truncate a timestamp to the start of its hour"""
+        return at.replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def increment(cls, clinic_id, metric, at, dimension=None, amount=1):
+        """Add `amount` to the bucket containing `at` (pending until commit)"""
+        if not clinic_id or at is None or not amount:
+            return
+        upsert_increment(
+            cls.__table__,
+            ['clinic_id', 'metric', 'bucket_start', 'dimension'],
+            {
+                'clinic_id': clinic_id,
+                'metric': metric,
+                'bucket_start': cls.bucket_for(at),
+                'dimension': dimension or ''
+            },
+            'value',
+            amount
+        )
+
+    @classmethod
+    def move(cls, clinic_id, metric, old_at, old_dimension, new_at, new_dimension):
+        """Move one unit between buckets/dimensions after a status or date change"""
+        if old_dimension == new_dimension and old_at is not None and new_at is not None \
+                and cls.bucket_for(old_at) == cls.bucket_for(new_at):
+            return
+        cls.increment(clinic_id, metric, old_at, old_dimension, -1)
+        cls.increment(clinic_id, metric, new_at, new_dimension, 1)
+
+    @classmethod
+    def get_buckets(cls, clinic_id, metrics, start, end):
+        """Return (metric, bucket_start, dimension, value) rows in [start, end)"""
+        return db.session.query(cls.metric, cls.bucket_start, cls.dimension, cls.value).filter(
+            cls.clinic_id == clinic_id,
+            cls.metric.in_(metrics),
+            cls.bucket_start >= start,
+            cls.bucket_start < end
+        ).all()
+
+    @classmethod
+    def rebuild(cls, clinic_id=None, since=None):
+        """
+        Recompute hourly rollups from the source tables.
+
+        Used to backfill history or to correct drift; existing buckets in the
+        selected range are replaced with grouped counts.
+        """
+        from src.models.call import Call
+        from src.models.whatsapp import WhatsAppConversation, WhatsAppMessage
+        from src.models.appointment import Appointment
+
+        delete = cls.query
+        if clinic_id:
+            delete = delete.filter(cls.clinic_id == clinic_id)
+        if since:
+            delete = delete.filter(cls.bucket_start >= cls.bucket_for(since))
+        delete.delete(synchronize_session=False)
+
+        call_hour = truncate_to(Call.started_at, 'hour')
+        appointment_hour = truncate_to(Appointment.appointment_date, 'hour')
+        message_hour = truncate_to(WhatsAppMessage.sent_at, 'hour')
+        sources = [
+            (cls.CALLS, Call.clinic_id, Call.started_at,
+             db.session.query(Call.clinic_id, call_hour, Call.status, func.count(Call.id))
+             .group_by(Call.clinic_id, call_hour, Call.status)),
+            (cls.CALL_DURATION, Call.clinic_id, Call.started_at,
+             db.session.query(Call.clinic_id, call_hour, literal(''), func.sum(Call.duration_seconds))
+             .group_by(Call.clinic_id, call_hour)),
+            (cls.APPOINTMENTS, Appointment.clinic_id, Appointment.appointment_date,
+             db.session.query(Appointment.clinic_id, appointment_hour, Appointment.status, func.count(Appointment.id))
+             .group_by(Appointment.clinic_id, appointment_hour, Appointment.status)),
+            (cls.MESSAGES, WhatsAppConversation.clinic_id, WhatsAppMessage.sent_at,
+             db.session.query(WhatsAppConversation.clinic_id, message_hour, WhatsAppMessage.sender_type,
+                              func.count(WhatsAppMessage.id))
+             .join(WhatsAppConversation, WhatsAppMessage.conversation_id == WhatsAppConversation.id)
+             .group_by(WhatsAppConversation.clinic_id, message_hour, WhatsAppMessage.sender_type)),
+        ]
+
+        for metric, clinic_column, time_column, query in sources:
+            if clinic_id:
+                query = query.filter(clinic_column == clinic_id)
+            if since:
+                query = query.filter(time_column >= cls.bucket_for(since))
+
+            rows = []
+            for row_clinic_id, bucket_start, dimension, value in query.all():
+                rows.append({
+                    'clinic_id': row_clinic_id,
+                    'metric': metric,
+                    'bucket_start': as_bucket(bucket_start),
+                    'dimension': dimension or '',
+                    'value': int(value or 0)
+                })
+            if rows:
+                db.session.execute(cls.__table__.insert(), rows)
+
+        db.session.commit()
+
+    def __repr__(self):
+        return f'<ClinicHourlyRollup {self.metric}/{self.dimension} {self.bucket_start}: {self.value}>'
+
+
+class ClinicMonthlyRollup(db.Model):
+    """Per-clinic monthly usage counters that back cross-clinic analytics"""
+    __tablename__ = 'clinic_monthly_rollups'
+
+    clinic_id = Column(String(36), ForeignKey('clinics.id', ondelete='CASCADE'), primary_key=True)
+    metric = Column(String(50), primary_key=True)
+    month_start = Column(DateTime, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+    CALLS = 'calls'
+    MESSAGES = 'messages'
+
+    def to_dict(self):
+        return {
+            'clinic_id': self.clinic_id,
+            'metric': self.metric,
+            'month_start': self.month_start.isoformat() if self.month_start else None,
+            'value': self.value
+        }
+
+    @staticmethod
+    def month_for(at):
+        """Truncate a timestamp to the first instant of its month"""
+        return datetime(at.year, at.month, 1)
+
+    @classmethod
+    def increment(cls, clinic_id, metric, at, amount=1):
+        """Add `amount` to the clinic's counter for the month containing `at`"""
+        if not clinic_id or at is None or not amount:
+            return
+        upsert_increment(
+            cls.__table__,
+            ['clinic_id', 'metric', 'month_start'],
+            {'clinic_id': clinic_id, 'metric': metric, 'month_start': cls.month_for(at)},
+            'value',
+            amount
+        )
+
+    @classmethod
+    def totals_by_month(cls, since):
+        """Return (month_start, metric, total) summed over all clinics from `since` on"""
+        return db.session.query(cls.month_start, cls.metric, func.sum(cls.value)).filter(
+            cls.month_start >= cls.month_for(since)
+        ).group_by(cls.month_start, cls.metric).all()
+
+    @classmethod
+    def grand_totals(cls):
+        """Return {metric: total} over all clinics and months"""
+        return dict(db.session.query(cls.metric, func.sum(cls.value)).group_by(cls.metric).all())
+
+    @classmethod
+    def rebuild(cls, clinic_id=None, since=None):
+        """Recompute monthly rollups from the source tables (backfill / drift repair)"""
+        from src.models.call import Call
+        from src.models.whatsapp import WhatsAppConversation, WhatsAppMessage
+
+        delete = cls.query
+        if clinic_id:
+            delete = delete.filter(cls.clinic_id == clinic_id)
+        if since:
+            delete = delete.filter(cls.month_start >= cls.month_for(since))
+        delete.delete(synchronize_session=False)
+
+        call_month = truncate_to(Call.started_at, 'month')
+        message_month = truncate_to(WhatsAppMessage.sent_at, 'month')
+        sources = [
+            (cls.CALLS, Call.clinic_id, Call.started_at,
+             db.session.query(Call.clinic_id, call_month, func.count(Call.id))
+             .group_by(Call.clinic_id, call_month)),
+            (cls.MESSAGES, WhatsAppConversation.clinic_id, WhatsAppMessage.sent_at,
+             db.session.query(WhatsAppConversation.clinic_id, message_month, func.count(WhatsAppMessage.id))
+             .join(WhatsAppConversation, WhatsAppMessage.conversation_id == WhatsAppConversation.id)
+             .group_by(WhatsAppConversation.clinic_id, message_month)),
+        ]
+
+        for metric, clinic_column, time_column, query in sources:
+            if clinic_id:
+                query = query.filter(clinic_column == clinic_id)
+            if since:
+                query = query.filter(time_column >= cls.month_for(since))
+
+            rows = [
+                {'clinic_id': row_clinic_id, 'metric': metric, 'month_start': as_bucket(month_start), 'value': value}
+                for row_clinic_id, month_start, value in query.all()
+            ]
+            if rows:
+                db.session.execute(cls.__table__.insert(), rows)
+
+        db.session.commit()
+
+    def __repr__(self):
+        return f'<ClinicMonthlyRollup {self.metric} {self.month_start}: {self.value}>'
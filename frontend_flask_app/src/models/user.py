@@ -1,11 +1,12 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, Index, and_
 from sqlalchemy.orm import relationship
-from werkzeug.security import generate_password_hash, check_password_hash
+from src.passwords import password_hasher
+from src.replicas import RoutingSession
 import uuid
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -32,7 +33,11 @@ class User(db.Model):
     assigned_leads = relationship("Lead", back_populates="assigned_user")
     assigned_conversations = relationship("WhatsAppConversation", back_populates="assigned_agent")
     created_appointments = relationship("Appointment", back_populates="created_by_user")
-    audit_logs = relationship("AuditLog", back_populates="user")
+    
+    __table_args__ = (
+        # Login resolves users by clinic and username
+        Index('ix_users_clinic_username', clinic_id, username),
+    )
     
     def __init__(self, **kwargs):
         if 'password' in kwargs:
@@ -41,12 +46,24 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set the user's password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
         self.password_changed_at = datetime.utcnow()
     
     def check_password(self, password):
         """Check if the provided password matches the user's password"""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+    
+    def rehash_password_if_needed(self, password):
+        """
+        Re-hash a just-verified password when the stored hash predates the
+        configured hashing parameters. Flushed, so the identity version bump
+        happens now, but left for the caller to commit.
+        """
+        if password_hasher.needs_rehash(self.password_hash):
+            self.password_hash = password_hasher.hash(password)
+            db.session.flush()
+            return True
+        return False
     
     def is_locked(self):
         """Check if the user account is locked"""
@@ -54,19 +71,19 @@ class User(db.Model):
             return True
         return False
     
-    def increment_failed_login(self):
-        """Increment failed login attempts and lock account if necessary"""
-        self.failed_login_attempts += 1
-        if self.failed_login_attempts >= 5:
-            self.locked_until = datetime.utcnow() + timedelta(minutes=30)
+    def lock_after_failed_logins(self, attempts, seconds):
+        """Lock the account once the rate limiter has counted too many failed logins"""
+        self.failed_login_attempts = attempts
+        self.locked_until = datetime.utcnow() + timedelta(seconds=seconds)
         db.session.commit()
     
-    def reset_failed_login(self):
+    def reset_failed_login(self, commit=True):
         """Reset failed login attempts after successful login"""
         self.failed_login_attempts = 0
         self.locked_until = None
         self.last_login_at = datetime.utcnow()
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
     def has_permission(self, permission):
         """Check if user has a specific permission"""
@@ -113,6 +130,11 @@ class User(db.Model):
     @classmethod
     def create_user(cls, clinic_id, username, email, password, role='agent', **kwargs):
         """Create a new user with hashed password"""
+        from src.quotas import enforce_quota
+        
+        if clinic_id:
+            enforce_quota(clinic_id, 'users')
+        
         # Check for unique username within clinic
         existing_user = cls.query.filter_by(clinic_id=clinic_id, username=username).first()
         if existing_user:
@@ -135,6 +157,23 @@ class User(db.Model):
         db.session.commit()
         return user
     
+    @classmethod
+    def find_for_login(cls, clinic_name, username):
+        """
+        Resolve an active clinic and its active user in one query.
+        
+        Returns (clinic, user): (None, None) when no active clinic has that
+        name, (clinic, None) when the clinic has no such active user.
+        """
+        from src.models.clinic import Clinic
+        
+        row = db.session.query(Clinic, cls).outerjoin(cls, and_(
+            cls.clinic_id == Clinic.id,
+            cls.username == username,
+            cls.is_active == True
+        )).filter(Clinic.name == clinic_name, Clinic.is_active == True).first()
+        return (row[0], row[1]) if row else (None, None)
+    
     @classmethod
     def create_super_admin(cls, username, email, password, **kwargs):
         """Create a super admin user (not associated with any clinic)"""
@@ -1,8 +1,24 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, ARRAY, Index
+from sqlalchemy.orm import relationship, validates
 import uuid
 from src.models.user import db
+from src.models.rollup import ClinicHourlyRollup, ClinicMonthlyRollup
+from src.quotas import enforce_quota
+from src.phone import phone_keys, same_phone
+
+CONVERSATION_STATUS_COLORS = {
+    'active': '#10b981',     # green
+    'resolved': '#6b7280',   # gray
+    'archived': '#9ca3af',   # light gray
+    'escalated': '#ef4444'   # red
+}
+
+SENDER_COLORS = {
+    'customer': '#3b82f6',  # blue
+    'ai': '#10b981',        # green
+    'agent': '#8b5cf6'      # purple
+}
 
 class WhatsAppConversation(db.Model):
     __tablename__ = 'whatsapp_conversations'
@@ -10,6 +26,10 @@ class WhatsAppConversation(db.Model):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     clinic_id = Column(String(36), ForeignKey('clinics.id', ondelete='CASCADE'), nullable=False)
     phone_number = Column(String(50), nullable=False)
+    # Derived lookup keys: exact match on E.164, "last N digits" match as a
+    # range seek on the reversed digits (see src.phone.phone_filter)
+    phone_e164 = Column(String(16))
+    phone_reversed = Column(String(15))
     contact_name = Column(String(255))
     status = Column(String(50), nullable=False, default='active')
     assigned_agent_id = Column(String(36), ForeignKey('users.id'))
@@ -29,6 +49,22 @@ class WhatsAppConversation(db.Model):
     assigned_agent = relationship("User", back_populates="assigned_conversations")
     messages = relationship("WhatsAppMessage", back_populates="conversation", cascade="all, delete-orphan")
     
+    # Relationships read by to_dict, eager-loaded by list queries
+    SERIALIZED_RELATIONSHIPS = ('assigned_agent',)
+    
+    __table_args__ = (
+        Index('ix_whatsapp_conversations_clinic_phone', clinic_id, phone_number),
+        Index('ix_whatsapp_conversations_clinic_last_message_at', clinic_id, last_message_at.desc()),
+        Index('ix_whatsapp_conversations_clinic_phone_e164', clinic_id, phone_e164),
+        Index('ix_whatsapp_conversations_clinic_phone_reversed', clinic_id, phone_reversed),
+    )
+    
+    @validates('phone_number')
+    def _derive_phone_keys(self, key, phone_number):
+        """Keep the canonical and reversed-digit lookup keys in step with phone_number"""
+        self.phone_e164, self.phone_reversed = phone_keys(phone_number)
+        return phone_number
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -53,13 +89,7 @@ class WhatsAppConversation(db.Model):
     
     def get_status_color(self):
         """Get color indicator for conversation status"""
-        status_colors = {
-            'active': '#10b981',     # green
-            'resolved': '#6b7280',   # gray
-            'archived': '#9ca3af',   # light gray
-            'escalated': '#ef4444'   # red
-        }
-        return status_colors.get(self.status, '#6b7280')
+        return CONVERSATION_STATUS_COLORS.get(self.status, '#6b7280')
     
     def assign_to_agent(self, agent_id, handoff_reason=None):
         """Assign conversation to a human agent"""
@@ -114,9 +144,9 @@ class WhatsAppConversation(db.Model):
     @classmethod
     def get_or_create_conversation(cls, clinic_id, phone_number, contact_name=None):
         """Get existing conversation or create new one"""
-        conversation = cls.query.filter_by(
-            clinic_id=clinic_id,
-            phone_number=phone_number
+        conversation = cls.query.filter(
+            cls.clinic_id == clinic_id,
+            same_phone(cls.phone_e164, cls.phone_number, phone_number)
         ).first()
         
         if not conversation:
@@ -160,6 +190,10 @@ class WhatsAppMessage(db.Model):
     # Relationships
     conversation = relationship("WhatsAppConversation", back_populates="messages")
     
+    __table_args__ = (
+        Index('ix_whatsapp_messages_conversation_sent_at', conversation_id, sent_at.desc(), id.desc()),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -186,12 +220,7 @@ class WhatsAppMessage(db.Model):
     
     def get_sender_color(self):
         """Get color indicator for message sender"""
-        sender_colors = {
-            'customer': '#3b82f6',  # blue
-            'ai': '#10b981',        # green
-            'agent': '#8b5cf6'      # purple
-        }
-        return sender_colors.get(self.sender_type, '#6b7280')
+        return SENDER_COLORS.get(self.sender_type, '#6b7280')
     
     def mark_as_read(self):
         """Mark message as read"""
@@ -214,7 +243,12 @@ class WhatsAppMessage(db.Model):
     
     @classmethod
     def create_message(cls, conversation_id, sender_type, content, **kwargs):
-        """Create a new WhatsApp message"""
+        """Create a new WhatsApp message (outgoing messages count against the monthly quota)"""
+        conversation = WhatsAppConversation.query.get(conversation_id)
+        if conversation and sender_type != 'customer':
+            # Also counts the message in this month's rollup
+            enforce_quota(conversation.clinic_id, 'messages')
+        
         message = cls(
             conversation_id=conversation_id,
             sender_type=sender_type,
@@ -225,10 +259,13 @@ class WhatsAppMessage(db.Model):
         db.session.add(message)
         
         # Update conversation last message info
-        conversation = WhatsAppConversation.query.get(conversation_id)
         if conversation:
             conversation.last_message_at = message.sent_at
             conversation.last_message_from = sender_type
+            ClinicHourlyRollup.increment(conversation.clinic_id, ClinicHourlyRollup.MESSAGES,
+                                         message.sent_at, sender_type)
+            if sender_type == 'customer':
+                ClinicMonthlyRollup.increment(conversation.clinic_id, ClinicMonthlyRollup.MESSAGES, message.sent_at)
             
             # Increment unread count if message is from customer
             if sender_type == 'customer':
@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import datetime, timezone
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def parse_utc_timestamp(value):
+    """
+    Parse an ISO-8601 timestamp into the naive UTC datetimes the database
+    stores; offsets such as +02:00 are converted, naive input is taken as UTC
+    """
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def encode_cursor(timestamp, row_id):
+    """Encode a (timestamp, id) position into an opaque URL-safe token"""
+    payload = json.dumps([timestamp.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor back into (timestamp, id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return parse_utc_timestamp(timestamp), str(row_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise InvalidCursor('Invalid pagination cursor')
+
+
+def keyset_paginate(query, timestamp_column, id_column, per_page, after=None):
+    """
+    Seek-based pagination ordered by (timestamp, id) descending.
+
+    Instead of OFFSET, rows are located by comparing against the last seen
+    (timestamp, id) pair, so the cost of a page does not depend on its depth
+    as long as a matching composite index exists. One extra row is fetched
+    to find out whether another page follows.
+    """
+    if after:
+        timestamp, row_id = decode_cursor(after)
+        query = query.filter(tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id))
+
+    rows = query.order_by(timestamp_column.desc(), id_column.desc()).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
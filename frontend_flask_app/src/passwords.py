@@ -0,0 +1,97 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# werkzeug's own default, used until init_app configures the hasher
+DEFAULT_METHOD = 'scrypt'
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Raised when no hashing slot frees up within the queue timeout"""
+
+
+def _gevent_threadpool():
+    """gevent's native thread pool when threading is monkey-patched, else None"""
+    try:
+        from gevent import monkey, get_hub
+    except ImportError:
+        return None
+    if not monkey.is_module_patched('threading'):
+        return None
+    return get_hub().threadpool
+
+
+class PasswordHasher:
+    """
+    Password hashing with configurable cost and a bounded worker pool.
+
+    The method string is werkzeug's (`scrypt:n:r:p` or
+    `pbkdf2:sha256:iterations`). Hashing and verification run on a pool of
+    `workers` OS threads; hashlib releases the GIL, so they use every core
+    while request threads (or greenlets, under gevent) stay responsive. At
+    most `workers * 2` calls are in flight or queued; callers wait up to
+    `queue_timeout` seconds for a slot and then get PasswordHashingBusy
+    rather than piling up behind a login storm.
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, salt_length=16, workers=0, queue_timeout=2.0):
+        self.configure(method, salt_length, workers, queue_timeout)
+
+    def init_app(self, app):
+        self.configure(
+            method=app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+            salt_length=app.config.get('PASSWORD_HASH_SALT_LENGTH', 16),
+            workers=app.config.get('PASSWORD_HASH_WORKERS', 0),
+            queue_timeout=app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 2.0)
+        )
+        app.extensions['password_hasher'] = self
+
+    def configure(self, method, salt_length=16, workers=0, queue_timeout=2.0):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        # werkzeug expands bare names ('scrypt') to full parameters; hash once
+        # to learn the prefix that current hashes carry
+        self.prefix = generate_password_hash('', method, salt_length).split('$', 1)[0]
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, workers) * 2)
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash was made with other parameters than the configured ones"""
+        return password_hash.split('$', 1)[0] != self.prefix
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHashingBusy('Too many password checks in progress')
+        try:
+            pool = _gevent_threadpool()
+            if pool is not None:
+                return pool.apply(fn, args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def _get_executor(self):
+        # Threads do not survive a fork, so (re)create the pool per worker process
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+            return self._executor
+
+
+password_hasher = PasswordHasher()
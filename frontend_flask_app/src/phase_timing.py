@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """Wall-clock milliseconds spent in each named phase of one request"""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+    def server_timing(self):
+        """Value for a Server-Timing response header"""
+        return ', '.join(f'{name};dur={duration:.1f}' for name, duration in self.phases.items())
+
+
+class PhaseMetrics:
+    """
+    Per-phase latency percentiles for this process, over the last `samples`
+    observations of each phase
+    """
+
+    def __init__(self, samples=1000):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._durations = {}
+
+    def record(self, timer):
+        with self._lock:
+            for name, duration in timer.phases.items():
+                durations = self._durations.get(name)
+                if durations is None:
+                    durations = self._durations[name] = deque(maxlen=self.samples)
+                durations.append(duration)
+
+    def snapshot(self):
+        """{phase: {count, p50_ms, p99_ms, max_ms}}"""
+        with self._lock:
+            observed = {name: sorted(durations) for name, durations in self._durations.items()}
+        return {
+            name: {
+                'count': len(durations),
+                'p50_ms': round(durations[len(durations) // 2], 2),
+                'p99_ms': round(durations[min(len(durations) - 1, len(durations) * 99 // 100)], 2),
+                'max_ms': round(durations[-1], 2)
+            }
+            for name, durations in observed.items()
+        }
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+
+
+login_phase_metrics = PhaseMetrics()
@@ -0,0 +1,111 @@
+import re
+from flask import current_app, has_app_context
+from sqlalchemy import and_
+
+_FORMATTING = re.compile(r'[\s\-\.\(\)/]')
+
+
+def normalize_phone_number(raw):
+    """
+    Strip formatting from a phone number typed or exported by a person.
+
+    Spaces, dashes, dots, slashes and parentheses are removed and an
+    international 00 prefix becomes '+'. Returns None if nothing dialable
+    is left.
+    """
+    if raw is None:
+        return None
+    phone = _FORMATTING.sub('', str(raw).strip())
+    if phone.startswith('00'):
+        phone = '+' + phone[2:]
+    digits = phone[1:] if phone.startswith('+') else phone
+    if not digits.isdigit():
+        return None
+    return phone
+
+
+# E.164 allows at most 15 digits after the '+'
+MAX_E164_DIGITS = 15
+MIN_E164_DIGITS = 7
+# Searches with at least this many digits after any trunk zeros are taken as
+# a whole national number; shorter ones are suffixes, kept as typed
+MIN_NATIONAL_DIGITS = 7
+
+
+def default_country_code():
+    """Country code assumed for numbers written without one"""
+    if has_app_context():
+        return current_app.config.get('DEFAULT_PHONE_COUNTRY_CODE', '1')
+    return '1'
+
+
+def to_e164(raw, country_code=None):
+    """
+    Canonical +<country><number> form of a phone number, or None.
+
+    Numbers without an international prefix get `country_code` (default
+    DEFAULT_PHONE_COUNTRY_CODE) after their national trunk zeros are
+    dropped, unless they already start with that code and are longer than
+    a national number.
+    """
+    phone = normalize_phone_number(raw)
+    if not phone:
+        return None
+    if phone.startswith('+'):
+        digits = phone[1:]
+    else:
+        country_code = country_code or default_country_code()
+        digits = phone.lstrip('0')
+        if not (digits.startswith(country_code) and len(digits) > 10):
+            digits = country_code + digits
+    if not MIN_E164_DIGITS <= len(digits) <= MAX_E164_DIGITS:
+        return None
+    return '+' + digits
+
+
+def phone_keys(raw, country_code=None):
+    """(e164, reversed digits) index keys for a stored phone number"""
+    e164 = to_e164(raw, country_code)
+    if e164 is None:
+        return None, None
+    return e164, e164[:0:-1]
+
+
+def phone_filter(e164_column, reversed_column, raw):
+    """
+    Filter clause matching a phone number typed into a search box.
+
+    Input with an international prefix ('+' or '00') is an exact match on
+    the E.164 column; anything else matches numbers ending in the typed
+    digits, as a range seek on the reversed-digits column. A full national
+    number loses its trunk zeros, which the stored E.164 form does not
+    have, while a short suffix such as '0958' keeps them. Returns None when
+    fewer than 4 digits were typed.
+    """
+    phone = normalize_phone_number(raw)
+    if not phone:
+        return None
+    if phone.startswith('+'):
+        return e164_column == to_e164(phone)
+
+    digits = phone
+    if len(phone.lstrip('0')) >= MIN_NATIONAL_DIGITS:
+        digits = phone.lstrip('0')
+    if len(digits) < 4:
+        return None
+    key = digits[::-1]
+    return and_(reversed_column >= key, reversed_column <= key + '9' * (MAX_E164_DIGITS - len(key)))
+
+
+def same_phone(e164_column, raw_column, raw):
+    """
+    Clause matching stored numbers equal to `raw` however either was formatted.
+
+    A number with no E.164 form is compared as typed, and only against
+    stored numbers that have none either, so the lookup still seeks on the
+    (clinic_id, phone_e164) index instead of needing one on the raw column.
+    """
+    e164 = to_e164(raw)
+    if e164 is None:
+        return and_(e164_column.is_(None), raw_column == raw)
+    return e164_column == e164
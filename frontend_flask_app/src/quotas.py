@@ -0,0 +1,123 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from src.models.user import db, User
+from src.models.rollup import ClinicMonthlyRollup, upsert_increment
+
+# kind -> (Clinic limit column, monthly counter metric); users are counted live
+QUOTA_KINDS = {
+    'calls': ('max_monthly_calls', ClinicMonthlyRollup.CALLS),
+    'messages': ('max_monthly_messages', ClinicMonthlyRollup.MESSAGES),
+    'users': ('max_users', None)
+}
+
+
+class QuotaExceeded(ValueError):
+    """Raised when a clinic has used up a plan limit"""
+
+    def __init__(self, kind, used, limit):
+        self.kind = kind
+        self.used = used
+        self.limit = limit
+        super().__init__(f'Clinic has reached its {kind} limit ({used}/{limit})')
+
+
+def check_quota(clinic_id, kind, amount=1):
+    """
+    Report whether `amount` more units of `kind` fit in the clinic's limit.
+
+    Monthly calls and messages are read from the clinic_monthly_rollups
+    counter for the current month, so this is a single primary-key lookup
+    joined with the clinic's limit rather than a COUNT over the source table.
+    """
+    from src.models.clinic import Clinic
+
+    if kind not in QUOTA_KINDS:
+        raise ValueError(f'Unknown quota kind: {kind}')
+
+    limit_column, metric = QUOTA_KINDS[kind]
+    if metric:
+        used = select(ClinicMonthlyRollup.value).where(
+            ClinicMonthlyRollup.clinic_id == Clinic.id,
+            ClinicMonthlyRollup.metric == metric,
+            ClinicMonthlyRollup.month_start == ClinicMonthlyRollup.month_for(datetime.utcnow())
+        ).correlate(Clinic).scalar_subquery()
+    else:
+        used = select(func.count(User.id)).where(
+            User.clinic_id == Clinic.id,
+            User.is_active == True
+        ).correlate(Clinic).scalar_subquery()
+
+    row = db.session.query(getattr(Clinic, limit_column), used).filter(Clinic.id == clinic_id).first()
+    if row is None:
+        raise ValueError('Clinic not found')
+
+    limit, used = row[0], row[1] or 0
+    return {
+        'kind': kind,
+        'used': used,
+        'limit': limit,
+        'remaining': max(limit - used, 0),
+        'allowed': used + amount <= limit
+    }
+
+
+def enforce_quota(clinic_id, kind, amount=1):
+    """
+    Take `amount` units of `kind` from the clinic's limit, or raise QuotaExceeded.
+
+    For calls and messages the check and the increment are one conditional
+    UPDATE on this month's counter (`value + amount <= limit`), so two
+    requests racing for the last unit cannot both pass; the counter row
+    stays locked until the caller's transaction ends and rolls back with
+    it. The caller must therefore not increment the monthly counter again.
+    Users are counted live while the clinic row is held FOR UPDATE.
+    """
+    from src.models.clinic import Clinic
+
+    if kind not in QUOTA_KINDS:
+        raise ValueError(f'Unknown quota kind: {kind}')
+
+    limit_column, metric = QUOTA_KINDS[kind]
+    if not metric:
+        db.session.query(Clinic.id).filter(Clinic.id == clinic_id).with_for_update().first()
+        quota = check_quota(clinic_id, kind, amount)
+        if not quota['allowed']:
+            raise QuotaExceeded(kind, quota['used'], quota['limit'])
+        return
+
+    table = ClinicMonthlyRollup.__table__
+    key = {'clinic_id': clinic_id, 'metric': metric, 'month_start': ClinicMonthlyRollup.month_for(datetime.utcnow())}
+    # Make sure this month's counter row exists so the UPDATE has a row to guard
+    upsert_increment(table, list(key), key, 'value', 0)
+    limit = select(getattr(Clinic, limit_column)).where(Clinic.id == clinic_id).scalar_subquery()
+    result = db.session.execute(
+        table.update()
+        .where(*[table.c[column] == value for column, value in key.items()], table.c.value + amount <= limit)
+        .values(value=table.c.value + amount)
+    )
+    if result.rowcount != 1:
+        quota = check_quota(clinic_id, kind, amount)
+        raise QuotaExceeded(kind, quota['used'], quota['limit'])
+
+
+def reconcile_usage(clinic_id=None):
+    """
+    Correct drift in this month's usage counters against the source tables.
+
+    Returns a list of {clinic_id, metric, counted, actual} for every counter
+    that had to be changed.
+    """
+    month_start = ClinicMonthlyRollup.month_for(datetime.utcnow())
+    query = ClinicMonthlyRollup.query.filter(ClinicMonthlyRollup.month_start == month_start)
+    if clinic_id:
+        query = query.filter(ClinicMonthlyRollup.clinic_id == clinic_id)
+    before = {(row.clinic_id, row.metric): row.value for row in query.all()}
+
+    ClinicMonthlyRollup.rebuild(clinic_id=clinic_id, since=month_start)
+    after = {(row.clinic_id, row.metric): row.value for row in query.all()}
+
+    return [
+        {'clinic_id': key[0], 'metric': key[1], 'counted': before.get(key, 0), 'actual': after.get(key, 0)}
+        for key in sorted(set(before) | set(after))
+        if before.get(key, 0) != after.get(key, 0)
+    ]
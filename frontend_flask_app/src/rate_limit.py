@@ -0,0 +1,193 @@
+import math
+import threading
+import time
+from collections import namedtuple
+from functools import wraps
+from flask import current_app, jsonify, make_response
+
+# `limit` requests per `window` seconds
+RateLimit = namedtuple('RateLimit', ['name', 'limit', 'window'])
+
+
+def parse_rate(value):
+    """'20/60' -> (20, 60): 20 requests per 60 seconds"""
+    limit, _, window = str(value).partition('/')
+    return int(limit), int(window or 60)
+
+
+def rules(pairs):
+    """[(config key, identifier)] -> [(RateLimit, identifier)] for the current app, skipping empty identifiers"""
+    checks = []
+    for config_key, identifier in pairs:
+        if identifier:
+            limit, window = parse_rate(current_app.config[config_key])
+            checks.append((RateLimit(config_key, limit, window), identifier))
+    return checks
+
+
+class MemoryRateLimitStore:
+    """Fixed-window counters for this process only (single worker or tests)"""
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._next_purge = 0
+
+    def hit(self, keys, increment=True):
+        """
+        For each (key, window, index): add one to the count of window `index`
+        (unless increment is False) and return (current, previous) counts
+        """
+        now = time.time()
+        with self._lock:
+            if now >= self._next_purge:
+                self._purge(now)
+            results = []
+            for key, window, index in keys:
+                current_key = (key, index)
+                if increment:
+                    count, _ = self._counts.get(current_key, (0, None))
+                    self._counts[current_key] = (count + 1, (index + 2) * window)
+                results.append((
+                    self._counts.get(current_key, (0, None))[0],
+                    self._counts.get((key, index - 1), (0, None))[0]
+                ))
+            return results
+
+    def clear(self, keys):
+        """Forget the counts of each (key, window, index) and of the window before it"""
+        with self._lock:
+            for key, _, index in keys:
+                self._counts.pop((key, index), None)
+                self._counts.pop((key, index - 1), None)
+
+    def _purge(self, now):
+        # Drop windows too old to weigh into any estimate
+        self._counts = {key: value for key, value in self._counts.items() if value[1] > now}
+        self._next_purge = now + 60
+
+
+class RedisRateLimitStore:
+    """Fixed-window counters shared by all workers through Redis, one round trip per check"""
+    key_prefix = 'ratelimit:'
+
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def hit(self, keys, increment=True):
+        pipe = self._client.pipeline(transaction=False)
+        for key, window, index in keys:
+            current_key = f'{self.key_prefix}{key}:{index}'
+            if increment:
+                pipe.incr(current_key)
+                pipe.expire(current_key, window * 2)
+            else:
+                pipe.get(current_key)
+            pipe.get(f'{self.key_prefix}{key}:{index - 1}')
+        replies = pipe.execute()
+        step = 3 if increment else 2
+        return [
+            (int(replies[i] or 0), int(replies[i + step - 1] or 0))
+            for i in range(0, len(replies), step)
+        ]
+
+    def clear(self, keys):
+        self._client.delete(*[
+            f'{self.key_prefix}{key}:{i}' for key, _, index in keys for i in (index, index - 1)
+        ])
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limits over (rule, identifier) pairs.
+
+    Each rule keeps a counter per fixed window of `window` seconds; the
+    sliding count is the current window's count plus the previous window's
+    weighted by how much of it still overlaps the sliding window. That is
+    two integers per key, and every rule of a request is checked in a single
+    store call.
+    """
+
+    def __init__(self, store, enabled=True):
+        self.store = store
+        self.enabled = enabled
+
+    def hit(self, checks):
+        """Count a request against each (RateLimit, identifier); seconds to wait if it went over a limit, else None"""
+        return self._check(checks, increment=True, allowance=0)
+
+    def exceeded(self, checks):
+        """Whether another request would go over a limit, without counting one; seconds to wait, else None"""
+        return self._check(checks, increment=False, allowance=1)
+
+    def record(self, checks):
+        """Count an event (such as a failed password); seconds to wait if a limit is now reached, else None"""
+        return self._check(checks, increment=True, allowance=1)
+
+    def reset(self, checks):
+        """Clear the counts behind each (RateLimit, identifier), such as failed passwords after a good one"""
+        if self.enabled and checks:
+            self.store.clear(self._keys(checks, time.time()))
+
+    def _keys(self, checks, now):
+        return [(f'{limit.name}:{identifier}', limit.window, int(now // limit.window)) for limit, identifier in checks]
+
+    def _check(self, checks, increment, allowance):
+        if not self.enabled or not checks:
+            return None
+        now = time.time()
+        keys = self._keys(checks, now)
+        retry_after = None
+        for (limit, _), (_, window, index), (current, previous) in zip(
+                checks, keys, self.store.hit(keys, increment=increment)):
+            elapsed = now - index * window
+            if current + previous * (1 - elapsed / window) + allowance > limit.limit:
+                retry_after = max(retry_after or 0, math.ceil(window - elapsed), 1)
+        return retry_after
+
+
+def init_rate_limiter(app):
+    """Attach the rate limiter backed by the store selected by RATELIMIT_STORE"""
+    backend = app.config.get('RATELIMIT_STORE', 'memory')
+    if backend == 'redis':
+        store = RedisRateLimitStore.from_url(app.config['RATELIMIT_STORAGE_URL'])
+    elif backend == 'fakeredis':
+        import fakeredis
+        store = RedisRateLimitStore(fakeredis.FakeRedis())
+    else:
+        store = MemoryRateLimitStore()
+    limiter = RateLimiter(store, enabled=app.config.get('RATELIMIT_ENABLED', True))
+    app.extensions['rate_limiter'] = limiter
+    return limiter
+
+
+def get_rate_limiter():
+    return current_app.extensions['rate_limiter']
+
+
+def too_many_requests(retry_after):
+    response = make_response(jsonify({'error': 'Too many requests, please retry later', 'retry_after': retry_after}), 429)
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def rate_limited(checks):
+    """
+    Decorator rejecting a request with 429 when any of `checks()` is over its
+    limit. `checks` returns [(config key, identifier)] from the request alone,
+    so throttled requests never reach the database or password hashing.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            retry_after = get_rate_limiter().hit(rules(checks()))
+            if retry_after is not None:
+                return too_many_requests(retry_after)
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
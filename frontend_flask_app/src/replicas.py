@@ -0,0 +1,147 @@
+import math
+import random
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+
+class MemoryStickinessStore:
+    """Users who wrote recently, for this process only (single worker or tests)"""
+
+    def __init__(self):
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id, seconds):
+        now = time.time()
+        with self._lock:
+            if len(self._until) > 10000:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+            self._until[user_id] = now + seconds
+
+    def is_sticky(self, user_id):
+        return self._until.get(user_id, 0) > time.time()
+
+
+class RedisStickinessStore:
+    """Users who wrote recently, shared by all workers through Redis"""
+    key_prefix = 'replica_sticky:'
+
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def mark(self, user_id, seconds):
+        self._client.set(f'{self.key_prefix}{user_id}', 1, ex=max(1, math.ceil(seconds)))
+
+    def is_sticky(self, user_id):
+        return self._client.exists(f'{self.key_prefix}{user_id}') > 0
+
+
+class ReadReplicas:
+    """
+    Read replica binds and the read-your-writes bookkeeping in front of them.
+
+    A user whose request committed a write is pinned to the primary for
+    `sticky_seconds`, long enough for replication to catch up, so their
+    next list or detail request sees what they just changed.
+    """
+
+    def __init__(self, bind_keys, store, sticky_seconds=5):
+        self.bind_keys = bind_keys
+        self.store = store
+        self.sticky_seconds = sticky_seconds
+
+    def choose(self):
+        return random.choice(self.bind_keys)
+
+    def mark_write(self, user_id):
+        self.store.mark(user_id, self.sticky_seconds)
+
+    def is_sticky(self, user_id):
+        return self.store.is_sticky(user_id)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to a read replica during requests that opted
+    in with @read_replica. Flushes, writes, and every statement after this
+    session has written go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[current_app.extensions['read_replicas'].choose()]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        return (
+            has_request_context() and g.get('read_replica', False)
+            and not self._flushing and not self.info.get('wrote')
+            and getattr(clause, 'is_select', False)
+        )
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _flushed(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _executed(orm_execute_state):
+    # Bulk insert/update/delete statements bypass the flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _committed(session):
+    if not session.info.get('wrote') or not has_request_context():
+        return
+    replicas = current_app.extensions.get('read_replicas')
+    user_id = _request_user_id()
+    if replicas is not None and replicas.bind_keys and user_id:
+        replicas.mark_write(user_id)
+
+
+def _request_user_id():
+    """The JWT identity of the current request, None if it carries no verified token"""
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
+
+
+def init_read_replicas(app, bind_keys):
+    """Attach read replica routing for the given binds (none disables it)"""
+    backend = app.config.get('REPLICA_STICKY_STORE', 'memory')
+    if backend == 'redis':
+        store = RedisStickinessStore.from_url(app.config['REDIS_URL'])
+    elif backend == 'fakeredis':
+        import fakeredis
+        store = RedisStickinessStore(fakeredis.FakeRedis())
+    else:
+        store = MemoryStickinessStore()
+    replicas = ReadReplicas(bind_keys, store, sticky_seconds=app.config.get('REPLICA_STICKY_SECONDS', 5))
+    app.extensions['read_replicas'] = replicas
+    return replicas
+
+
+def read_replica(f):
+    """Decorator letting an endpoint read from a replica unless its user wrote within the sticky window"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        replicas = current_app.extensions['read_replicas']
+        if replicas.bind_keys:
+            user_id = _request_user_id()
+            g.read_replica = not (user_id and replicas.is_sticky(user_id))
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,45 @@
+import threading
+from flask import request
+
+
+class ResponseSizeMetrics:
+    """Per-endpoint response body size counters for this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, endpoint, size):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = {'count': 0, 'total_bytes': 0, 'max_bytes': 0}
+            stats['count'] += 1
+            stats['total_bytes'] += size
+            stats['max_bytes'] = max(stats['max_bytes'], size)
+
+    def snapshot(self):
+        """{endpoint: {count, total_bytes, max_bytes, avg_bytes}}"""
+        with self._lock:
+            return {
+                endpoint: dict(stats, avg_bytes=stats['total_bytes'] // stats['count'])
+                for endpoint, stats in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+response_size_metrics = ResponseSizeMetrics()
+
+
+def init_response_metrics(app):
+    """Record the body size of every buffered API response"""
+
+    @app.after_request
+    def record_response_size(response):
+        size = response.calculate_content_length()
+        if request.endpoint and size is not None:
+            response_size_metrics.record(request.endpoint, size)
+        return response
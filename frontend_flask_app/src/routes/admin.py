@@ -1,9 +1,16 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from src.models.user import User
+from sqlalchemy import func
+from src.models.user import User, db
 from src.models.clinic import Clinic
 from src.models.audit import AuditLog, SystemMetric
+from src.models.rollup import ClinicMonthlyRollup, truncate_to, as_bucket
 from src.decorators import super_admin_required
+from src.replicas import read_replica
+from src.audit_partitions import query_audit_range, AUDIT_FILTER_COLUMNS
+from src.pagination import encode_cursor, decode_cursor, parse_utc_timestamp
+from src.response_metrics import response_size_metrics
+from src.phase_timing import login_phase_metrics
 from datetime import datetime, timedelta
 import logging
 
@@ -12,6 +19,7 @@ logger = logging.getLogger(__name__)
 
 @admin_bp.route('/clinics', methods=['GET'])
 @jwt_required()
+@read_replica
 @super_admin_required
 def get_clinics():
     """Get all clinics for super admin"""
@@ -42,9 +50,12 @@ def get_clinics():
             error_out=False
         )
         
+        # Usage for the whole page in one grouped query
+        usage = Clinic.get_usage_stats_bulk([clinic.id for clinic in clinics.items])
+        
         return jsonify({
             'success': True,
-            'clinics': [clinic.to_dict() for clinic in clinics.items],
+            'clinics': [dict(clinic.to_dict(), usage=usage.get(clinic.id)) for clinic in clinics.items],
             'pagination': {
                 'page': page,
                 'pages': clinics.pages,
@@ -180,6 +191,7 @@ def delete_clinic(clinic_id):
 
 @admin_bp.route('/system/metrics', methods=['GET'])
 @jwt_required()
+@read_replica
 @super_admin_required
 def get_system_metrics():
     """Get system-wide metrics"""
@@ -187,7 +199,7 @@ def get_system_metrics():
         # Get current metrics (mock data for now)
         current_metrics = {
             'total_clinics': Clinic.query.count(),
-            'active_clinics': Clinic.query.filter_by(status='active').count(),
+            'active_clinics': Clinic.query.filter_by(is_active=True).count(),
             'total_users': User.query.count(),
             'system_health': 98.5,
             'uptime_percentage': 99.9
@@ -204,7 +216,9 @@ def get_system_metrics():
         return jsonify({
             'success': True,
             'current_metrics': current_metrics,
-            'historical_metrics': [m.to_dict() for m in historical_metrics]
+            'historical_metrics': [m.to_dict() for m in historical_metrics],
+            'response_sizes': response_size_metrics.snapshot(),
+            'login_phases': login_phase_metrics.snapshot()
         })
         
     except Exception as e:
@@ -213,44 +227,43 @@ def get_system_metrics():
 
 @admin_bp.route('/system/logs', methods=['GET'])
 @jwt_required()
+@read_replica
 @super_admin_required
 def get_system_logs():
-    """Get system audit logs"""
+    """
+    Search audit logs, newest first.
+    
+    Filters: action, resource_type, clinic_id, user_id and a start/end
+    ISO-8601 time range. Pages are keyset-paginated: pass the returned
+    next_cursor back as `after` to get the following page.
+    """
     try:
-        page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 50, type=int)
-        level = request.args.get('level', '')
-        category = request.args.get('category', '')
-        clinic_id = request.args.get('clinic_id', '')
+        per_page = max(1, min(per_page, current_app.config['MAX_PAGE_SIZE']))
+        filters = {column: request.args.get(column) for column in AUDIT_FILTER_COLUMNS}
         
-        query = AuditLog.query
+        try:
+            start = parse_utc_timestamp(request.args['start']) if request.args.get('start') else None
+            end = parse_utc_timestamp(request.args['end']) if request.args.get('end') else None
+            after = request.args.get('after')
+            before = decode_cursor(after) if after else None
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
-        # Apply filters
-        if level:
-            query = query.filter(AuditLog.level == level)
-        if category:
-            query = query.filter(AuditLog.category == category)
-        if clinic_id:
-            query = query.filter(AuditLog.clinic_id == clinic_id)
+        rows = query_audit_range(start=start, end=end, limit=per_page + 1, before=before, **filters)
         
-        # Order by timestamp
-        query = query.order_by(AuditLog.timestamp.desc())
-        
-        # Paginate
-        logs = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
         
         return jsonify({
             'success': True,
-            'logs': [log.to_dict() for log in logs.items],
+            'logs': [AuditLog.row_to_dict(row) for row in rows],
             'pagination': {
-                'page': page,
-                'pages': logs.pages,
                 'per_page': per_page,
-                'total': logs.total
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
             }
         })
         
@@ -260,6 +273,7 @@ def get_system_logs():
 
 @admin_bp.route('/users', methods=['GET'])
 @jwt_required()
+@read_replica
 @super_admin_required
 def get_all_users():
     """Get all users across all clinics"""
@@ -310,34 +324,68 @@ def get_all_users():
 
 @admin_bp.route('/analytics/usage', methods=['GET'])
 @jwt_required()
+@read_replica
 @super_admin_required
 def get_usage_analytics():
     """Get usage analytics across all clinics"""
     try:
-        days = request.args.get('days', 30, type=int)
-        start_date = datetime.utcnow() - timedelta(days=days)
+        months = max(1, min(request.args.get('months', 6, type=int), 24))
+        now = datetime.utcnow()
+        
+        # First day of the oldest month in the window
+        year, month = now.year, now.month - (months - 1)
+        while month < 1:
+            year, month = year - 1, month + 12
+        window_start = datetime(year, month, 1)
+        
+        # Call/message volumes come from the monthly per-clinic rollups, so the
+        # cost grows with clinics x months instead of with calls and messages
+        totals = ClinicMonthlyRollup.grand_totals()
+        monthly = {}
+        for month_start, metric, total in ClinicMonthlyRollup.totals_by_month(window_start):
+            monthly.setdefault(month_start, {})[metric] = int(total or 0)
+        
+        # Clinics are few, so growth and plan mix are grouped straight from the table
+        clinic_month = truncate_to(Clinic.created_at, 'month')
+        new_clinics = {
+            as_bucket(month_start): count for month_start, count in
+            db.session.query(clinic_month, func.count(Clinic.id)).group_by(clinic_month).all()
+            if month_start
+        }
+        clinics_before_window = sum(count for month_start, count in new_clinics.items() if month_start < window_start)
+        
+        plan_counts = dict(
+            db.session.query(Clinic.subscription_plan, func.count(Clinic.id))
+            .filter(Clinic.is_active == True)
+            .group_by(Clinic.subscription_plan).all()
+        )
+        active_clinics = sum(plan_counts.values())
+        
+        monthly_growth = []
+        running_clinics = clinics_before_window
+        month_start = window_start
+        for _ in range(months):
+            running_clinics += new_clinics.get(month_start, 0)
+            volumes = monthly.get(month_start, {})
+            monthly_growth.append({
+                'month': month_start.strftime('%b'),
+                'month_start': month_start.isoformat(),
+                'clinics': running_clinics,
+                'calls': volumes.get(ClinicMonthlyRollup.CALLS, 0),
+                'messages': volumes.get(ClinicMonthlyRollup.MESSAGES, 0)
+            })
+            month_start = datetime(month_start.year + month_start.month // 12, month_start.month % 12 + 1, 1)
         
-        # This would typically involve complex queries across multiple tables
-        # For now, return mock data structure
         analytics = {
-            'total_calls': 15420,
-            'total_messages': 28950,
-            'active_clinics': 24,
-            'total_users': 156,
+            'total_calls': int(totals.get(ClinicMonthlyRollup.CALLS) or 0),
+            'total_messages': int(totals.get(ClinicMonthlyRollup.MESSAGES) or 0),
+            'active_clinics': active_clinics,
+            'total_users': User.query.count(),
             'subscription_distribution': {
-                'Premium': 45,
-                'Standard': 35,
-                'Basic': 15,
-                'Trial': 5
-            },
-            'monthly_growth': [
-                {'month': 'Jul', 'clinics': 18, 'calls': 12450, 'messages': 23400},
-                {'month': 'Aug', 'clinics': 19, 'calls': 15600, 'messages': 28900},
-                {'month': 'Sep', 'clinics': 21, 'calls': 18200, 'messages': 34500},
-                {'month': 'Oct', 'clinics': 22, 'calls': 21300, 'messages': 41200},
-                {'month': 'Nov', 'clinics': 23, 'calls': 24800, 'messages': 47800},
-                {'month': 'Dec', 'clinics': 24, 'calls': 28900, 'messages': 52300}
-            ]
+                (plan or 'unknown').title(): round(count / active_clinics * 100, 1)
+                for plan, count in plan_counts.items()
+            } if active_clinics else {},
+            'monthly_growth': monthly_growth
         }
         
         return jsonify({
@@ -1,15 +1,40 @@
-from flask import Blueprint, request, jsonify, g
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
+from flask import Blueprint, request, jsonify, g, make_response
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token, jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime
 from src.models.user import User, db
 from src.models.clinic import Clinic
 from src.models.audit import AuditLog
+from src.identity import load_current_user, build_identity_claims
+from src.token_blocklist import revoke_token
+from src.passwords import PasswordHashingBusy
+from src.phase_timing import PhaseTimer, login_phase_metrics
+from src.rate_limit import rate_limited, rules, get_rate_limiter
 
 auth_bp = Blueprint('auth', __name__)
 
+def _login_rate_limit_keys():
+    """Login rate limit keys, read from the request body without touching the database"""
+    data = request.get_json(silent=True) or {}
+    clinic_name = str(data.get('clinic_name') or '').strip().lower()
+    username = str(data.get('username') or '').strip().lower()
+    return [
+        ('RATELIMIT_LOGIN_PER_IP', request.remote_addr),
+        ('RATELIMIT_LOGIN_PER_CLINIC', clinic_name),
+        ('RATELIMIT_LOGIN_PER_USER', username and f'{clinic_name}:{username}')
+    ]
+
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited(_login_rate_limit_keys)
 def login():
-    """Authenticate user and return JWT tokens"""
+    """Authenticate user and return JWT tokens (per-phase timings in Server-Timing)"""
+    timer = PhaseTimer()
+    response = make_response(_authenticate(timer))
+    if timer.phases:
+        login_phase_metrics.record(timer)
+        response.headers['Server-Timing'] = timer.server_timing()
+    return response
+
+def _authenticate(timer):
     data = request.get_json()
     
     if not data:
@@ -23,41 +48,37 @@ def login():
         return jsonify({'error': 'Clinic name, username, and password are required'}), 400
     
     try:
+        # Accounts that reached the failed-login limit are turned away before
+        # any lookup or password hashing
+        limiter = get_rate_limiter()
+        failures = rules([('RATELIMIT_LOGIN_FAILURES_PER_USER', f'{clinic_name.lower()}:{username.lower()}')])
+        # Super admin failures count per username, whatever clinic name is sent
+        super_admin_attempt = username == 'craft_admin' or clinic_name.lower() == 'craft ai'
+        if super_admin_attempt:
+            admin_failures = rules([('RATELIMIT_LOGIN_FAILURES_PER_USER', f'super_admin:{username.lower()}')])
+        else:
+            admin_failures = []
+        retry_after = limiter.exceeded(failures + admin_failures)
+        if retry_after is not None:
+            return jsonify({'error': 'Account is temporarily locked due to failed login attempts'}), 423, {'Retry-After': str(retry_after)}
+        
         # Handle super admin login (no clinic required)
-        if username == 'craft_admin' or clinic_name.lower() == 'craft ai':
-            user = User.query.filter_by(username=username, role='super_admin').first()
-            if user and user.check_password(password):
+        if super_admin_attempt:
+            with timer.phase('lookup'):
+                user = User.query.filter_by(clinic_id=None, username=username, role='super_admin').first()
+            with timer.phase('verify'):
+                verified = user is not None and user.check_password(password)
+            if verified:
                 if user.is_locked():
                     return jsonify({'error': 'Account is temporarily locked'}), 423
                 
-                # Create tokens for super admin
-                access_token = create_access_token(
-                    identity=user.id,
-                    additional_claims={
-                        'clinic_id': None,
-                        'role': user.role,
-                        'permissions': user.permissions or []
-                    }
-                )
-                refresh_token = create_refresh_token(identity=user.id)
-                
-                # Reset failed login attempts and log successful login
-                user.reset_failed_login()
-                AuditLog.log_login(
-                    user_id=user.id,
-                    ip_address=request.remote_addr,
-                    user_agent=request.headers.get('User-Agent')
-                )
-                
-                return jsonify({
-                    'access_token': access_token,
-                    'refresh_token': refresh_token,
-                    'user': user.to_dict(),
-                    'clinic': None
-                }), 200
+                return jsonify(_complete_login(user, None, password, timer, failures + admin_failures)), 200
+            # Count the failure before trying the name as a clinic login
+            _record_failed_login(limiter, admin_failures, user)
         
-        # Find clinic by name
-        clinic = Clinic.query.filter_by(name=clinic_name, is_active=True).first()
+        # Find the active clinic and its user in one query
+        with timer.phase('lookup'):
+            clinic, user = User.find_for_login(clinic_name, username)
         if not clinic:
             return jsonify({'error': 'Clinic not found or inactive'}), 404
         
@@ -65,59 +86,84 @@ def login():
         if not clinic.is_subscription_active():
             return jsonify({'error': 'Clinic subscription is not active'}), 403
         
-        # Find user in clinic
-        user = User.query.filter_by(
-            clinic_id=clinic.id,
-            username=username,
-            is_active=True
-        ).first()
-        
-        if not user or not user.check_password(password):
-            # Log failed login attempt
-            if user:
-                user.increment_failed_login()
+        with timer.phase('verify'):
+            verified = user is not None and user.check_password(password)
+        if not verified:
+            _record_failed_login(limiter, failures, user)
             return jsonify({'error': 'Invalid username or password'}), 401
         
         if user.is_locked():
             return jsonify({'error': 'Account is temporarily locked due to failed login attempts'}), 423
         
-        # Create JWT tokens
+        return jsonify(_complete_login(user, clinic, password, timer, failures + admin_failures)), 200
+        
+    except PasswordHashingBusy:
+        return jsonify({'error': 'Too many login attempts in progress, please retry'}), 503
+    except Exception as e:
+        return jsonify({'error': 'Login failed', 'details': str(e)}), 500
+
+def _record_failed_login(limiter, failures, user):
+    """
+    Count a failed password in the rate limit store; the account lock is
+    written to the database once, when the limit is reached
+    """
+    if limiter.record(failures) is not None and user:
+        failure_limit, _ = failures[0]
+        user.lock_after_failed_logins(failure_limit.limit, failure_limit.window)
+
+def _complete_login(user, clinic, password, timer, failures):
+    """Issue tokens and record a verified login in a single transaction"""
+    clinic_id = clinic.id if clinic else None
+    
+    with timer.phase('verify'):
+        # Upgrade a hash made with old parameters before the token claims
+        # snapshot the identity version
+        user.rehash_password_if_needed(password)
+    
+    with timer.phase('tokens'):
+        refresh_token = create_refresh_token(identity=user.id)
+        # The access token names its refresh token so logout can revoke both
         access_token = create_access_token(
             identity=user.id,
             additional_claims={
-                'clinic_id': clinic.id,
-                'role': user.role,
-                'permissions': user.permissions or []
+                **build_identity_claims(user, clinic_id),
+                'refresh_jti': decode_token(refresh_token)['jti']
             }
         )
-        refresh_token = create_refresh_token(identity=user.id)
-        
-        # Reset failed login attempts and log successful login
-        user.reset_failed_login()
+    
+    with timer.phase('commit'):
+        # Reset failed login attempts and log the login together; the body
+        # is built after the flush so the commit does not expire what it reads
+        user.reset_failed_login(commit=False)
         AuditLog.log_login(
             user_id=user.id,
-            clinic_id=clinic.id,
+            clinic_id=clinic_id,
             ip_address=request.remote_addr,
-            user_agent=request.headers.get('User-Agent')
+            user_agent=request.headers.get('User-Agent'),
+            commit=False
         )
-        
-        return jsonify({
+        db.session.flush()
+        body = {
             'access_token': access_token,
             'refresh_token': refresh_token,
             'user': user.to_dict(),
-            'clinic': clinic.to_dict()
-        }), 200
-        
-    except Exception as e:
-        return jsonify({'error': 'Login failed', 'details': str(e)}), 500
+            'clinic': clinic.to_dict() if clinic else None
+        }
+        db.session.commit()
+    # Like the database counter, failed passwords only add up between good logins
+    get_rate_limiter().reset(failures)
+    return body
 
 @auth_bp.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
+@rate_limited(lambda: [
+    ('RATELIMIT_REFRESH_PER_IP', request.remote_addr),
+    ('RATELIMIT_REFRESH_PER_USER', get_jwt_identity())
+])
 def refresh():
     """Refresh access token using refresh token"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         
         if not user or not user.is_active:
             return jsonify({'error': 'User not found or inactive'}), 404
@@ -133,9 +179,8 @@ def refresh():
         access_token = create_access_token(
             identity=user.id,
             additional_claims={
-                'clinic_id': clinic.id if clinic else None,
-                'role': user.role,
-                'permissions': user.permissions or []
+                **build_identity_claims(user, clinic.id if clinic else None),
+                'refresh_jti': get_jwt()['jti']
             }
         )
         
@@ -151,14 +196,11 @@ def refresh():
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
-    """Logout user and blacklist token"""
+    """Logout user and blacklist the access token and the refresh token it came with"""
     try:
-        current_user_id = get_jwt_identity()
-        jti = get_jwt()['jti']
+        revoke_token(get_jwt())
         
-        # In production, add jti to Redis blacklist
-        # For now, we'll just log the logout
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         if user:
             AuditLog.log_logout(
                 user_id=user.id,
@@ -177,8 +219,7 @@ def logout():
 def get_current_user():
     """Get current user information"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -201,8 +242,7 @@ def get_current_user():
 def change_password():
     """Change user password"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -225,7 +265,7 @@ def change_password():
         db.session.commit()
         
         # Log password change
-        AuditLog.log_action(
+        AuditLog.queue_action(
             action='update',
             resource_type='user',
             resource_id=user.id,
@@ -1,19 +1,24 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
 from src.models.call import Call
 from src.models.clinic import Clinic
-from src.models.user import User
 from src.decorators import same_clinic_required
+from src.replicas import read_replica
+from src.identity import load_identity
+from src.pagination import keyset_paginate, InvalidCursor
+from src.serializers import CALL_SERIALIZER, InvalidFields, json_response
+from src.call_search import search_calls
+from src.phone import phone_filter
 
 calls_bp = Blueprint("calls", __name__)
 
 @calls_bp.route("/", methods=["GET"])
 @jwt_required()
+@read_replica
 @same_clinic_required
-def get_calls():
+def get_calls(clinic_id=None):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_identity()
         
         if not user:
             return jsonify({"message": "User not found"}), 404
@@ -26,6 +31,37 @@ def get_calls():
         call_type = request.args.get("call_type", None)
         search_query = request.args.get("search", None)
 
+        try:
+            plan = CALL_SERIALIZER.plan(request.args.get("fields"))
+        except InvalidFields as e:
+            return jsonify({"message": str(e)}), 400
+
+        # Full-text search over contact name, AI summary and transcript,
+        # ranked by relevance instead of time
+        q = request.args.get("q", None)
+        if q:
+            per_page = max(1, min(per_page, current_app.config["MAX_PAGE_SIZE"]))
+            hits = search_calls(
+                clinic_id, q, limit=per_page + 1, offset=(max(page, 1) - 1) * per_page,
+                direction=direction, call_type=call_type
+            )
+            has_more = len(hits) > per_page
+            hits = hits[:per_page]
+
+            rows = plan.apply(Call.query.filter(Call.id.in_([hit.id for hit in hits]))).all()
+            calls_by_id = {row.id: row for row in rows}
+            calls = plan.serialize([calls_by_id[hit.id] for hit in hits])
+            for call, hit in zip(calls, hits):
+                call["search"] = {
+                    "rank": hit.rank,
+                    "highlights": {
+                        "transcript": hit.transcript_highlight,
+                        "ai_summary": hit.ai_summary_highlight
+                    }
+                }
+
+            return json_response({"calls": calls, "current_page": page, "has_more": has_more}, 200)
+
         query = Call.query.filter_by(clinic_id=clinic_id)
 
         if direction:
@@ -34,28 +70,57 @@ def get_calls():
             query = query.filter_by(call_type=call_type)
         if search_query:
             query = query.filter(Call.phone_number.ilike(f"%{search_query}%") | Call.contact_name.ilike(f"%{search_query}%"))
-
-        calls = query.order_by(Call.started_at.desc()).paginate(
+        # Indexed phone lookup: exact for +E.164 input, otherwise "ends with these digits"
+        phone = request.args.get("phone", None)
+        if phone:
+            clause = phone_filter(Call.phone_e164, Call.phone_reversed, phone)
+            if clause is None:
+                return jsonify({"message": "phone must contain at least 4 digits"}), 400
+            query = query.filter(clause)
+
+        # Cursor mode: seek on (started_at, id) instead of OFFSET and only
+        # count the total when the client explicitly asks for it
+        after = request.args.get("after", None)
+        if after is not None or request.args.get("pagination") == "cursor":
+            per_page = max(1, min(per_page, current_app.config["MAX_PAGE_SIZE"]))
+            try:
+                calls, next_cursor = keyset_paginate(
+                    plan.apply(query), Call.started_at, Call.id, per_page, after=after
+                )
+            except InvalidCursor as e:
+                return jsonify({"message": str(e)}), 400
+
+            response = {
+                "calls": plan.serialize(calls),
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None
+            }
+            if request.args.get("include_total", "false").lower() == "true":
+                response["total_calls"] = query.order_by(None).count()
+
+            return json_response(response, 200)
+
+        calls = plan.apply(query).order_by(Call.started_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
 
-        return jsonify({
-            "calls": [call.to_dict() for call in calls.items],
+        return json_response({
+            "calls": plan.serialize(calls.items),
             "total_pages": calls.pages,
             "current_page": calls.page,
             "total_calls": calls.total
-        }), 200
+        }, 200)
 
     except Exception as e:
         return jsonify({"message": "Error fetching calls", "error": str(e)}), 500
 
 @calls_bp.route("/<call_id>", methods=["GET"])
 @jwt_required()
+@read_replica
 @same_clinic_required
-def get_call_details(call_id):
+def get_call_details(call_id, clinic_id=None):
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_identity()
         
         if not user:
             return jsonify({"message": "User not found"}), 404
@@ -75,7 +140,7 @@ def get_call_details(call_id):
 @calls_bp.route("/types", methods=["GET"])
 @jwt_required()
 @same_clinic_required
-def get_call_types():
+def get_call_types(clinic_id=None):
     # This is a placeholder. In a real app, call types might come from a config or a dedicated table.
     # For now, we'll return a static list of common call types.
     call_types = [
@@ -0,0 +1,51 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from src.decorators import same_clinic_required
+from src.pagination import InvalidCursor
+from src.phone import to_e164
+from src.serializers import json_response
+from src.contact_timeline import timeline_page, TIMELINE_KINDS
+
+contacts_bp = Blueprint('contacts', __name__)
+
+
+@contacts_bp.route('/<phone>/timeline', methods=['GET'])
+@jwt_required()
+@same_clinic_required
+def get_contact_timeline(phone, clinic_id=None):
+    """Everything that happened with one phone number, newest first, keyset-paginated via `after`"""
+    try:
+        # Super admins are not bound to a clinic and must pick one
+        clinic_id = clinic_id or request.args.get('clinic_id')
+        if not clinic_id:
+            return jsonify({'success': False, 'message': 'clinic_id is required'}), 400
+        
+        e164 = to_e164(phone)
+        if e164 is None:
+            return jsonify({'success': False, 'message': 'Invalid phone number'}), 400
+        
+        kinds = TIMELINE_KINDS
+        if request.args.get('types'):
+            kinds = tuple(kind.strip() for kind in request.args['types'].split(',') if kind.strip())
+            unknown = [kind for kind in kinds if kind not in TIMELINE_KINDS]
+            if unknown:
+                return jsonify({'success': False, 'message': f"Unknown types: {', '.join(unknown)}"}), 400
+        
+        per_page = request.args.get('per_page', current_app.config['DEFAULT_PAGE_SIZE'], type=int)
+        per_page = max(1, min(per_page, current_app.config['MAX_PAGE_SIZE']))
+        
+        try:
+            events, next_cursor = timeline_page(clinic_id, e164, per_page, after=request.args.get('after'), kinds=kinds)
+        except InvalidCursor as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        
+        return json_response({
+            'success': True,
+            'phone_number': e164,
+            'events': events,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }, 200)
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': 'Failed to fetch contact timeline', 'error': str(e)}), 500
@@ -0,0 +1,90 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from datetime import datetime, timedelta
+from collections import defaultdict
+from src.models.rollup import ClinicHourlyRollup
+from src.decorators import same_clinic_required
+from src.replicas import read_replica
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+SUMMARY_METRICS = [
+    ClinicHourlyRollup.CALLS,
+    ClinicHourlyRollup.CALL_DURATION,
+    ClinicHourlyRollup.MESSAGES,
+    ClinicHourlyRollup.APPOINTMENTS
+]
+
+
+def percent_change(current, previous):
+    """Percentage change from previous to current, rounded to one decimal"""
+    if not previous:
+        return 100.0 if current else 0.0
+    return round((current - previous) / previous * 100, 1)
+
+
+@dashboard_bp.route('/summary', methods=['GET'])
+@jwt_required()
+@read_replica
+@same_clinic_required
+def get_summary(clinic_id=None):
+    """
+    Today's calls, messages and appointments for the clinic dashboard.
+
+    Everything is read from the hourly rollups for yesterday and today, so the
+    cost is bounded by the number of buckets rather than the number of rows.
+    Calls and messages are compared with yesterday up to the same hour;
+    appointments are compared over whole days.
+    """
+    try:
+        # Super admins are not bound to a clinic and must pick one
+        clinic_id = clinic_id or request.args.get('clinic_id')
+        if not clinic_id:
+            return jsonify({'success': False, 'message': 'clinic_id is required'}), 400
+
+        now = datetime.utcnow()
+        today = datetime(now.year, now.month, now.day)
+        yesterday = today - timedelta(days=1)
+        same_time_yesterday = ClinicHourlyRollup.bucket_for(now) - timedelta(days=1)
+
+        today_totals = defaultdict(int)
+        yesterday_totals = defaultdict(int)
+        breakdowns = defaultdict(lambda: defaultdict(int))
+        hourly = [{'time': f'{hour:02d}:00', 'calls': 0, 'duration': 0} for hour in range(24)]
+
+        for metric, bucket_start, dimension, value in ClinicHourlyRollup.get_buckets(
+            clinic_id, SUMMARY_METRICS, yesterday, today + timedelta(days=1)
+        ):
+            if bucket_start >= today:
+                today_totals[metric] += value
+                if metric == ClinicHourlyRollup.CALLS:
+                    hourly[bucket_start.hour]['calls'] += value
+                elif metric == ClinicHourlyRollup.CALL_DURATION:
+                    hourly[bucket_start.hour]['duration'] += value
+                if dimension and value:
+                    breakdowns[metric][dimension] += value
+            elif metric == ClinicHourlyRollup.APPOINTMENTS or bucket_start <= same_time_yesterday:
+                yesterday_totals[metric] += value
+
+        stats = {}
+        for key, metric in [
+            ('calls', ClinicHourlyRollup.CALLS),
+            ('messages', ClinicHourlyRollup.MESSAGES),
+            ('appointments', ClinicHourlyRollup.APPOINTMENTS)
+        ]:
+            stats[f'today_{key}'] = today_totals[metric]
+            stats[f'yesterday_{key}'] = yesterday_totals[metric]
+            stats[f'{key}_change'] = percent_change(today_totals[metric], yesterday_totals[metric])
+
+        return jsonify({
+            'success': True,
+            'stats': stats,
+            'hourly_calls': hourly,
+            'call_status': dict(breakdowns[ClinicHourlyRollup.CALLS]),
+            'message_senders': dict(breakdowns[ClinicHourlyRollup.MESSAGES]),
+            'appointment_status': dict(breakdowns[ClinicHourlyRollup.APPOINTMENTS]),
+            'generated_at': now.isoformat()
+        }), 200
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': 'Failed to fetch dashboard summary', 'error': str(e)}), 500
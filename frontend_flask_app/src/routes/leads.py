@@ -0,0 +1,127 @@
+import os
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from src.models.user import db
+from src.models.lead import Lead, LeadImportJob
+from src.decorators import clinic_admin_required, same_clinic_required
+from src.pagination import keyset_paginate, InvalidCursor
+from src.serializers import LEAD_SERIALIZER, InvalidFields, json_response
+from src.phone import phone_filter
+from src import lead_import
+
+leads_bp = Blueprint('leads', __name__)
+
+
+@leads_bp.route('/', methods=['GET'])
+@jwt_required()
+@same_clinic_required
+def get_leads(clinic_id=None):
+    """List the clinic's leads, newest first, keyset-paginated via `after` (`fields=` projects, `phone=` matches)"""
+    try:
+        # Super admins are not bound to a clinic and must pick one
+        clinic_id = clinic_id or request.args.get('clinic_id')
+        if not clinic_id:
+            return jsonify({'success': False, 'message': 'clinic_id is required'}), 400
+        
+        per_page = request.args.get('per_page', current_app.config['DEFAULT_PAGE_SIZE'], type=int)
+        per_page = max(1, min(per_page, current_app.config['MAX_PAGE_SIZE']))
+        
+        query = Lead.query.filter_by(clinic_id=clinic_id)
+        for column in ('status', 'priority', 'assigned_to'):
+            if request.args.get(column):
+                query = query.filter(getattr(Lead, column) == request.args[column])
+        if request.args.get('phone'):
+            clause = phone_filter(Lead.phone_e164, Lead.phone_reversed, request.args['phone'])
+            if clause is None:
+                return jsonify({'success': False, 'message': 'phone must contain at least 4 digits'}), 400
+            query = query.filter(clause)
+        
+        try:
+            plan = LEAD_SERIALIZER.plan(request.args.get('fields'))
+            leads, next_cursor = keyset_paginate(
+                plan.apply(query), Lead.created_at, Lead.id, per_page, after=request.args.get('after')
+            )
+        except (InvalidFields, InvalidCursor) as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        
+        return json_response({
+            'success': True,
+            'leads': plan.serialize(leads),
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
+        }, 200)
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': 'Failed to fetch leads', 'error': str(e)}), 500
+
+
+@leads_bp.route('/import', methods=['POST'])
+@jwt_required()
+@clinic_admin_required
+@same_clinic_required
+def import_leads(clinic_id=None):
+    """
+    Upload a CSV/XLSX of leads and import it in the background.
+
+    Accepts either a multipart 'file' field or the raw file as the request
+    body (with ?filename=). The upload is copied to disk in chunks and a
+    pollable import job is returned with 202.
+    """
+    try:
+        # Super admins are not bound to a clinic and must pick one
+        clinic_id = clinic_id or request.args.get('clinic_id')
+        if not clinic_id:
+            return jsonify({'success': False, 'message': 'clinic_id is required'}), 400
+        
+        request.max_content_length = current_app.config['LEAD_IMPORT_MAX_CONTENT_LENGTH']
+        
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if not upload:
+                return jsonify({'success': False, 'message': 'file is required'}), 400
+            filename, stream = upload.filename, upload.stream
+        else:
+            filename, stream = request.args.get('filename', 'leads.csv'), request.stream
+        
+        file_format = 'xlsx' if (filename or '').lower().endswith('.xlsx') else 'csv'
+        if file_format == 'xlsx' and lead_import.openpyxl is None:
+            return jsonify({'success': False, 'message': 'XLSX imports are not available on this server'}), 400
+        
+        job = LeadImportJob(
+            clinic_id=clinic_id,
+            created_by=get_jwt_identity(),
+            filename=filename,
+            file_format=file_format
+        )
+        db.session.add(job)
+        db.session.commit()
+        
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        os.makedirs(upload_folder, exist_ok=True)
+        path = os.path.join(upload_folder, f'lead-import-{job.id}.{file_format}')
+        job.bytes_total = lead_import.save_upload(stream, path)
+        db.session.commit()
+        
+        lead_import.start_import(current_app._get_current_object(), job.id, path)
+        
+        return jsonify({'success': True, 'job': job.to_dict()}), 202
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'Failed to start lead import', 'error': str(e)}), 500
+
+
+@leads_bp.route('/import/<job_id>', methods=['GET'])
+@jwt_required()
+@same_clinic_required
+def get_import_job(job_id, clinic_id=None):
+    """Poll the progress of a lead import job"""
+    query = LeadImportJob.query.filter_by(id=job_id)
+    if clinic_id:
+        query = query.filter_by(clinic_id=clinic_id)
+    job = query.first()
+    
+    if not job:
+        return jsonify({'success': False, 'message': 'Import job not found'}), 404
+    
+    return jsonify({'success': True, 'job': job.to_dict()}), 200
@@ -0,0 +1,238 @@
+import json
+from flask import current_app
+from src.models.user import User
+from src.models.call import Call, format_duration
+from src.models.lead import Lead, LEAD_STATUS_COLORS, LEAD_PRIORITY_COLORS, can_call
+from src.models.whatsapp import WhatsAppMessage, SENDER_COLORS
+from src.models.appointment import (
+    Appointment, APPOINTMENT_STATUS_COLORS, CONFIRMATION_COLORS, is_upcoming, is_overdue
+)
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speed-up
+    orjson = None
+
+
+class InvalidFields(ValueError):
+    """Raised when a `fields=` projection names unknown fields"""
+
+
+class Field:
+    """One output key computed from one or more selected columns"""
+
+    __slots__ = ('name', 'columns', 'convert', 'join')
+
+    def __init__(self, name, *columns, convert=None, join=None):
+        self.name = name
+        self.columns = columns
+        self.convert = convert
+        self.join = join
+
+
+def color(table):
+    """Field converter looking a value up in a module-level color table"""
+    return lambda value: table.get(value, '#6b7280')
+
+
+class RowSerializer:
+    """
+    Serialize list pages from plain row tuples instead of ORM objects.
+
+    A serializer is built once per resource from Field definitions. plan()
+    resolves a `fields=` projection into the columns to select (plus the
+    `always` columns pagination needs) and the converters to run, so a page
+    is one narrow SELECT and a tight loop over tuples: no identity map, no
+    lazy loads, no per-row dict rebuilding.
+    """
+
+    def __init__(self, fields, always=(), detail_only=()):
+        self.fields = {field.name: field for field in fields}
+        self.always = always
+        # Heavy fields that list pages leave out unless asked for by name
+        self.detail_only = detail_only
+
+    def plan(self, fields=None):
+        """Build a SerializationPlan for a comma-separated field list (None = default list fields)"""
+        if fields:
+            names = [name.strip() for name in fields.split(',') if name.strip()]
+            unknown = [name for name in names if name not in self.fields]
+            if unknown:
+                raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+        else:
+            names = [name for name in self.fields if name not in self.detail_only]
+        return SerializationPlan([self.fields[name] for name in names], self.always)
+
+
+class SerializationPlan:
+    """Columns, joins and converters for one resolved field projection"""
+
+    def __init__(self, fields, always):
+        self.columns = []
+        self.joins = []
+        self._positions = {}
+        self._primary = {column.class_ for column in always}
+
+        for column in always:
+            self._position(column)
+
+        self.plain = []
+        self.converted = []
+        for field in fields:
+            indices = [self._position(column) for column in field.columns]
+            if field.join is not None and field.join not in self.joins:
+                self.joins.append(field.join)
+            if field.convert is None and len(indices) == 1:
+                self.plain.append((field.name, indices[0]))
+            else:
+                self.converted.append((field.name, indices, field.convert))
+
+    def _position(self, column):
+        """Index of `column` in the selected tuple, adding it on first use"""
+        key = (column.class_, column.key)
+        if key not in self._positions:
+            self._positions[key] = len(self.columns)
+            # Joined columns are prefixed so they never shadow the primary
+            # model's columns that keyset pagination reads back by name
+            if column.class_ in self._primary:
+                label = column.key
+            else:
+                label = f'{column.class_.__name__.lower()}_{column.key}'
+            self.columns.append(column.label(label))
+        return self._positions[key]
+
+    def apply(self, query):
+        """Narrow an ORM query to this plan's columns and outer joins"""
+        query = query.with_entities(*self.columns)
+        for target, onclause in self.joins:
+            query = query.outerjoin(target, onclause)
+        return query
+
+    def serialize(self, rows):
+        """Turn selected row tuples into response dicts"""
+        plain, converted = self.plain, self.converted
+        items = []
+        for row in rows:
+            item = {name: row[index] for name, index in plain}
+            for name, indices, convert in converted:
+                item[name] = convert(*[row[index] for index in indices])
+            items.append(item)
+        return items
+
+
+def _default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload):
+    """Encode to JSON bytes with orjson when installed; datetimes become ISO-8601"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    return current_app.response_class(dumps(payload), status=status, mimetype='application/json')
+
+
+CALL_SERIALIZER = RowSerializer([
+    Field('id', Call.id),
+    Field('clinic_id', Call.clinic_id),
+    Field('external_call_id', Call.external_call_id),
+    Field('call_type', Call.call_type),
+    Field('direction', Call.direction),
+    Field('phone_number', Call.phone_number),
+    Field('contact_name', Call.contact_name),
+    Field('lead_id', Call.lead_id),
+    Field('status', Call.status),
+    Field('duration_seconds', Call.duration_seconds),
+    Field('duration_formatted', Call.duration_seconds, convert=format_duration),
+    Field('recording_url', Call.recording_url),
+    Field('transcript', Call.transcript),
+    Field('ai_summary', Call.ai_summary),
+    Field('started_at', Call.started_at),
+    Field('ended_at', Call.ended_at),
+    Field('created_at', Call.created_at),
+    Field('updated_at', Call.updated_at)
+], always=(Call.id, Call.started_at), detail_only=Call.DETAIL_ONLY_FIELDS)
+
+LEAD_SERIALIZER = RowSerializer([
+    Field('id', Lead.id),
+    Field('clinic_id', Lead.clinic_id),
+    Field('phone_number', Lead.phone_number),
+    Field('name', Lead.name),
+    Field('email', Lead.email),
+    Field('status', Lead.status),
+    Field('priority', Lead.priority),
+    Field('source', Lead.source),
+    Field('notes', Lead.notes),
+    Field('metadata', Lead.lead_metadata),
+    Field('last_contacted_at', Lead.last_contacted_at),
+    Field('next_contact_at', Lead.next_contact_at),
+    Field('assigned_to', Lead.assigned_to),
+    Field('assigned_user_name', User.username, join=(User, Lead.assigned_to == User.id)),
+    Field('call_attempts', Lead.call_attempts),
+    Field('max_call_attempts', Lead.max_call_attempts),
+    Field('do_not_call', Lead.do_not_call),
+    Field('do_not_call_reason', Lead.do_not_call_reason),
+    Field('status_color', Lead.status, convert=color(LEAD_STATUS_COLORS)),
+    Field('priority_color', Lead.priority, convert=color(LEAD_PRIORITY_COLORS)),
+    Field('can_call', Lead.do_not_call, Lead.call_attempts, Lead.max_call_attempts, Lead.status, convert=can_call),
+    Field('created_at', Lead.created_at),
+    Field('updated_at', Lead.updated_at)
+], always=(Lead.id, Lead.created_at))
+
+MESSAGE_SERIALIZER = RowSerializer([
+    Field('id', WhatsAppMessage.id),
+    Field('conversation_id', WhatsAppMessage.conversation_id),
+    Field('external_message_id', WhatsAppMessage.external_message_id),
+    Field('sender_type', WhatsAppMessage.sender_type),
+    Field('sender_name', WhatsAppMessage.sender_name),
+    Field('sender_phone', WhatsAppMessage.sender_phone),
+    Field('message_type', WhatsAppMessage.message_type),
+    Field('content', WhatsAppMessage.content),
+    Field('media_url', WhatsAppMessage.media_url),
+    Field('media_type', WhatsAppMessage.media_type),
+    Field('media_filename', WhatsAppMessage.media_filename),
+    Field('status', WhatsAppMessage.status),
+    Field('is_read', WhatsAppMessage.is_read),
+    Field('read_at', WhatsAppMessage.read_at),
+    Field('delivered_at', WhatsAppMessage.delivered_at),
+    Field('failed_reason', WhatsAppMessage.failed_reason),
+    Field('metadata', WhatsAppMessage.message_metadata, convert=lambda value: value or {}),
+    Field('sent_at', WhatsAppMessage.sent_at),
+    Field('created_at', WhatsAppMessage.created_at),
+    Field('sender_color', WhatsAppMessage.sender_type, convert=color(SENDER_COLORS))
+], always=(WhatsAppMessage.id, WhatsAppMessage.sent_at))
+
+APPOINTMENT_SERIALIZER = RowSerializer([
+    Field('id', Appointment.id),
+    Field('clinic_id', Appointment.clinic_id),
+    Field('patient_name', Appointment.patient_name),
+    Field('patient_phone', Appointment.patient_phone),
+    Field('patient_email', Appointment.patient_email),
+    Field('appointment_type', Appointment.appointment_type),
+    Field('appointment_date', Appointment.appointment_date),
+    Field('duration_minutes', Appointment.duration_minutes),
+    Field('status', Appointment.status),
+    Field('confirmation_status', Appointment.confirmation_status),
+    Field('confirmation_method', Appointment.confirmation_method),
+    Field('confirmed_at', Appointment.confirmed_at),
+    Field('cancelled_at', Appointment.cancelled_at),
+    Field('cancellation_reason', Appointment.cancellation_reason),
+    Field('reschedule_count', Appointment.reschedule_count),
+    Field('original_appointment_date', Appointment.original_appointment_date),
+    Field('reminder_sent_at', Appointment.reminder_sent_at),
+    Field('notes', Appointment.notes),
+    Field('assigned_provider', Appointment.assigned_provider),
+    Field('created_by', Appointment.created_by),
+    Field('created_by_name', User.username, join=(User, Appointment.created_by == User.id)),
+    Field('status_color', Appointment.status, convert=color(APPOINTMENT_STATUS_COLORS)),
+    Field('confirmation_color', Appointment.confirmation_status, convert=color(CONFIRMATION_COLORS)),
+    Field('is_upcoming', Appointment.appointment_date, Appointment.status, convert=is_upcoming),
+    Field('is_overdue', Appointment.appointment_date, Appointment.status, convert=is_overdue),
+    Field('created_at', Appointment.created_at),
+    Field('updated_at', Appointment.updated_at)
+], always=(Appointment.id, Appointment.appointment_date))
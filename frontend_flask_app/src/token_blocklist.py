@@ -0,0 +1,245 @@
+import logging
+import math
+import os
+import threading
+import time
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings: no false negatives, no deletes"""
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    # Probe positions come from double hashing the two halves of the built-in
+    # 64-bit string hash. It is salted per process, which is fine for a filter
+    # each worker builds for itself, and it is cached on the string object.
+
+    def add(self, item):
+        h = hash(item)
+        h1, h2 = h & 0xFFFFFFFF, ((h >> 32) & 0xFFFFFFFF) | 1
+        bits, size = self._bits, self.size
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        bits, size = self._bits, self.size
+        # Checked inline: most absent items fail on this first probe
+        position = h1 % size
+        if not bits[position >> 3] & (1 << (position & 7)):
+            return False
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        for i in range(1, self.hashes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class MemoryBlocklistStore:
+    """Revoked token ids for this process only (single worker or tests)"""
+
+    def __init__(self):
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def add(self, jti, ttl):
+        with self._lock:
+            self._expires[jti] = time.time() + ttl
+
+    def contains(self, jti):
+        expires_at = self._expires.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def active(self):
+        now = time.time()
+        with self._lock:
+            self._expires = {jti: expires_at for jti, expires_at in self._expires.items() if expires_at > now}
+            return list(self._expires)
+
+    def subscribe(self, callback):
+        # No other process can revoke tokens into this store
+        return None
+
+
+class RedisBlocklistStore:
+    """
+    Revoked token ids shared by all workers through Redis.
+
+    Each id is a key that expires with its token. A sorted set scored by
+    expiry lets workers load every live id to build their bloom filters, and
+    every revocation is announced on a pub/sub channel.
+    """
+    key_prefix = 'token_blocklist:'
+    index_key = 'token_blocklist_index'
+    channel = 'token_blocklist'
+
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url):
+        import redis
+        return cls(redis.Redis.from_url(url))
+
+    def add(self, jti, ttl):
+        pipe = self._client.pipeline()
+        pipe.set(self.key_prefix + jti, 1, ex=max(1, math.ceil(ttl)))
+        pipe.zadd(self.index_key, {jti: time.time() + ttl})
+        pipe.publish(self.channel, jti)
+        pipe.execute()
+
+    def contains(self, jti):
+        return self._client.exists(self.key_prefix + jti) > 0
+
+    def active(self):
+        now = time.time()
+        self._client.zremrangebyscore(self.index_key, '-inf', now)
+        return [_text(jti) for jti in self._client.zrangebyscore(self.index_key, now, '+inf')]
+
+    def subscribe(self, callback):
+        """Call callback(jti) for revocations from any worker; returns the listener thread"""
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: lambda message: callback(_text(message['data']))})
+        return pubsub.run_in_thread(sleep_time=1.0, daemon=True, exception_handler=_listener_failed)
+
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def _listener_failed(error, pubsub, thread):
+    # The thread stops; the next bloom rebuild notices and resubscribes
+    logger.warning(f'Token blocklist subscription lost: {error}')
+    thread.stop()
+    pubsub.close()
+
+
+class TokenBlocklist:
+    """
+    Revoked-token check run on every authenticated request.
+
+    Revoked jtis live in a store with a TTL that ends when the token would
+    have expired anyway. Each worker fronts the store with a bloom filter of
+    its contents: a jti missing from the filter (every valid token, bar the
+    filter's false-positive rate) is accepted without a store round trip,
+    and a hit is confirmed against the store. The filter is fed by the
+    store's pub/sub channel and rebuilt from the store every
+    `rebuild_interval` seconds, which drops expired ids and bounds how long
+    a missed notification can go unnoticed.
+    """
+
+    def __init__(self, store, capacity=100000, error_rate=0.001, rebuild_interval=60):
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._bloom = None
+        self._listener = None
+        self._subscribed = False
+        self._rebuild_at = 0
+        self._lock = threading.Lock()
+        # Threads do not survive a fork: each worker resubscribes and reloads
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def revoke(self, jti, expires_at):
+        """Block a token id until `expires_at` (epoch seconds)"""
+        self._ensure_current()
+        self.store.add(jti, max(1, expires_at - time.time()))
+        self._bloom.add(jti)
+
+    def is_revoked(self, jti):
+        if time.monotonic() >= self._rebuild_at:
+            self._ensure_current()
+        if jti not in self._bloom:
+            return False
+        return self.store.contains(jti)
+
+    def _ensure_current(self):
+        if time.monotonic() < self._rebuild_at:
+            return
+        with self._lock:
+            if time.monotonic() < self._rebuild_at:
+                return
+            try:
+                self._rebuild()
+            except Exception as e:
+                if self._bloom is None:
+                    raise
+                # Keep serving the previous filter and retry shortly
+                logger.error(f'Failed to rebuild token blocklist filter: {e}')
+                self._rebuild_at = time.monotonic() + min(5, self.rebuild_interval)
+
+    def _rebuild(self):
+        # (Re)subscribe before loading the snapshot so no revocation falls in between
+        if not self._subscribed or (self._listener is not None and not self._listener.is_alive()):
+            self._listener = self.store.subscribe(self._on_revoked)
+            self._subscribed = True
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        for jti in self.store.active():
+            bloom.add(jti)
+        self._bloom = bloom
+        self._rebuild_at = time.monotonic() + self.rebuild_interval
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()
+        self._listener = None
+        self._subscribed = False
+        self._bloom = None
+        self._rebuild_at = 0
+
+    def _on_revoked(self, jti):
+        # Waits out a rebuild in progress so the id lands in the new filter
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+
+def init_token_blocklist(app):
+    """Attach the token blocklist backed by the store selected by TOKEN_BLOCKLIST_STORE"""
+    backend = app.config.get('TOKEN_BLOCKLIST_STORE', 'memory')
+    if backend == 'redis':
+        store = RedisBlocklistStore.from_url(app.config['REDIS_URL'])
+    elif backend == 'fakeredis':
+        import fakeredis
+        store = RedisBlocklistStore(fakeredis.FakeRedis())
+    else:
+        store = MemoryBlocklistStore()
+    blocklist = TokenBlocklist(
+        store,
+        capacity=app.config.get('TOKEN_BLOCKLIST_BLOOM_CAPACITY', 100000),
+        error_rate=app.config.get('TOKEN_BLOCKLIST_BLOOM_ERROR_RATE', 0.001),
+        rebuild_interval=app.config.get('TOKEN_BLOCKLIST_REBUILD_INTERVAL', 60)
+    )
+    app.extensions['token_blocklist'] = blocklist
+    return blocklist
+
+
+def get_token_blocklist():
+    return current_app.extensions['token_blocklist']
+
+
+def revoke_token(jwt_payload):
+    """
+    Revoke a decoded token until it expires (JWT_ACCESS_TOKEN_EXPIRES if it
+    carries no exp), along with the refresh token named by its refresh_jti
+    claim. That one is blocked for a full JWT_REFRESH_TOKEN_EXPIRES, which
+    outlasts the refresh token since it was issued before this token.
+    """
+    blocklist = get_token_blocklist()
+    now = time.time()
+    expires_at = jwt_payload.get('exp')
+    if expires_at is None:
+        expires_at = now + current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds()
+    blocklist.revoke(jwt_payload['jti'], expires_at)
+    if jwt_payload.get('refresh_jti'):
+        blocklist.revoke(jwt_payload['refresh_jti'], now + current_app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds())